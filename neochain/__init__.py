@@ -18,6 +18,11 @@ __email__ = 'dalwar.hossain@protonmail.com'
 
 
 # Handle imports
-from nc_community_handler import find_communities, find_top_n_communities, find_relative_overlap
-from nc_graph_handler import find_sub_graph, generate_merged_graph
+from nc_community_handler import find_communities, detect_communities, CommunityDetection, find_top_n_communities, \
+    find_relative_overlap, compare_louvain_engines, read_infomap_hierarchy, InfomapHierarchy
+from nc_graph_handler import find_sub_graph, stream_sub_graph, generate_merged_graph
+from nc_evolution_handler import evolve_communities
+from nc_data_handler import EdgeList, NodeDictionary, Partition, read_edge_list, read_edge_lists, \
+    read_node_dictionary, convert_edge_list, write_binary_edge_list, write_parquet_edge_list, create_partition, \
+    set_snapshot_cache_size, clear_snapshot_cache
 from _release_info import __release__, __version__, __author__, __email__
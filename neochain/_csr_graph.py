@@ -0,0 +1,754 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+# Import python libraries
+import time
+import collections
+import numpy as np
+from pyrainbowterm import *
+
+
+# Source code meta data
+__author__ = 'Dalwar Hossain'
+__email__ = 'dalwar.hossain@protonmail.com'
+
+
+# Rows with at least this many neighbors are summed with numpy instead of a python loop while moving nodes
+DENSE_ROW_SIZE = 64
+
+
+# Undirected graph in compressed sparse row (CSR) format
+class CSRGraph(object):
+    """
+    This class holds an undirected graph as compressed sparse row arrays. The neighbors of node u are
+    indices[indptr[u]:indptr[u + 1]] with the edge weights in data[indptr[u]:indptr[u + 1]]. Every edge is stored in
+    both directions, a self-loop is stored once with twice its weight, so degree (the row sums) matches networkx.
+
+    :param indptr: (numpy array) Row offsets, length number of nodes + 1
+    :param indices: (numpy array) Neighbor of every stored edge (dense node index)
+    :param data: (numpy array) Weight of every stored edge
+    :param nodes: (numpy array) Original node id of every dense node index
+    """
+    def __init__(self, indptr=None, indices=None, data=None, nodes=None):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.nodes = nodes
+        self.degree = np.add.reduceat(data, indptr[:-1]) if len(data) else np.zeros(len(indptr) - 1)
+        # reduceat returns data[indptr[u]] for empty rows
+        self.degree[np.diff(indptr) == 0] = 0.0
+        self.total_weight = float(self.degree.sum())
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def __repr__(self):
+        return '<CSRGraph: {} nodes, {} stored edges>'.format(len(self), len(self.indices))
+
+    def memory_usage(self):
+        """
+        This function calculates the memory used by the CSR arrays
+
+        :return: (int) Memory usage in bytes
+        """
+        columns = (self.indptr, self.indices, self.data, self.nodes, self.degree)
+
+        # Return
+        return sum(column.nbytes for column in columns if column is not None)
+
+    def rows(self):
+        """
+        This function creates the row (source node index) of every stored edge
+
+        :return: (numpy array) Row of every stored edge
+        """
+        return np.repeat(np.arange(len(self), dtype=self.indices.dtype), np.diff(self.indptr))
+
+
+# Create a CSR graph from (row, column, weight) arrays
+def __csr_from_arrays(row=None, column=None, weight=None, n_nodes=None, nodes=None):
+    """
+    This function sorts (row, column, weight) entries, sums duplicates and creates a CSR graph
+
+    :param row: (numpy array) Row (dense node index) of every entry
+    :param column: (numpy array) Column (dense node index) of every entry
+    :param weight: (numpy array) Weight of every entry
+    :param n_nodes: (int) Number of nodes
+    :param nodes: (numpy array) Original node id of every dense node index
+    :return: (CSRGraph) CSR graph
+    """
+    # Sum duplicate entries, keys sort by row and then by column
+    keys = row.astype(np.int64) * n_nodes + column
+    keys, inverse = np.unique(keys, return_inverse=True)
+    data = np.bincount(inverse.ravel(), weights=weight, minlength=len(keys))
+    rows = keys // n_nodes
+    indices = (keys % n_nodes).astype(np.int32 if n_nodes <= np.iinfo(np.int32).max else np.int64)
+
+    # Row offsets
+    indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_nodes), out=indptr[1:])
+
+    # Return
+    return CSRGraph(indptr=indptr, indices=indices, data=data, nodes=nodes)
+
+
+# Create a CSR graph from an edge list
+def build_csr_graph(edge_list=None):
+    """
+    This function creates an undirected CSR graph from an edge list. Node ids are mapped to dense indexes, duplicate
+    edges and both directions of an edge are summed like in an undirected weighted graph.
+
+    :param edge_list: (EdgeList) Edge list
+    :return: (CSRGraph) CSR graph
+    """
+    # Map node ids to dense indexes
+    nodes, inverse = np.unique(np.concatenate((edge_list.source, edge_list.target)), return_inverse=True)
+    inverse = inverse.ravel()
+    n_edges = len(edge_list)
+    source = inverse[:n_edges]
+    target = inverse[n_edges:]
+    if edge_list.weighted:
+        weight = np.asarray(edge_list.weight, dtype=np.float64)
+    else:
+        weight = np.ones(n_edges, dtype=np.float64)
+
+    # Store every edge in both directions, a self-loop ends up with twice its weight
+    row = np.concatenate((source, target))
+    column = np.concatenate((target, source))
+
+    # Return
+    return __csr_from_arrays(row=row, column=column, weight=np.concatenate((weight, weight)), n_nodes=len(nodes),
+                             nodes=nodes)
+
+
+# Get the edges of a CSR graph
+def csr_edges(graph=None):
+    """
+    This function lists every undirected edge of a CSR graph once, with the summed weight of its duplicates and both
+    directions, e.g. to build a networkx graph that is identical to the CSR graph
+
+    :param graph: (CSRGraph) CSR graph
+    :return: (numpy array, numpy array, numpy array) source, target (original node ids) and weight of every edge
+    """
+    rows = graph.rows()
+    upper = rows <= graph.indices
+    source = graph.nodes[rows[upper]]
+    target = graph.nodes[graph.indices[upper]]
+    weight = graph.data[upper]
+
+    # Self-loops are stored with twice their weight
+    weight[source == target] /= 2
+
+    # Return
+    return source, target, weight
+
+
+# Aggregate a CSR graph by communities
+def aggregate_csr_graph(graph=None, labels=None):
+    """
+    This function creates the graph of communities, every community becomes one node and edges between communities
+    are summed, edges inside a community become a self-loop
+
+    :param graph: (CSRGraph) CSR graph
+    :param labels: (numpy array) Dense community label (0 .. n_communities - 1) of every node
+    :return: (CSRGraph) CSR graph of communities
+    """
+    n_communities = int(labels.max()) + 1 if len(labels) else 0
+
+    # Return
+    return __csr_from_arrays(row=labels[graph.rows()], column=labels[graph.indices], weight=graph.data,
+                             n_nodes=n_communities, nodes=np.arange(n_communities))
+
+
+# Renumber labels
+def relabel(labels=None):
+    """
+    This function renumbers community labels to 0 .. n_communities - 1
+
+    :param labels: (numpy array) Community labels
+    :return: (numpy array) Dense community labels
+    """
+    # Return
+    return np.unique(labels, return_inverse=True)[1].ravel()
+
+
+# Find modularity of a partition
+def modularity(graph=None, labels=None, resolution=1.0):
+    """
+    This function calculates the modularity of a partition with array operations
+
+    :param graph: (CSRGraph) CSR graph
+    :param labels: (numpy array) Community label of every node
+    :param resolution: (float) Resolution parameter, default [1.0]
+    :return: (float) modularity
+    """
+    if graph.total_weight == 0:
+        return 0.0
+    labels = relabel(labels)
+    inside = labels[graph.rows()] == labels[graph.indices]
+    internal_weight = np.bincount(labels[graph.rows()][inside], weights=graph.data[inside],
+                                  minlength=labels.max() + 1)
+    total_degree = np.bincount(labels, weights=graph.degree, minlength=labels.max() + 1)
+    m2 = graph.total_weight
+
+    # Return
+    return float((internal_weight / m2).sum() - resolution * ((total_degree / m2) ** 2).sum())
+
+
+# Find weights from a node to its neighbor communities
+def __neighbor_community_weights(neighbors=None, weights=None, labels=None, node=None):
+    """
+    This function sums the edge weights from a node to every neighbor community, self-loops are left out. Python dicts
+    and lists are faster than numpy on the short rows of a single node.
+
+    :param neighbors: (list) Neighbors of the node
+    :param weights: (list) Edge weights to the neighbors
+    :param labels: (list) Community label of every node
+    :param node: (int) Node index
+    :return: (dict) Python dictionary of communities and weights
+    """
+    community_weights = {}
+    for neighbor, weight in zip(neighbors, weights):
+        if neighbor != node:
+            community = labels[neighbor]
+            community_weights[community] = community_weights.get(community, 0.0) + weight
+
+    # Return
+    return community_weights
+
+
+# Find weights from a node with many neighbors to its neighbor communities
+def __dense_neighbor_community_weights(neighbors=None, weights=None, labels=None, node=None):
+    """
+    This function sums the edge weights from a node to every neighbor community with numpy, for the long rows of hubs
+    and aggregated nodes where one numpy call is cheaper than a python loop over the row. Self-loops are left out.
+
+    :param neighbors: (numpy array) Neighbors of the node
+    :param weights: (numpy array) Edge weights to the neighbors
+    :param labels: (numpy array) Community label of every node
+    :param node: (int) Node index
+    :return: (dict) Python dictionary of communities and weights
+    """
+    not_self = neighbors != node
+    communities, inverse = np.unique(labels[neighbors[not_self]], return_inverse=True)
+    community_weights = np.bincount(inverse.ravel(), weights=weights[not_self], minlength=len(communities))
+
+    # Return
+    return dict(zip(communities.tolist(), community_weights.tolist()))
+
+
+# Move a node into the best neighbor community
+def __best_community(weights=None, total_degree=None, node_degree=None, current=None, factor=None):
+    """
+    This function takes a node out of its community and puts it into the neighbor community with the largest
+    modularity gain, staying has the gain of the current community. total_degree is updated in place.
+
+    :param weights: (dict) Weights from the node to its neighbor communities
+    :param total_degree: (list) Sum of node degrees of every community
+    :param node_degree: (float) Degree of the node
+    :param current: (int) Current community of the node
+    :param factor: (float) resolution * node degree / total weight
+    :return: (int) best community
+    """
+    total_degree[current] -= node_degree
+    best = current
+    best_gain = weights.get(current, 0.0) - total_degree[current] * factor
+    for community, weight in weights.items():
+        gain = weight - total_degree[community] * factor
+        if gain > best_gain:
+            best = community
+            best_gain = gain
+    total_degree[best] += node_degree
+
+    # Return
+    return best
+
+
+# Move nodes with a queue of unstable nodes
+def __move_nodes(graph=None, labels=None, resolution=1.0, random_state=None, deadline=None):
+    """
+    This function is the local moving phase of louvain and leiden. All nodes are queued once in random order and every
+    node moves into the neighbor community with the largest modularity gain, when a node moves its neighbors outside
+    the new community are queued again. Only nodes whose neighborhood changed are revisited, instead of full passes
+    over all nodes until modularity stops improving. Labels and community degrees are python lists while moving, a
+    numpy call per node costs more than the work on its short row, rows with at least DENSE_ROW_SIZE neighbors are
+    summed with numpy on a label array that mirrors the list.
+
+    :param graph: (CSRGraph) CSR graph
+    :param labels: (numpy array) Initial community label of every node
+    :param resolution: (float) Resolution parameter
+    :param random_state: (numpy RandomState) Random generator for the node order
+    :param deadline: (float) time.time() after which moving stops, checked once per number of nodes visits,
+                     default [None]
+    :return: (numpy array) community labels, (int) number of moves, (boolean) False if the deadline stopped moving
+    """
+    n_nodes = len(graph)
+    indptr = graph.indptr.tolist()
+    indices = graph.indices
+    data = graph.data
+    degree = graph.degree.tolist()
+    m2 = graph.total_weight
+    total_degree = np.bincount(labels, weights=graph.degree, minlength=n_nodes).tolist()
+    label_array = labels.copy()
+    labels = labels.tolist()
+    queue = collections.deque(random_state.permutation(n_nodes).tolist())
+    queued = [True] * n_nodes
+    n_moved = 0
+    n_visited = 0
+    while queue:
+        node = queue.popleft()
+        queued[node] = False
+        n_visited += 1
+        if deadline is not None and n_visited % n_nodes == 0 and time.time() > deadline:
+            return np.array(labels, dtype=np.int64), n_moved, False
+        current = labels[node]
+        node_degree = degree[node]
+        start = indptr[node]
+        stop = indptr[node + 1]
+        if stop - start < DENSE_ROW_SIZE:
+            neighbors = indices[start:stop].tolist()
+            weights = __neighbor_community_weights(neighbors=neighbors, weights=data[start:stop].tolist(),
+                                                   labels=labels, node=node)
+        else:
+            neighbors = indices[start:stop]
+            weights = __dense_neighbor_community_weights(neighbors=neighbors, weights=data[start:stop],
+                                                         labels=label_array, node=node)
+            neighbors = neighbors.tolist()
+        best = __best_community(weights=weights, total_degree=total_degree, node_degree=node_degree,
+                                current=current, factor=resolution * node_degree / m2)
+        if best != current:
+            labels[node] = best
+            label_array[node] = best
+            n_moved += 1
+            for neighbor in neighbors:
+                if not queued[neighbor] and labels[neighbor] != best:
+                    queued[neighbor] = True
+                    queue.append(neighbor)
+
+    # Return
+    return np.array(labels, dtype=np.int64), n_moved, True
+
+
+# Find a local moving partition of one level
+def __one_level(graph=None, labels=None, resolution=1.0, random_state=None, deadline=None):
+    """
+    This function moves nodes until no move improves modularity anymore
+
+    :param graph: (CSRGraph) CSR graph
+    :param labels: (numpy array) Initial community label of every node
+    :param resolution: (float) Resolution parameter
+    :param random_state: (numpy RandomState) Random generator for the node order
+    :param deadline: (float) time.time() after which moving stops, default [None]
+    :return: (numpy array) community labels, (boolean) True if any node moved, (boolean) True if the level finished
+    """
+    labels, n_moved, finished = __move_nodes(graph=graph, labels=labels, resolution=resolution,
+                                             random_state=random_state, deadline=deadline)
+
+    # Return
+    return labels, n_moved > 0, finished
+
+
+# Louvain method over CSR arrays
+def louvain(graph=None, resolution=1.0, random_state=None, labels=None, deadline=None):
+    """
+    This function finds communities with the louvain method on a CSR graph without building a networkx graph.
+    Levels of local moving and aggregation are repeated until no node moves anymore. With a deadline the levels that
+    finished in time are kept, if not even the first level finished its partial partition is kept.
+
+    :param graph: (CSRGraph) CSR graph
+    :param resolution: (float) Resolution parameter, default [1.0]
+    :param random_state: (int) Seed for the node order, default [None]
+    :param labels: (numpy array) Initial community label (0 .. n - 1) of every node for a warm start,
+                   default [singletons]
+    :param deadline: (float) time.time() after which no new pass or level is started, default [None]
+    :return: (list) label arrays of every level, level i maps the nodes of level i to the nodes of level i + 1,
+             (boolean) False if the deadline cut the run short
+    """
+    random_state = np.random.RandomState(random_state)
+    levels = []
+    level_graph = graph
+    if labels is None:
+        labels = np.arange(len(level_graph))
+    while True:
+        labels, any_move, finished = __one_level(graph=level_graph, labels=labels, resolution=resolution,
+                                                 random_state=random_state, deadline=deadline)
+        if not finished:
+            print('Time budget exceeded in louvain level {}!'.format(len(levels) + 1), log_type='warn')
+            if not levels:
+                levels.append(relabel(labels))
+            return levels, False
+        # A warm start can group nodes without moving them
+        if not any_move and len(np.unique(labels)) == len(level_graph):
+            break
+        labels = relabel(labels)
+        levels.append(labels)
+        print('Louvain level {}: {} communities, modularity: {:.6f}'.format(
+            len(levels), labels.max() + 1, modularity(level_graph, labels, resolution)), log_type='info')
+
+        # Next level works on the graph of communities
+        if deadline is not None and time.time() > deadline:
+            print('Time budget exceeded after louvain level {}!'.format(len(levels)), log_type='warn')
+            return levels, False
+        level_graph = aggregate_csr_graph(graph=level_graph, labels=labels)
+        labels = np.arange(len(level_graph))
+
+    # Return
+    return levels, True
+
+
+# Refine a partition into well connected sub communities
+def __refine_partition(graph=None, labels=None, resolution=1.0, random_state=None):
+    """
+    This function splits every community into sub communities. Every node starts as a singleton, a singleton node that
+    is well connected to its community is merged into the sub community of the same community with the largest
+    modularity gain, as long as that sub community is well connected to the rest of the community. Merges never cross
+    community borders, so every community of the result is connected.
+
+    :param graph: (CSRGraph) CSR graph
+    :param labels: (numpy array) Community label of every node
+    :param resolution: (float) Resolution parameter
+    :param random_state: (numpy RandomState) Random generator for the node order
+    :return: (numpy array) sub community labels
+    """
+    n_nodes = len(graph)
+    m2 = graph.total_weight
+    rows = graph.rows()
+    indptr = graph.indptr.tolist()
+    degree = graph.degree.tolist()
+
+    # Weight from every node to the rest of its community and degree sum of every community
+    inside = (labels[rows] == labels[graph.indices]) & (rows != graph.indices)
+    weight_inside = np.bincount(rows[inside], weights=graph.data[inside], minlength=n_nodes).tolist()
+    community_degree = np.bincount(labels, weights=graph.degree, minlength=n_nodes).tolist()
+
+    # Sub communities start as singletons
+    refined = np.arange(n_nodes)
+    refined_degree = list(degree)
+    refined_external = list(weight_inside)
+    refined_size = [1] * n_nodes
+    for node in random_state.permutation(n_nodes).tolist():
+        community = labels[node]
+        node_degree = degree[node]
+        community_rest = community_degree[community] - node_degree
+
+        # Only singleton nodes which are well connected to their community move
+        if refined_size[node] != 1 or refined[node] != node or \
+                weight_inside[node] < resolution * node_degree * community_rest / m2:
+            continue
+
+        # Weights from the node to the sub communities of its community
+        start = indptr[node]
+        stop = indptr[node + 1]
+        neighbors = graph.indices[start:stop]
+        same = (labels[neighbors] == community) & (neighbors != node)
+        weights = {}
+        for sub_community, weight in zip(refined[neighbors[same]].tolist(), graph.data[start:stop][same].tolist()):
+            weights[sub_community] = weights.get(sub_community, 0.0) + weight
+
+        # Best well connected sub community, greedy choice of the largest non negative gain
+        best = node
+        best_gain = 0.0
+        for sub_community, weight in weights.items():
+            sub_degree = refined_degree[sub_community]
+            if refined_external[sub_community] < \
+                    resolution * sub_degree * (community_degree[community] - sub_degree) / m2:
+                continue
+            gain = weight - resolution * node_degree * sub_degree / m2
+            if gain >= best_gain:
+                best = sub_community
+                best_gain = gain
+
+        # Merge the node into the sub community
+        if best != node:
+            refined[node] = best
+            refined_external[best] += weight_inside[node] - 2 * weights[best]
+            refined_degree[best] += node_degree
+            refined_size[best] += 1
+            refined_size[node] = 0
+
+    # Return
+    return refined
+
+
+# Leiden method over CSR arrays
+def leiden(graph=None, resolution=1.0, random_state=None, labels=None, deadline=None):
+    """
+    This function finds communities with the leiden method on a CSR graph. Every level runs fast local moving,
+    refines the communities into well connected sub communities and aggregates the graph by the sub communities, the
+    aggregated nodes start in the community of their sub community. Levels repeat until no node moves anymore.
+
+    :param graph: (CSRGraph) CSR graph
+    :param resolution: (float) Resolution parameter, default [1.0]
+    :param random_state: (int) Seed for the node order, default [None]
+    :param labels: (numpy array) Initial community label (0 .. n - 1) of every node for a warm start,
+                   default [singletons]
+    :param deadline: (float) time.time() after which no new level is started, default [None]
+    :return: (numpy array) Community label of every node, (boolean) False if the deadline cut the run short
+    """
+    random_state = np.random.RandomState(random_state)
+    level_graph = graph
+    if labels is None:
+        labels = np.arange(len(level_graph))
+    node_map = np.arange(len(graph))
+    level = 0
+    while True:
+        labels = relabel(__move_nodes(graph=level_graph, labels=labels, resolution=resolution,
+                                      random_state=random_state)[0])
+        n_communities = labels.max() + 1 if len(labels) else 0
+        level += 1
+        print('Leiden level {}: {} communities, modularity: {:.6f}'.format(
+            level, n_communities, modularity(level_graph, labels, resolution)), log_type='info')
+        if n_communities == len(level_graph):
+            break
+        if deadline is not None and time.time() > deadline:
+            print('Time budget exceeded after leiden level {}!'.format(level), log_type='warn')
+            return labels[node_map], False
+
+        # Aggregate by the refined partition, unless refinement kept every node alone
+        refined = relabel(__refine_partition(graph=level_graph, labels=labels, resolution=resolution,
+                                             random_state=random_state))
+        if refined.max() + 1 == len(level_graph):
+            refined = labels
+        next_labels = np.zeros(refined.max() + 1, dtype=labels.dtype)
+        next_labels[refined] = labels
+        node_map = refined[node_map]
+        level_graph = aggregate_csr_graph(graph=level_graph, labels=refined)
+        labels = next_labels
+
+    # Return
+    return labels[node_map], True
+
+
+# Label propagation over CSR arrays
+def label_propagation(graph=None, max_iterations=100, random_state=None, labels=None, deadline=None):
+    """
+    This function finds communities with semi-synchronous label propagation using only array operations. In every
+    round the neighbor label weights of all nodes are summed at once on sorted (node, label) keys and a random half of
+    the nodes takes the label with the largest weight, updating only half of the nodes prevents the label oscillation
+    of fully synchronous propagation. Ties keep the current label or are broken randomly. Every round is a sort of the
+    stored edges, so the run time is near linear in the number of edges.
+
+    :param graph: (CSRGraph) CSR graph
+    :param max_iterations: (int) Maximum number of rounds, default [100]
+    :param random_state: (int) Seed for the node selection and tie breaking, default [None]
+    :param labels: (numpy array) Initial community label (0 .. n - 1) of every node for a warm start,
+                   default [singletons]
+    :param deadline: (float) time.time() after which no new round is started, default [None]
+    :return: (numpy array) Community label of every node, (boolean) False if the deadline cut the run short
+    """
+    random_state = np.random.RandomState(random_state)
+    n_nodes = len(graph)
+    rows = graph.rows()
+    not_self = rows != graph.indices
+    rows = rows[not_self].astype(np.int64)
+    neighbors = graph.indices[not_self]
+    weights = graph.data[not_self]
+    labels = np.arange(n_nodes) if labels is None else labels.copy()
+    completed = True
+    if len(rows) == 0:
+        return labels, completed
+    n_rounds = 0
+    for iteration in range(max_iterations):
+        if deadline is not None and time.time() > deadline:
+            print('Time budget exceeded after {} label propagation rounds!'.format(iteration), log_type='warn')
+            completed = False
+            break
+        n_rounds += 1
+        # Sum of weights of every (node, neighbor label) pair
+        keys = rows * n_nodes + labels[neighbors]
+        order = np.argsort(keys, kind='mergesort')
+        keys = keys[order]
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        label_weights = np.add.reduceat(weights[order], starts)
+        keys = keys[starts]
+        key_rows = keys // n_nodes
+        key_labels = keys % n_nodes
+
+        # Labels with the largest weight, the current label wins ties, other ties are broken randomly
+        row_starts = np.flatnonzero(np.concatenate(([True], key_rows[1:] != key_rows[:-1])))
+        row_stops = np.append(row_starts[1:], len(keys))
+        is_max = label_weights >= np.repeat(np.maximum.reduceat(label_weights, row_starts), row_stops - row_starts)
+        priority = np.where(key_labels == labels[key_rows], 2.0, random_state.random_sample(len(keys)))
+        priority[~is_max] = -1.0
+        best = np.lexsort((priority, key_rows))[row_stops - 1]
+        new_labels = labels.copy()
+        new_labels[key_rows[best]] = key_labels[best]
+
+        # Stop when no node changes its label, otherwise update a random half of the nodes
+        changed = new_labels != labels
+        if not changed.any():
+            break
+        changed &= random_state.random_sample(n_nodes) < 0.5
+        labels[changed] = new_labels[changed]
+    print('Label propagation finished after {} rounds: {} communities'.format(
+        n_rounds, len(np.unique(labels))), log_type='info')
+
+    # Return
+    return relabel(labels), completed
+
+
+# Find connected components of edge arrays
+def connected_components(source=None, target=None, n_nodes=None):
+    """
+    This function labels connected components with a vectorized union-find. Every round hooks the larger root of every
+    edge onto the smaller root and compresses the paths by pointer jumping, until both ends of every edge have the same
+    root. Every round is linear in the number of edges.
+
+    :param source: (numpy array) Source (dense node index) of every edge
+    :param target: (numpy array) Target (dense node index) of every edge
+    :param n_nodes: (int) Number of nodes
+    :return: (numpy array) Dense component label of every node
+    """
+    parent = np.arange(n_nodes)
+    while True:
+        # Hook the larger root onto the smaller root
+        source_root = parent[source]
+        target_root = parent[target]
+        split = source_root != target_root
+        if not split.any():
+            break
+        np.minimum.at(parent, np.maximum(source_root[split], target_root[split]),
+                      np.minimum(source_root[split], target_root[split]))
+
+        # Compress paths
+        while True:
+            grand_parent = parent[parent]
+            if (grand_parent == parent).all():
+                break
+            parent = grand_parent
+
+    # Return
+    return relabel(parent)
+
+
+# Find the stored edges of a set of rows
+def __row_positions(graph=None, rows=None):
+    """
+    This function finds the positions of all stored edges of the given rows without a python loop
+
+    :param graph: (CSRGraph) CSR graph
+    :param rows: (numpy array) Node indexes
+    :return: (numpy array) Positions into indices and data, (numpy array) number of stored edges of every row
+    """
+    starts = graph.indptr[rows]
+    lengths = graph.indptr[rows + 1] - starts
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+
+    # Return
+    return offsets + np.arange(lengths.sum()), lengths
+
+
+# Prune leaves of a CSR graph
+def prune_leaves(graph=None, max_degree=1):
+    """
+    This function strips nodes with at most max_degree neighbors round by round, until every remaining node has more
+    neighbors (the (max_degree + 1)-core). Every pruned node gets an anchor, its heaviest neighbor that was pruned later
+    (or in the same round with a larger index) or never. Pruned nodes without an anchor, e.g. the center of a pruned
+    star, are their own anchor.
+
+    :param graph: (CSRGraph) CSR graph
+    :param max_degree: (int) Nodes with at most this many neighbors are pruned, default [1]
+    :return: (numpy array) True for the remaining nodes, (numpy array) anchor of every node, (int) number of rounds
+    """
+    n_nodes = len(graph)
+    rows = graph.rows()
+    degree = np.bincount(rows[rows != graph.indices], minlength=n_nodes)
+    prune_round = np.full(n_nodes, np.iinfo(np.int64).max, dtype=np.int64)
+    remaining = np.ones(n_nodes, dtype=bool)
+    current = np.flatnonzero(degree <= max_degree)
+    n_rounds = 0
+    while len(current):
+        prune_round[current] = n_rounds
+        remaining[current] = False
+
+        # Remaining neighbors of the pruned nodes lose one neighbor
+        positions = __row_positions(graph=graph, rows=current)[0]
+        neighbors = graph.indices[positions]
+        neighbors = neighbors[remaining[neighbors]]
+        np.subtract.at(degree, neighbors, 1)
+        neighbors = np.unique(neighbors)
+        current = neighbors[degree[neighbors] <= max_degree]
+        n_rounds += 1
+
+    # Anchor of every pruned node
+    anchor = np.arange(n_nodes)
+    pruned = np.flatnonzero(~remaining)
+    positions, lengths = __row_positions(graph=graph, rows=pruned)
+    edge_rows = np.repeat(pruned, lengths)
+    edge_columns = graph.indices[positions]
+    later = (prune_round[edge_columns] > prune_round[edge_rows]) | \
+            ((prune_round[edge_columns] == prune_round[edge_rows]) & (edge_columns > edge_rows))
+    edge_rows = edge_rows[later]
+    edge_columns = edge_columns[later]
+    if len(edge_rows):
+        heaviest = np.lexsort((graph.data[positions][later], edge_rows))
+        last = np.flatnonzero(np.append(edge_rows[heaviest][1:] != edge_rows[heaviest][:-1], True))
+        anchor[edge_rows[heaviest][last]] = edge_columns[heaviest][last]
+    print('Pruned {} of {} nodes with at most {} neighbors in {} rounds'.format(
+        len(pruned), n_nodes, max_degree, n_rounds), log_type='info')
+
+    # Return
+    return remaining, anchor, n_rounds
+
+
+# Attach pruned nodes to the community of their anchor
+def attach_pruned_nodes(remaining=None, anchor=None, labels=None):
+    """
+    This function gives every pruned node the community of its anchor. Anchor chains are resolved by pointer jumping,
+    so every pruned node ends at a remaining node or at a pruned node without an anchor, which starts a new community.
+
+    :param remaining: (numpy array) True for the remaining nodes
+    :param anchor: (numpy array) Anchor of every node
+    :param labels: (numpy array) Community label of every node, only used for the remaining nodes
+    :return: (numpy array) Community label of every node
+    """
+    root = anchor.copy()
+    while True:
+        grand_parent = root[root]
+        if (grand_parent == root).all():
+            break
+        root = grand_parent
+
+    # Pruned roots start new communities
+    labels = np.asarray(labels, dtype=np.int64).copy()
+    pruned_roots = ~remaining & (root == np.arange(len(root)))
+    first_label = labels[remaining].max() + 1 if remaining.any() else 0
+    labels[pruned_roots] = first_label + np.arange(int(pruned_roots.sum()))
+
+    # Return
+    return labels[root]
+
+
+# Find partition at a level
+def partition_at_level(levels=None, n_nodes=None, level=None):
+    """
+    This function composes the label arrays of the levels to the community label of every original node
+
+    :param levels: (list) label arrays of every level
+    :param n_nodes: (int) Number of nodes of the original graph
+    :param level: (int) Level, default [last level]
+    :return: (numpy array) Community label of every node
+    """
+    if level is None:
+        level = len(levels) - 1
+    labels = np.arange(n_nodes)
+    for level_labels in levels[:level + 1]:
+        labels = level_labels[labels]
+
+    # Return
+    return labels
+
+
+# Convert labels into a python dictionary
+def labels_to_dict(graph=None, labels=None):
+    """
+    This function creates a python dictionary of original node ids and communities
+
+    :param graph: (CSRGraph) CSR graph
+    :param labels: (numpy array) Community label of every node
+    :return: (dict) Python dictionary of nodes and communities
+    """
+    # Return
+    return dict(zip(graph.nodes.tolist(), labels.tolist()))
@@ -4,12 +4,15 @@
 from __future__ import print_function
 
 # Import python libraries
+import io
 import os
 import sys
 import datetime
-from itertools import islice
+import threading
 from math import *
 from decimal import Decimal
+import numpy as np
+import pandas as pd
 
 # Import custom python libraries
 try:
@@ -20,11 +23,24 @@ except ImportError:
     sys.exit(1)
 
 
+# Import queue for python 2 and 3
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+
 # Source code meta data
 __author__ = 'Dalwar Hossain'
 __email__ = 'dalwar.hossain@protonmail.com'
 
 
+# Compressed input files
+COMPRESSED_EXTENSIONS = ('.gz', '.bz2', '.xz', '.zst')
+DECOMPRESSION_BLOCK_SIZE = 4 * 1024 * 1024
+DECOMPRESSION_QUEUE_SIZE = 4
+
+
 # Check input file permissions
 def check_input_file_permissions(input_file):
     """
@@ -50,144 +66,137 @@ def check_input_file_permissions(input_file):
     return permission_status
 
 
-# Check if the file has header or not
-def file_sniffer(input_file=None):
+# Decompress a file in a background thread
+class BackgroundReader(io.RawIOBase):
     """
-    This function checks if the first line of the file is a header or not
-    :param input_file: Input file path
-    :return: detected delimiter, headers (if available), number of columns, skip rows
+    This class reads (decompresses) a file object in a background thread, so that decompression overlaps parsing.
+    Blocks are handed over through a bounded queue, so only a few blocks are held in memory.
+
+    :param file_object: A binary file object, e.g. a gzip/bz2/lzma/zstandard decompressing reader
+    :param block_size: (int) Number of bytes read in one block
     """
-    try:
-        import csv
-    except ImportError:
-        print('Can not import python csv library!', log_type='error')
-        sys.exit(1)
+    def __init__(self, file_object=None, block_size=DECOMPRESSION_BLOCK_SIZE):
+        io.RawIOBase.__init__(self)
+        self.mode = 'rb'
+        self._file = file_object
+        self._block_size = block_size
+        self._queue = queue.Queue(maxsize=DECOMPRESSION_QUEUE_SIZE)
+        self._block = b''
+        self._offset = 0
+        self._eof = False
+        self._error = None
+        self._stopped = False
+        self._thread = threading.Thread(target=self._fill)
+        self._thread.daemon = True
+        self._thread.start()
 
-    # Open the file and take a sniff
-    with open(input_file) as f:
-        first_five_lines = list(islice(f, 5))
-        file_head = ''.join(map(str, first_five_lines))
+    def _fill(self):
         try:
-            dialect = csv.Sniffer().sniff(file_head)
-            _headers = csv.Sniffer().has_header(file_head)
-            delimiter = dialect.delimiter
+            while not self._stopped:
+                block = self._file.read(self._block_size)
+                self._queue.put(block)
+                if not block:
+                    break
         except Exception as e:
-            print('Can not detect delimiter or headers! ERROR: {}'.format(e), log_type='error')
-            print('Please check input file!!', log_type='error')
-        # Sniff into the file and see if there is a header or not
-        if _headers:
-            headers = file_head.split('\n')[0].split(delimiter)
-            n_cols = len(headers)
-            skip_rows = 1
-        else:
-            headers = None
-            n_cols = len(file_head.split('\n')[0].split(delimiter))
-            skip_rows = 0
-
-    # Return
-    return delimiter, headers, n_cols, skip_rows
-
-
-# Check File Header
-def check_file_header(headers=None):
-    """
-    This file checks if the file header is active or commented
-    Limitation: Checks only First line of the file
-    --------------------------------------
-    =================
-    == Attention!! ==
-    =================
-    File with header => 0
-    File without/commented header=> 1
-    --------------------------------------
-    :param headers: File headers with column names
-    :return: <>
-    """
-    if headers:
-        print('Headers detected in input file!', log_type='warn')
-        if headers[0].startswith('#'):
-            print('Found commented header in input file!', log_type='info')
-            header_status = 1
-        else:
-            header_status = 0
-            print('Please comment [#] or delete header from input file!', log_type='warn')
-    else:
-        print('No headers detected in input file!', log_type='info')
-        header_status = 1
-
-    # Return header status
-    return header_status
-
-
-# Check Delimiter
-def check_delimiter(detected_delimiter=None, provided_delimiter=None):
-    """
-    This function checks match between provided and detected delimiter
-    ----------------------------------------------------------
-    =================
-    == Attention!! ==
-    =================
-    detected delimiter and provided delimiter - match => 1
-    detected delimiter and provided delimiter - mismatch => 2
-    -----------------------------------------------------------
-    :param detected_delimiter: Delimiter that is detected from the input file
-    :param provided_delimiter: Delimiter that was provided
-    :return: <>
+            self._error = e
+            self._queue.put(b'')
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        # Take the next block from the queue, after an error of the background thread every read raises it again
+        if self._offset >= len(self._block):
+            if self._eof:
+                if self._error is not None:
+                    raise self._error
+                return 0
+            self._block = self._queue.get()
+            self._offset = 0
+            if not self._block:
+                self._eof = True
+                if self._error is not None:
+                    raise self._error
+                return 0
+
+        # Copy as much as fits into the buffer
+        n_bytes = min(len(buffer), len(self._block) - self._offset)
+        buffer[:n_bytes] = self._block[self._offset:self._offset + n_bytes]
+        self._offset += n_bytes
+
+        # Return
+        return n_bytes
+
+    def close(self):
+        if not self.closed:
+            # Stop the background thread, it might wait for space in the queue
+            self._stopped = True
+            while self._thread.is_alive():
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    self._thread.join(0.01)
+            self._file.close()
+        io.RawIOBase.close(self)
+
+
+# Get compression of a file from the file extension
+def get_compression(input_file=None):
+    """
+    This function detects the compression of the input file from its extension
+    :param input_file: Input file path
+    :return: compression extension (.gz, .bz2, .xz, .zst) or None
     """
-    print('Provided delimiter: "{}"'.format(provided_delimiter), log_type='info')
-    print('Detected delimiter: "{}"'.format(detected_delimiter), log_type='info')
-
-    if detected_delimiter is ' ' and provided_delimiter is None:
-        print('Delimiter converted to whitespace!', log_type='hint')
-        delimiter_status = 1
-    elif detected_delimiter != provided_delimiter:
-        delimiter_status = 2
-        print('Delimiter mismatch!', log_type='warn', color='orange')
-    elif detected_delimiter == provided_delimiter:
-        delimiter_status = 1
+    extension = os.path.splitext(input_file)[1].lower()
+    if extension in COMPRESSED_EXTENSIONS:
+        return extension
 
     # Return
-    return delimiter_status
+    return None
 
 
-# Check Columns
-def check_columns(n_cols=None, weighted=None):
-    """
-    This function checks the number of columns detected from the input file
-    also checks that it matches with the weighted argument. For example:
-    A normal unweighted graph will have two column and weighted graph will have
-    three columns.
-    ------------------------------------
-    =================
-    == Attention!! ==
-    =================
-    If weighted and column == 3 =>1
-    else => 0
-    If unweighted and column == 2 => 1
-    else => 0
-    -------------------------------------
-    :param n_cols: Number of columns detected from the input file
-    :param weighted: Is the weighted argument provided yes or no
-    :return: <>
+# Open input file, compressed files are decompressed while reading
+def open_input_file(input_file=None):
     """
-    # Check the number of columns in the file
-    print('Detected columns: {}'.format(n_cols), log_type='info')
-    weight_col = is_weighted(weighted)
-    if weight_col:
-        if n_cols == 3:
-            column_status = 1
-        else:
-            print('Number of expected columns does not match', log_type='warn', color='orange')
-            column_status = 0
+    This function opens the input file for reading in binary mode. Compressed files (.gz, .bz2, .xz, .zst) are
+    decompressed as a stream in a background thread, nothing is inflated to disk
+    :param input_file: Input file path
+    :return: binary file object
+    """
+    compression = get_compression(input_file)
+    if compression is None:
+        return open(input_file, 'rb')
+
+    # Open decompressing reader
+    print('Decompressing [{}] input file while reading.....'.format(compression), log_type='info')
+    if compression == '.gz':
+        import gzip
+        file_object = gzip.open(input_file, 'rb')
+    elif compression == '.bz2':
+        import bz2
+        file_object = bz2.BZ2File(input_file, 'rb')
+    elif compression == '.xz':
+        try:
+            import lzma
+        except ImportError:
+            try:
+                from backports import lzma
+            except ImportError:
+                print('Can not import python lzma library!', log_type='error')
+                print('Try: pip install backports.lzma', log_type='hint')
+                sys.exit(1)
+        file_object = lzma.open(input_file, 'rb')
     else:
-        if n_cols == 2:
-            column_status = 1
-        else:
-            print('Number of expected columns does not match', log_type='warn', color='orange')
-            column_status = 0
+        try:
+            import zstandard
+        except ImportError:
+            print('Can not import python zstandard library!', log_type='error')
+            print('Try: pip install zstandard', log_type='hint')
+            sys.exit(1)
+        file_object = zstandard.ZstdDecompressor().stream_reader(open(input_file, 'rb'), closefd=True)
 
     # Return
-    return column_status
+    return io.BufferedReader(BackgroundReader(file_object=file_object), buffer_size=DECOMPRESSION_BLOCK_SIZE)
 
 
 # Get data value for networkx graph (data = True) in read_edgelist()
@@ -210,95 +219,151 @@ def is_weighted(weighted=None):
     return data_
 
 
-# Generate appropriate sanity check status code
-def generate_sanity_status(input_file_status=None, header_status=None, delimiter_status=None, column_status=None):
-    """
-    This function creates sanity check status codes
-    :param input_file_status:
-    :param header_status:
-    :param delimiter_status:
-    :param column_status:
-    :return: (int) status_code
-    """
-    status_code = 1
-    print('Sanity check.....', log_type='info', end='')
-    print('COMPLETE', color='green')
-    print('--------------- Summary -------------------')
-
-    # Input file
-    if input_file_status:
-        print('Input file.....', log_type='info', end='')
-        if input_file_status == 1:
-            print('OK', color='green')
-            status_code = status_code and 1
-        elif input_file_status == 0:
-            print('NOT OK', color='red')
-            status_code = status_code and 0
-
-    # Header
-    print('Headers.....', log_type='info', end='')
-    if header_status == 1:
-        print('OK', color='green')
-        status_code = status_code and 1
-    elif header_status == 0:
-        print('NOT OK', color='red')
-        status_code = status_code and 0
-
-    # Delimiter
-    print('Delimiter.....', log_type='info', end='')
-    if delimiter_status == 1:
-        print('OK', color='green')
-        status_code = status_code and 1
-    elif delimiter_status == 2:
-        print('[!] OK', color='orange')
-        print('Program might not detect nodes if input file does not have default (whitespace) delimiter',
-              log_type='warn', color='orange')
-        status_code = status_code and 1
-
-    # Columns
-    print('Columns.....', log_type='info', end='')
-    if column_status == 1:
-        print('OK', color='green')
-        status_code = status_code and 1
-    elif column_status == 0:
-        print('NOT OK', color='red')
-        status_code = status_code and 0
+# Validate parsed edge data
+def validate_edge_data(graph_df=None, weighted=None, numeric_nodes=True, row_offset=0, input_file=None):
+    """
+    This function validates every row of the parsed edge data with array operations. Errors fail the validation,
+    self-loops and duplicate edges are only counted.
+    ------------------------------------
+    =================
+    == Attention!! ==
+    =================
+    Unexpected number of columns => 0
+    Non integer / missing node ids => 0
+    NaN / infinite / negative weights => 0
+    else => 1
+    -------------------------------------
+    :param graph_df: (pandas data frame) Data frame parsed from the input file without column names
+    :param weighted: Does the file contain edge weights or not
+    :param numeric_nodes: Are the node ids expected to be integers or not (string ids are mapped later)
+    :param row_offset: (int) Number of data rows before the first row, e.g. of a chunk, reported rows are absolute
+    :param input_file: Input file path, errors then also report the line number in the file
+    :return: (int) validation status, (dict) validation report
+    """
+    report = {'rows': len(graph_df.index), 'columns': len(graph_df.columns), 'non_integer_ids': 0,
+              'nan_weights': 0, 'negative_weights': 0, 'self_loops': 0, 'duplicates': 0, 'errors': []}
+
+    # Position of the first invalid row, data rows are 1-based and do not count comment and blank lines
+    def first_invalid(invalid):
+        data_row = row_offset + int(np.argmax(invalid)) + 1
+        line_number = get_file_line_number(input_file, data_row) if input_file is not None else None
+        if line_number is None:
+            return 'data row {}'.format(data_row)
+        return 'line {} (data row {})'.format(line_number, data_row)
 
-    print('-------------------------------------------')
+    # Number of columns?
+    expected_columns = 3 if is_weighted(weighted) else 2
+    if report['columns'] != expected_columns:
+        report['errors'].append('Expected {} columns, found {} (check delimiter and weighted argument)'.format(
+            expected_columns, report['columns']))
+        return 0, report
+
+    # Node ids? Missing fields and uncommented headers show up as non integer ids
+    node_columns = []
+    for column in (0, 1):
+        values = graph_df[column].values
+        if not numeric_nodes:
+            invalid = pd.isnull(values)
+        elif values.dtype.kind in 'iu':
+            invalid = None
+        else:
+            values = pd.to_numeric(values, errors='coerce')
+            invalid = ~np.isfinite(values) | (values != np.floor(values))
+        if invalid is not None and invalid.any():
+            report['non_integer_ids'] += int(invalid.sum())
+            report['errors'].append('Non integer node ids in column {}, first at {}'.format(
+                column + 1, first_invalid(invalid)))
+        node_columns.append(values)
+
+    # Weights?
+    if expected_columns == 3:
+        weights = graph_df[2].values
+        if weights.dtype.kind not in 'iuf':
+            weights = pd.to_numeric(weights, errors='coerce')
+        if weights.dtype.kind == 'f':
+            invalid = ~np.isfinite(weights)
+            report['nan_weights'] = int(invalid.sum())
+            if report['nan_weights']:
+                report['errors'].append('NaN or infinite weights, first at {}'.format(first_invalid(invalid)))
+        negative = weights < 0
+        report['negative_weights'] = int(negative.sum())
+        if report['negative_weights']:
+            report['errors'].append('Negative weights, first at {}'.format(first_invalid(negative)))
+
+    # Self-loops and duplicate edges, only counted on valid ids
+    if not report['errors']:
+        source, target = node_columns
+        report['self_loops'] = int((source == target).sum())
+        if numeric_nodes and get_id_dtype(source) == np.int32 and get_id_dtype(target) == np.int32:
+            edge_keys = (source.astype(np.int64) << 32) | (target.astype(np.int64) & 0xFFFFFFFF)
+            report['duplicates'] = len(edge_keys) - len(pd.unique(edge_keys))
+        else:
+            report['duplicates'] = int(graph_df.duplicated(subset=[0, 1]).sum())
 
     # Return
-    return status_code
+    return int(not report['errors']), report
 
 
-# Sanity Check for file operations
-def sanity_check(input_file=None, delimiter=None, weighted=None):
+# Find the line of a data row in the input file
+def get_file_line_number(input_file=None, data_row=None):
     """
-    This function checks the sanity of the input and returns a status with file is weighted or not
-    :param input_file: Input file full path
-    :param delimiter: Column separator in the input file
-    :param weighted: Does the file contain edge weights or not
-    :return: sanity status
+    This function finds the line number of a data row in the input file. Comment and blank lines are skipped as
+    pandas read_csv(comment='#') skips them. The file is read again, so this is only used for error messages
+    :param input_file: Input file path
+    :param data_row: (int) 1-based data row
+    :return: (int) 1-based line number, None if the data row is not found
     """
-    # Get file information (Header, delimiter, number of columns etc.)
-    detected_delimiter, headers, n_cols, skip_n_rows = file_sniffer(input_file)
+    n_rows = 0
+    try:
+        with open_input_file(input_file) as f:
+            for line_number, line in enumerate(f, 1):
+                if line.split(b'#', 1)[0].strip():
+                    n_rows += 1
+                    if n_rows == data_row:
+                        return line_number
+    except (IOError, OSError, TypeError):
+        pass
 
-    # Input file?
-    input_file_status = check_input_file_permissions(input_file)
+    # Return
+    return None
 
-    # Header?
-    header_status = check_file_header(headers)
 
-    # Delimiter?
-    delimiter_status = check_delimiter(detected_delimiter, delimiter)
+# Merge validation reports of chunks
+def merge_validation_reports(report=None, chunk_report=None):
+    """
+    This function adds the counts of a chunk validation report to a running validation report
+    :param report: (dict) Running validation report, None for the first chunk
+    :param chunk_report: (dict) Validation report of a chunk
+    :return: (dict) merged validation report
+    """
+    if report is None:
+        return dict(chunk_report, errors=list(chunk_report['errors']))
+    for key in ('rows', 'non_integer_ids', 'nan_weights', 'negative_weights', 'self_loops', 'duplicates'):
+        report[key] += chunk_report[key]
+    report['errors'].extend(chunk_report['errors'])
 
-    # Number of columns?
-    column_status = check_columns(n_cols, weighted)
+    # Return
+    return report
 
-    # Generate sanity status
-    sanity_status = generate_sanity_status(input_file_status, header_status, delimiter_status, column_status)
 
-    # Return
-    return sanity_status
+# Print validation report
+def print_validation_report(report=None):
+    """
+    This function prints a short validation report, errors are printed one per line
+    :param report: (dict) Validation report
+    :return: <>
+    """
+    print('Validation.....', log_type='info', end='')
+    if report['errors']:
+        print('NOT OK', color='red')
+        for error in report['errors']:
+            print(error, log_type='error', color='red')
+    else:
+        print('OK', color='green')
+    print('Rows: {}, columns: {}, non integer ids: {}, NaN weights: {}, negative weights: {}, self-loops: {}, '
+          'duplicate edges: {}'.format(report['rows'], report['columns'], report['non_integer_ids'],
+                                       report['nan_weights'], report['negative_weights'], report['self_loops'],
+                                       report['duplicates']), log_type='info')
 
 
 # Create initial message
@@ -390,6 +455,94 @@ def generate_output_filename(input_file=None, prefix=None):
     return output_file
 
 
+# Get the smallest integer data type for ids
+def get_id_dtype(values=None):
+    """
+    This function finds the data type for integer ids, int32 if the id range allows it, otherwise int64
+    :param values: (numpy array) Integer ids
+    :return: (numpy dtype) int32 or int64
+    """
+    info = np.iinfo(np.int32)
+    if len(values) == 0 or (values.min() >= info.min and values.max() <= info.max):
+        return np.dtype(np.int32)
+
+    # Return
+    return np.dtype(np.int64)
+
+
+# Convert integer ids into the smallest data type
+def downcast_ids(values=None):
+    """
+    This function converts integer ids into int32, or into int64 if the id range needs it
+    :param values: (numpy array) Integer ids
+    :return: (numpy array) ids with int32 or int64 data type
+    """
+    values = np.asarray(values)
+
+    # Return
+    return values.astype(get_id_dtype(values), copy=False)
+
+
+# Print memory usage of a data structure
+def report_memory_usage(name=None, n_bytes=None, n_bytes_before=None):
+    """
+    This function prints the memory usage and, if known, the memory saved by tighter data types
+    :param name: Name of the data structure
+    :param n_bytes: (int) Memory usage in bytes
+    :param n_bytes_before: (int) Memory usage in bytes before tightening data types
+    :return: <>
+    """
+    message = '{} memory usage: {:.2f} MB'.format(name, n_bytes / 1048576.0)
+    if n_bytes_before is not None:
+        message += ' (saved {:.2f} MB)'.format((n_bytes_before - n_bytes) / 1048576.0)
+    print(message, log_type='info')
+
+
+# Create a data frame of nodes and communities
+def communities_to_data_frame(dict_communities=None):
+    """
+    This function creates a pandas data frame with node and cluster columns from a python dictionary of nodes and
+    communities, ids get the smallest integer data type
+    :param dict_communities: A python dictionary with communities assigned to nodes
+    :return: (pandas data frame) data frame with node and cluster columns
+    """
+    # Create columns
+    nodes = np.fromiter(dict_communities.keys(), dtype=np.int64, count=len(dict_communities))
+    clusters = np.fromiter(dict_communities.values(), dtype=np.int64, count=len(dict_communities))
+
+    # Return
+    return pd.DataFrame({'node': downcast_ids(nodes), 'cluster': downcast_ids(clusters)}, columns=['node', 'cluster'])
+
+
+# Complete a prior partition for a set of nodes
+def complete_partition(prior_partition=None, nodes=None):
+    """
+    This function maps nodes to the communities of a prior partition, e.g. the partition found at time 't', nodes that
+    are not in the prior partition become singleton communities. Communities are renumbered to 0 .. n - 1.
+    :param prior_partition: A python dictionary with communities assigned to nodes
+    :param nodes: (numpy array) Node ids
+    :return: (numpy array) Community of every node
+    """
+    prior_df = communities_to_data_frame(prior_partition).sort_values('node')
+    prior_nodes = prior_df['node'].values
+    prior_clusters = prior_df['cluster'].values.astype(np.int64)
+
+    # Find the nodes in the prior partition
+    positions = np.searchsorted(prior_nodes, nodes)
+    positions[positions == len(prior_nodes)] = 0
+    found = prior_nodes[positions] == nodes if len(prior_nodes) else np.zeros(len(nodes), dtype=bool)
+    communities = np.where(found, prior_clusters[positions] if len(prior_nodes) else 0, -1)
+
+    # New nodes start as singletons
+    n_new = int((~found).sum())
+    communities[~found] = (prior_clusters.max() + 1 if len(prior_clusters) else 0) + np.arange(n_new)
+    print('Prior partition covers {} of {} nodes, {} new nodes start as singletons'.format(
+        len(nodes) - n_new, len(nodes), n_new), log_type='info')
+
+    # Return
+    return np.unique(communities, return_inverse=True)[1].ravel()
+
+
 # Create a community file as output file
 def create_community_file(dict_communities=None, output_file=None):
     """
@@ -425,15 +578,8 @@ def create_community_file(dict_communities=None, output_file=None):
     # with open(output_file, 'w') as f:
     #     f.write(communities)
 
-    # Import pandas
-    try:
-        import pandas as pd
-    except ImportError as e:
-        print('Can not import python pandas library! ERROR: {}'.format(e), log_type='error')
-        sys.exit(1)
-
     # Create a pandas data frame from the dictionary
-    communities = pd.DataFrame(dict_communities.items(), columns=['node', 'cluster'], dtype=int)
+    communities = communities_to_data_frame(dict_communities)
 
     # Generate list of nodes that belongs to same community
     groups = communities.groupby('cluster')['node'].apply(list)
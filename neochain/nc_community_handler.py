@@ -4,10 +4,16 @@
 from __future__ import print_function
 
 # Import python libraries
+import os
+import re
 import sys
+import time
 import datetime
+import tempfile
+import collections
+import multiprocessing
 from pyrainbowterm import *
-import heapq
+import numpy as np
 
 # Import custom libraries
 import networkx as nx
@@ -16,6 +22,8 @@ import pandas as pd
 
 # Import custom libraries
 import _operations
+import _csr_graph
+import nc_data_handler
 
 # Import infomap
 from infomap import infomap
@@ -26,31 +34,65 @@ __author__ = 'Dalwar Hossain'
 __email__ = 'dalwar.hossain@protonmail.com'
 
 
+# Number of links handed to Infomap per block
+INFOMAP_LINK_BLOCK_SIZE = 1000000
+
+# Estimated seconds per link to build an infomap network and to run one core loop, used to fit a time budget
+INFOMAP_BUILD_SECONDS_PER_LINK = 0.000001
+INFOMAP_CORE_LOOP_SECONDS_PER_LINK = 0.0000002
+
+# Upper core loop limit of infomap trials with a time budget
+INFOMAP_MAX_CORE_LOOP_LIMIT = 10
+
+# Connected components with at most this many nodes become one community
+SMALL_COMPONENT_SIZE = 10
+
+# Keyword arguments that only apply to the giant component
+GIANT_COMPONENT_KWARGS = ('components', 'small_component_size', 'time_budget', 'trials', 'processes', 'hierarchical',
+                          'tree_file', 'overwrite_tree', 'prior_partition')
+
+# Extension of infomap module hierarchy (streamable tree) files
+INFOMAP_TREE_EXTENSION = '.tree'
+
+# Infomap options that are set per trial
+INFOMAP_TRIAL_OPTIONS = re.compile(r'(?<!\S)(--num-trials|-N|--seed|-s)(?:=|\s*)(\d+)(?!\S)')
+
+# Lazy map for python 2 and 3
+try:
+    from itertools import imap
+except ImportError:
+    imap = map
+
+# File path types for python 2 and 3
+try:
+    string_types = basestring
+except NameError:
+    string_types = str
+
+
 # Compose graph with networkx library
 # @profile  # Uncomment to profile this function for memory usage with 'mprof'
-def __compose_ntx_graph(input_file=None, delimiter=None, weighted=None):
+def __compose_ntx_graph(edge_list=None):
     """
-    This function creates a networkx graph from provided file
+    This function creates a networkx graph from a parsed edge list. Like networkx.read_weighted_edgelist(), a later
+    duplicate or reciprocal edge overwrites the weight of an earlier one, find_communities(..., aggregate=True) sums
+    them before the graph is created.
 
-    :param input_file: Input file path
-    :param delimiter: separator for the column of the input file
-    :param weighted: Simple yes/no if the input file is weighted or not
+    :param edge_list: (EdgeList) Parsed edge list of the input data
     :return: networkx graph
     """
-    # Get data for weighted networkx graph
-    file_is_weighted = _operations.is_weighted(weighted)
-
-    if file_is_weighted:
+    ntx_graph = nx.Graph()
+    if edge_list.weighted:
         print('Creating Networkx weighted graph.....', log_type='info')
         try:
-            ntx_graph = nx.read_weighted_edgelist(input_file, delimiter=delimiter, nodetype=int)
+            ntx_graph.add_weighted_edges_from(edge_list.edges())
         except Exception as e:
             print('Can not create weighted networkx graph. ERROR: {}'.format(e), color='red', log_type='error')
             sys.exit(1)
     else:
         print('Creating Networkx unweighted graph.....', log_type='info')
         try:
-            ntx_graph = nx.read_edgelist(input_file, delimiter=delimiter, nodetype=int)
+            ntx_graph.add_edges_from(edge_list.edges())
         except Exception as e:
             print('Can not create unweighted networkx graph. ERROR: {}'.format(e), color='red', log_type='error')
             sys.exit(1)
@@ -60,18 +102,19 @@ def __compose_ntx_graph(input_file=None, delimiter=None, weighted=None):
 
 
 # Run louvain method algorithm for community detection
-def __run_louvain(ntx_graph=None):
+def __run_louvain(ntx_graph=None, partition=None):
     """
     This function runs louvain method algorithm
 
     :param ntx_graph: (Graph) A networkx graph
+    :param partition: (dict) Python dictionary of all nodes and initial communities for a warm start, default [None]
     :return: (dict) Python dictionary of nodes and communities
     """
     print('Finding communities with louvain method.....', log_type='info')
     try:
         start_time = datetime.datetime.now()
         print('Louvain method started at: {}'.format(start_time.strftime("%H:%M:%S")), log_type='info')
-        louvain_communities = community.best_partition(ntx_graph)
+        louvain_communities = community.best_partition(ntx_graph, partition=partition)
         elapsed_time = datetime.datetime.now() - start_time
         print('Elapsed time: ', log_type='info', end='')
         print('{}'.format(elapsed_time), color='cyan', text_format='bold')
@@ -83,22 +126,107 @@ def __run_louvain(ntx_graph=None):
     return louvain_communities
 
 
-# Run infomap algorithm for community detection
-def __run_infomap(input_file=None, options=None):
+# Run a community detection algorithm over CSR arrays
+def __run_csr_engine(edge_list=None, algorithm=None, resolution=None, seed=None, prior_partition=None,
+                     deadline=None):
     """
-    This function runs infomap algorithm
+    This function runs a built-in community detection algorithm on CSR arrays (offsets, neighbors, weights) of the edge
+    list, no networkx graph is created
 
-    :param input_file: (str) A input file with accepted format from [www.mapequation.org]
-    :return: (dict) python dictionary of nodes and communities
+    :param edge_list: (EdgeList) Parsed edge list of the input data
+    :param algorithm: (string) louvain/leiden/lpa
+    :param resolution: (float) Resolution parameter, default [1.0]
+    :param seed: (int) Seed for the node order, default [None]
+    :param prior_partition: (dict) Python dictionary of nodes and communities to start from, default [None]
+    :param deadline: (float) time.time() after which the partition of the last finished level is returned
+    :return: (dict) Python dictionary of nodes and communities, (boolean) False if the deadline cut the run short
+    """
+    if resolution is None:
+        resolution = 1.0
+    print('Finding communities with {} method [csr engine].....'.format(algorithm), log_type='info')
+    try:
+        start_time = datetime.datetime.now()
+        print('{} method started at: {}'.format(algorithm.capitalize(), start_time.strftime("%H:%M:%S")),
+              log_type='info')
+        csr_graph = _csr_graph.build_csr_graph(edge_list=edge_list)
+        _operations.report_memory_usage('CSR graph', csr_graph.memory_usage())
+        initial_labels = None
+        if prior_partition is not None:
+            initial_labels = _operations.complete_partition(prior_partition=prior_partition, nodes=csr_graph.nodes)
+        if algorithm == 'leiden':
+            labels, completed = _csr_graph.leiden(graph=csr_graph, resolution=resolution, random_state=seed,
+                                                  labels=initial_labels, deadline=deadline)
+        elif algorithm == 'lpa':
+            labels, completed = _csr_graph.label_propagation(graph=csr_graph, random_state=seed,
+                                                             labels=initial_labels, deadline=deadline)
+        else:
+            levels, completed = _csr_graph.louvain(graph=csr_graph, resolution=resolution, random_state=seed,
+                                                   labels=initial_labels, deadline=deadline)
+            labels = _csr_graph.partition_at_level(levels=levels, n_nodes=len(csr_graph))
+        csr_communities = _csr_graph.labels_to_dict(graph=csr_graph, labels=labels)
+        elapsed_time = datetime.datetime.now() - start_time
+        print('Elapsed time: ', log_type='info', end='')
+        print('{}'.format(elapsed_time), color='cyan', text_format='bold')
+    except Exception as e:
+        print('Can not detect communities with {} method! ERROR: {}'.format(algorithm, e))
+        sys.exit(1)
+
+    # Return
+    return csr_communities, completed
+
+
+# Add links of an edge list to infomap
+def __add_infomap_links(infomap_wrapper=None, edge_list=None):
+    """
+    This function loads the links of an edge list into an Infomap network in memory, no file is written or read. The
+    SWIG interface has no bulk link call, Infomap.addLink() is a python function that wraps the native call, so every
+    link still costs one python function call (about 0.3 us per link). Writing a temporary link file for the native
+    reader costs about 2.4 us per link before Infomap parses it, so links are added one by one. The columns are
+    converted block by block into python lists to bound the memory of the converted links.
+
+    :param infomap_wrapper: (Infomap) Infomap object
+    :param edge_list: (EdgeList) Edge list of the network
+    :return: <>
+    """
+    # Infomap node ids are unsigned integers
+    if len(edge_list) and min(edge_list.source.min(), edge_list.target.min()) < 0:
+        print('Infomap requires non negative node ids!', log_type='error', color='red')
+        sys.exit(1)
+
+    print('Building Infomap network from {} links in memory.....'.format(len(edge_list)), log_type='info')
+    start_time = time.time()
+    add_link = infomap_wrapper.addLink
+    for start in range(0, len(edge_list), INFOMAP_LINK_BLOCK_SIZE):
+        stop = start + INFOMAP_LINK_BLOCK_SIZE
+        source = edge_list.source[start:stop].tolist()
+        target = edge_list.target[start:stop].tolist()
+        if edge_list.weighted:
+            weight = edge_list.weight[start:stop].astype(np.float64).tolist()
+        else:
+            weight = [1.0] * len(source)
+        collections.deque(imap(add_link, source, target, weight), maxlen=0)
+    elapsed_time = time.time() - start_time
+    print('Infomap network built in {:.2f} seconds ({:.2f} us per link)'.format(
+        elapsed_time, elapsed_time * 1e6 / max(len(edge_list), 1)), log_type='info')
+
+
+# Build and run infomap
+def __infomap_partition(edge_list=None, options=None, cluster_data_file=None, tree_file=None):
+    """
+    This function builds an Infomap network from an edge list, runs Infomap and collects the partition as arrays
+
+    :param edge_list: (EdgeList) Edge list of the network
+    :param options: (str) Infomap options, see [www.mapequation.org]
+    :param cluster_data_file: (str) Cluster data (.clu) file with the initial partition, default [None]
+    :param tree_file: (str) File to write the module hierarchy to (streamable tree), default [None]
+    :return: (float) code length, (numpy array) nodes, (numpy array) top module of every node
     """
-    # Options for Infomap class
-    options += ' --two-level -z'
-    print('Using options: {}'.format(options), log_type='info')
     infomap_wrapper = infomap.Infomap(options)
+    if cluster_data_file is not None:
+        infomap_wrapper.config.clusterDataFile = cluster_data_file
 
-    # Build infomap network from input file
-    print('Building Infomap network from the input file.....', log_type='info')
-    infomap_wrapper.readInputData(input_file)
+    # Build infomap network from the edge list in memory
+    __add_infomap_links(infomap_wrapper=infomap_wrapper, edge_list=edge_list)
 
     # Run infomap
     print("Finding communities with Infomap.....", log_type='info')
@@ -107,27 +235,650 @@ def __run_infomap(input_file=None, options=None):
     tree = infomap_wrapper.tree
     print("Found {} modules with code length: {}".format(tree.numTopModules(), tree.codelength()), log_type='info')
 
+    # Keep the full hierarchy for a later depth selection
+    if tree_file is not None:
+        tree.writeStreamableTree(tree_file, False)
+        print('Module hierarchy of depth {} written to: {}'.format(tree.maxDepth(), tree_file), log_type='info')
+
     # Find communities
-    infomap_communities = {}
-    for node in tree.leafIter():
-        infomap_communities[node.originalLeafIndex] = node.moduleIndex()
+    nodes = []
+    modules = []
+    for node in tree.leafIter(1):
+        nodes.append(node.originalLeafIndex)
+        modules.append(node.moduleIndex())
+
+    # Return
+    return tree.codelength(), np.array(nodes, dtype=np.int64), np.array(modules, dtype=np.int64)
+
+
+# Edge list shared by the infomap trial worker processes
+_infomap_trial_edge_list = None
+
+
+# Initialize an infomap trial worker process
+def __init_infomap_trial_worker(edge_list=None):
+    """
+    This function stores the edge list once per worker process, so it is not sent again with every trial
+
+    :param edge_list: (EdgeList) Edge list of the network
+    :return: <>
+    """
+    global _infomap_trial_edge_list
+    _infomap_trial_edge_list = edge_list
+
+
+# Run one infomap trial in a worker process
+def __run_infomap_trial(arguments=None):
+    """
+    This function runs one independently seeded Infomap trial in a worker process
+
+    :param arguments: (tuple) trial number, infomap options, seed, cluster data file, tree file
+    :return: (int) trial number, (tuple) code length, nodes, module of every node
+    """
+    trial, options, seed, cluster_data_file, tree_file = arguments
+    options += ' --seed {}'.format(seed)
+
+    # Return
+    return trial, __infomap_partition(edge_list=_infomap_trial_edge_list, options=options,
+                                      cluster_data_file=cluster_data_file, tree_file=tree_file)
+
+
+# Split the per trial options from infomap options
+def __split_infomap_options(options=None):
+    """
+    This function removes the number of trials (--num-trials, -N) and the seed (--seed, -s) from infomap options, they
+    are set once per trial by __run_infomap_trials()
+
+    :param options: (str) Infomap options
+    :return: (str) options without trials and seed, (int) number of trials or None, (int) seed or None
+    """
+    values = {}
+
+    def remove_option(match):
+        values[match.group(1)] = int(match.group(2))
+        return ' '
+
+    options = ' '.join(INFOMAP_TRIAL_OPTIONS.sub(remove_option, options).split())
+    num_trials = values.get('--num-trials', values.get('-N'))
+    seed = values.get('--seed', values.get('-s'))
+
+    # Return
+    return options, num_trials, seed
+
+
+# Fit infomap trials into a time budget
+def __get_infomap_budget(n_links=None, deadline=None, processes=None):
+    """
+    This function estimates the core loop limit and the number of trials that fit into the remaining time budget. A
+    trial costs building the network and the core loops, the estimates per link are INFOMAP_BUILD_SECONDS_PER_LINK and
+    INFOMAP_CORE_LOOP_SECONDS_PER_LINK.
+
+    :param n_links: (int) Number of links of the network
+    :param deadline: (float) time.time() after which the best trial so far is returned
+    :param processes: (int) Number of trials that run at the same time
+    :return: (int) core loop limit, (int) maximum number of trials
+    """
+    remaining = max(0.0, deadline - time.time())
+    build_seconds = max(n_links, 1) * INFOMAP_BUILD_SECONDS_PER_LINK
+    core_loop_seconds = max(n_links, 1) * INFOMAP_CORE_LOOP_SECONDS_PER_LINK
+    core_loop_limit = int(min(INFOMAP_MAX_CORE_LOOP_LIMIT, max(1, (remaining - build_seconds) / core_loop_seconds)))
+    trial_seconds = build_seconds + core_loop_limit * core_loop_seconds
+    max_trials = processes * max(1, int(remaining / trial_seconds))
+
+    # Return
+    return core_loop_limit, max_trials
+
+
+# Write a prior partition as infomap cluster data
+def __write_cluster_data_file(edge_list=None, prior_partition=None):
+    """
+    This function writes a prior partition of all nodes of the edge list into a temporary Infomap cluster data (.clu)
+    file, new nodes get singleton modules
+
+    :param edge_list: (EdgeList) Edge list of the network
+    :param prior_partition: (dict) Python dictionary of nodes and communities
+    :return: (str) path of the cluster data file
+    """
+    nodes = edge_list.nodes()
+    modules = _operations.complete_partition(prior_partition=prior_partition, nodes=nodes)
+    file_descriptor, cluster_data_file = tempfile.mkstemp(suffix='.clu')
+    with os.fdopen(file_descriptor, 'w') as clu_file:
+        clu_file.write('# node module\n')
+        pd.DataFrame({'node': nodes, 'module': modules + 1}, columns=['node', 'module']).to_csv(
+            clu_file, sep=' ', header=False, index=False)
+
+    # Return
+    return cluster_data_file
+
+
+# Run infomap algorithm for community detection
+def __run_infomap(edge_list=None, options=None, trials=None, processes=None, seed=None, prior_partition=None,
+                  tree_file=None, deadline=None):
+    """
+    This function runs infomap algorithm
+
+    :param edge_list: (EdgeList) Parsed edge list of the input data
+    :param options: (str) Infomap options, see [www.mapequation.org]
+    :param trials: (int) Number of independently seeded trials run in parallel, default [1]
+    :param processes: (int) Number of worker processes for the trials, default [number of cpu cores]
+    :param seed: (int) Seed of the first trial, trial k uses seed + k, default [123]
+    :param prior_partition: (dict) Python dictionary of nodes and communities to start from, default [None]
+    :param tree_file: (str) Keep the multi-level module hierarchy and write it to this file, default [None, two-level]
+    :param deadline: (float) time.time() after which the best trial so far is returned, default [None]
+    :return: (dict) python dictionary of nodes and (top level) communities, (boolean) False if the deadline cut the
+             run short, (pandas data frame) seed and code length of every finished trial
+    """
+    # Trials and seed are set per trial, conflicting values are rejected
+    options, num_trials, option_seed = __split_infomap_options(options=options)
+    if option_seed is not None:
+        if seed is not None and seed != option_seed:
+            print('Conflicting seeds {} (seed) and {} (options)!'.format(seed, option_seed), log_type='error',
+                  color='red')
+            sys.exit(1)
+        seed = option_seed
+    if num_trials is not None and trials is not None and trials > 1:
+        print('Use either trials or --num-trials in the options, not both!', log_type='error', color='red')
+        sys.exit(1)
+
+    # Options for Infomap class, a hierarchical run keeps all levels
+    if tree_file is None:
+        options += ' --two-level -z'
+    else:
+        options += ' -z'
+    # A time budget caps the core loops and the number of trials
+    if deadline is not None:
+        parallel = trials is not None and trials > 1
+        if parallel and processes is None:
+            processes = multiprocessing.cpu_count()
+        core_loop_limit, max_trials = __get_infomap_budget(n_links=len(edge_list), deadline=deadline,
+                                                           processes=min(processes, trials) if parallel else 1)
+        if '--core-loop-limit' not in options:
+            options += ' --core-loop-limit {}'.format(core_loop_limit)
+        if parallel and trials > max_trials:
+            print('Time budget fits {} of {} Infomap trials!'.format(max_trials, trials), log_type='warn')
+            trials = max_trials
+        if num_trials is not None and num_trials > max_trials:
+            print('Time budget fits {} of {} Infomap trials!'.format(max_trials, num_trials), log_type='warn')
+            num_trials = max_trials
+    print('Using options: {}'.format(options), log_type='info')
+
+    # Initial partition for a warm start
+    cluster_data_file = None
+    if prior_partition is not None:
+        cluster_data_file = __write_cluster_data_file(edge_list=edge_list, prior_partition=prior_partition)
+
+    try:
+        (codelength, nodes, modules), completed, trial_report = __run_infomap_trials(
+            edge_list=edge_list, options=options, trials=trials, processes=processes, seed=seed,
+            num_trials=num_trials, cluster_data_file=cluster_data_file, tree_file=tree_file, deadline=deadline)
+    finally:
+        if cluster_data_file is not None:
+            os.remove(cluster_data_file)
+
+    # Find communities
+    infomap_communities = dict(zip(nodes.tolist(), modules.tolist()))
+
+    # Return
+    return infomap_communities, completed, trial_report
+
+
+# Run one or more infomap trials
+def __run_infomap_trials(edge_list=None, options=None, trials=None, processes=None, seed=None, num_trials=None,
+                         cluster_data_file=None, tree_file=None, deadline=None):
+    """
+    This function runs a single Infomap trial, or independently seeded trials in a pool of processes and keeps the
+    partition with the lowest code length. After the deadline no more trials are collected, the remaining trials are
+    terminated and the best trial so far is kept, at least one trial always finishes.
+
+    :param edge_list: (EdgeList) Parsed edge list of the input data
+    :param options: (str) Infomap options, see [www.mapequation.org]
+    :param trials: (int) Number of independently seeded trials run in parallel, default [1]
+    :param processes: (int) Number of worker processes for the trials, default [number of cpu cores]
+    :param seed: (int) Seed of the first trial, trial k uses seed + k, default [123]
+    :param num_trials: (int) Number of trials of a single infomap run (--num-trials), default [None]
+    :param cluster_data_file: (str) Cluster data (.clu) file with the initial partition, default [None]
+    :param tree_file: (str) File to write the module hierarchy of the best trial to, default [None]
+    :param deadline: (float) time.time() after which the best trial so far is returned, default [None]
+    :return: (tuple) code length, nodes, module of every node, (boolean) False if the deadline cut the run short,
+             (pandas data frame) seed and code length of every finished trial
+    """
+    if trials is None or trials <= 1:
+        if num_trials is not None:
+            options += ' --num-trials {}'.format(num_trials)
+        if seed is not None:
+            options += ' --seed {}'.format(seed)
+        partition = __infomap_partition(edge_list=edge_list, options=options, cluster_data_file=cluster_data_file,
+                                        tree_file=tree_file)
+        trial_report = pd.DataFrame({'seed': [seed], 'codelength': [partition[0]]}, columns=['seed', 'codelength'])
+        return partition, deadline is None or time.time() <= deadline, trial_report.rename_axis('trial')
+
+    # Run independent trials in a pool of processes and keep the partition with the lowest code length
+    if seed is None:
+        seed = 123
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    processes = max(1, min(processes, trials))
+    print('Running {} Infomap trials with {} processes.....'.format(trials, processes), log_type='info')
+    pool = multiprocessing.Pool(processes=processes, initializer=__init_infomap_trial_worker,
+                                initargs=(edge_list,))
+    # Every trial writes its own hierarchy, only the one of the best trial is kept
+    trial_tree_files = [None] * trials
+    if tree_file is not None:
+        trial_tree_files = ['{}.{}'.format(tree_file, seed + trial) for trial in range(trials)]
+    results = {}
+    completed = True
+    try:
+        trial_results = pool.imap_unordered(__run_infomap_trial,
+                                            [(trial, options, seed + trial, cluster_data_file, trial_tree_files[trial])
+                                             for trial in range(trials)])
+        while len(results) < trials:
+            timeout = None
+            if deadline is not None and results:
+                timeout = max(0.0, deadline - time.time())
+            try:
+                trial, partition = trial_results.next(timeout)
+            except multiprocessing.TimeoutError:
+                print('Time budget exceeded after {} of {} Infomap trials!'.format(len(results), trials),
+                      log_type='warn')
+                completed = False
+                break
+            results[trial] = partition
+        if deadline is not None and time.time() > deadline:
+            completed = False
+    finally:
+        pool.terminate()
+        pool.join()
+
+    # Report spread of code lengths
+    finished_trials = sorted(results)
+    codelengths = np.array([results[trial][0] for trial in finished_trials])
+    best_trial = finished_trials[int(np.argmin(codelengths))]
+    trial_report = pd.DataFrame({'seed': [seed + trial for trial in finished_trials], 'codelength': codelengths},
+                                index=pd.Index(finished_trials, name='trial'), columns=['seed', 'codelength'])
+    print('Code length of {} trials: min {:.6f}, max {:.6f}, mean {:.6f}, std {:.6f}'.format(
+        len(finished_trials), codelengths.min(), codelengths.max(), codelengths.mean(), codelengths.std()),
+        log_type='info')
+    print('Best trial: {} (seed {})'.format(best_trial + 1, seed + best_trial), log_type='info')
+    if tree_file is not None:
+        if os.path.exists(tree_file):
+            os.remove(tree_file)
+        os.rename(trial_tree_files[best_trial], tree_file)
+        for trial_tree_file in trial_tree_files:
+            if os.path.exists(trial_tree_file):
+                os.remove(trial_tree_file)
+
+    # Return
+    return results[best_trial], completed, trial_report
+
+
+# Prior partition shared by the component worker processes
+_component_prior_partition = None
+
+
+# Initialize a component worker process
+def __init_component_worker(prior_partition=None):
+    """
+    This function stores the prior partition once per worker process, so it is not sent again with every component
+
+    :param prior_partition: (dict) Python dictionary of nodes and communities to start from
+    :return: <>
+    """
+    global _component_prior_partition
+    _component_prior_partition = prior_partition
+
+
+# Find communities of one connected component in a worker process
+def __find_component_worker(arguments=None):
+    """
+    This function finds the communities of one mid-size connected component in a worker process
+
+    :param arguments: (tuple) edge list of the component, algorithm, weighted, keyword arguments
+    :return: (dict) Python dictionary of nodes and communities
+    """
+    component_edge_list, algorithm, weighted, component_kwargs = arguments
+    if _component_prior_partition is not None:
+        component_kwargs = dict(component_kwargs)
+        component_kwargs['prior_partition'] = dict(
+            (node, _component_prior_partition[node]) for node in component_edge_list.nodes().tolist()
+            if node in _component_prior_partition)
+
+    # Return
+    return find_communities(component_edge_list, weighted=weighted, algorithm=algorithm, **component_kwargs)
+
+
+# Find communities per connected component
+def __find_component_communities(edge_list=None, algorithm=None, weighted=None, kwargs=None, deadline=None):
+    """
+    This function splits the graph into connected components. Small components become one community each, mid-size
+    components are detected in a pool of worker processes while the giant component runs the full algorithm with all
+    options in this process. Community ids are made unique over all components.
+
+    :param edge_list: (EdgeList) Parsed edge list of the input data
+    :param algorithm: (string) Community detection algorithm
+    :param weighted: (boolean) yes/no. Is the input file has a weight column?
+    :param kwargs: (dict) Keyword arguments of find_communities
+    :param deadline: (float) time.time() deadline of the giant component, default [None]
+    :return: (dict) Python dictionary of nodes and communities, (boolean) False if a time budget cut the giant
+             component short
+    """
+    # Label connected components on dense node indexes
+    nodes, inverse = np.unique(np.concatenate((edge_list.source, edge_list.target)), return_inverse=True)
+    inverse = inverse.ravel()
+    n_edges = len(edge_list)
+    components = _csr_graph.connected_components(source=inverse[:n_edges], target=inverse[n_edges:],
+                                                 n_nodes=len(nodes))
+    sizes = np.bincount(components)
+    giant = int(np.argmax(sizes))
+    small_component_size = kwargs.get('small_component_size', SMALL_COMPONENT_SIZE)
+    is_small = sizes <= small_component_size
+    is_small[giant] = False
+    mid_size = np.flatnonzero(~is_small)
+    mid_size = mid_size[mid_size != giant]
+    print('Found {} connected components: giant component with {} nodes, {} mid-size components, {} small '
+          'components'.format(len(sizes), sizes[giant], len(mid_size), int(is_small.sum())), log_type='info')
+
+    # Edges grouped by component
+    edge_components = components[inverse[:n_edges]]
+    edge_order = np.argsort(edge_components, kind='mergesort')
+    edge_starts = np.searchsorted(edge_components[edge_order], np.arange(len(sizes) + 1))
+
+    # Mid-size components in worker processes
+    component_kwargs = dict((key, value) for key, value in kwargs.items() if key not in GIANT_COMPONENT_KWARGS)
+    tasks = [(edge_list.select(edge_order[edge_starts[component]:edge_starts[component + 1]]), algorithm, weighted,
+              component_kwargs) for component in mid_size.tolist()]
+    pool = None
+    if tasks:
+        processes = kwargs.get('processes')
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        pool = multiprocessing.Pool(processes=max(1, min(processes, len(tasks))), initializer=__init_component_worker,
+                                    initargs=(kwargs.get('prior_partition'),))
+        mid_size_results = pool.map_async(__find_component_worker, tasks, chunksize=1)
+
+    # Giant component with all options in this process
+    try:
+        giant_kwargs = dict((key, value) for key, value in kwargs.items()
+                            if key not in ('components', 'small_component_size'))
+        if deadline is not None:
+            giant_kwargs['time_budget'] = max(0.0, deadline - time.time())
+        giant_edge_list = edge_list.select(edge_order[edge_starts[giant]:edge_starts[giant + 1]])
+        giant_detection = detect_communities(giant_edge_list, weighted=weighted, algorithm=algorithm,
+                                             **giant_kwargs)
+        completed = giant_detection.completed
+        results = [giant_detection.communities]
+        if pool is not None:
+            results.extend(mid_size_results.get())
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    # Merge communities with unique ids
+    component_nodes = []
+    component_labels = []
+    offset = 0
+    for communities in results:
+        component_nodes.append(np.fromiter(communities.keys(), dtype=nodes.dtype, count=len(communities)))
+        labels = _csr_graph.relabel(np.fromiter(communities.values(), dtype=np.int64, count=len(communities)))
+        component_labels.append(labels + offset)
+        offset += labels.max() + 1 if len(labels) else 0
+
+    # Small components become one community each
+    small_nodes = is_small[components]
+    component_nodes.append(nodes[small_nodes])
+    component_labels.append(_csr_graph.relabel(components[small_nodes]) + offset)
+    component_communities = dict(zip(np.concatenate(component_nodes).tolist(),
+                                     np.concatenate(component_labels).tolist()))
+
+    # Return
+    return component_communities, completed
+
+
+# Find communities on a pruned graph
+def __find_pruned_communities(edge_list=None, algorithm=None, weighted=None, kwargs=None, deadline=None):
+    """
+    This function strips leaves (nodes with at most prune_degree neighbors) round by round, finds the communities of
+    the remaining graph and attaches every pruned node to the community of its anchor neighbor
+
+    :param edge_list: (EdgeList) Parsed edge list of the input data
+    :param algorithm: (string) Community detection algorithm
+    :param weighted: (boolean) yes/no. Is the input file has a weight column?
+    :param kwargs: (dict) Keyword arguments of find_communities
+    :param deadline: (float) time.time() deadline, default [None]
+    :return: (dict) Python dictionary of nodes and communities, (boolean) False if a time budget cut the detection
+             short
+    """
+    csr_graph = _csr_graph.build_csr_graph(edge_list=edge_list)
+    remaining, anchor, n_rounds = _csr_graph.prune_leaves(graph=csr_graph, max_degree=kwargs['prune_degree'])
+
+    # Communities of the remaining graph
+    labels = np.zeros(len(csr_graph), dtype=np.int64)
+    source_index = np.searchsorted(csr_graph.nodes, edge_list.source)
+    target_index = np.searchsorted(csr_graph.nodes, edge_list.target)
+    pruned_edge_list = edge_list.select(remaining[source_index] & remaining[target_index])
+    remaining_kwargs = dict((key, value) for key, value in kwargs.items() if key != 'prune_degree')
+    if deadline is not None:
+        remaining_kwargs['time_budget'] = max(0.0, deadline - time.time())
+
+    # Nothing is left of an empty core, all nodes would end in the community of one anchor
+    if not len(pruned_edge_list):
+        print('Pruning with prune_degree={} leaves an empty core! Detecting without pruning.....'.format(
+            kwargs['prune_degree']), log_type='warn')
+        detection = detect_communities(edge_list, weighted=weighted, algorithm=algorithm, **remaining_kwargs)
+        return detection.communities, detection.completed
+
+    remaining_detection = detect_communities(pruned_edge_list, weighted=weighted, algorithm=algorithm,
+                                             **remaining_kwargs)
+    remaining_communities = remaining_detection.communities
+    completed = remaining_detection.completed
+    remaining_nodes = np.fromiter(remaining_communities.keys(), dtype=csr_graph.nodes.dtype,
+                                  count=len(remaining_communities))
+    labels[np.searchsorted(csr_graph.nodes, remaining_nodes)] = np.fromiter(
+        remaining_communities.values(), dtype=np.int64, count=len(remaining_communities))
+
+    # Attach the pruned nodes
+    labels = _csr_graph.attach_pruned_nodes(remaining=remaining, anchor=anchor, labels=labels)
+
+    # Return
+    return _csr_graph.labels_to_dict(graph=csr_graph, labels=labels), completed
+
+
+# Get the tree file of a hierarchical infomap run
+def __get_tree_file(input_file=None, tree_file=None, overwrite=False):
+    """
+    This function finds the file the module hierarchy is written to, an existing file is only overwritten if asked
+
+    :param input_file: (string / EdgeList / pandas data frame) Input dataset for community detection
+    :param tree_file: (string) File the hierarchy is written to, default [<input file>.tree] for a file path
+    :param overwrite: (boolean) Overwrite an existing tree file, default [False]
+    :return: (string) Tree file path
+    """
+    if tree_file is None:
+        if not isinstance(input_file, string_types):
+            print('A tree_file is required for a hierarchical run on an edge list or a data frame!', log_type='error',
+                  color='red')
+            sys.exit(1)
+        tree_file = os.path.splitext(input_file)[0] + INFOMAP_TREE_EXTENSION
+    if os.path.exists(tree_file) and not overwrite:
+        print('Tree file {} already exists!'.format(tree_file), log_type='error', color='red')
+        print('Use another tree_file or overwrite_tree=True', log_type='hint')
+        sys.exit(1)
 
     # Return
-    return infomap_communities
+    return tree_file
+
+
+# Module hierarchy of a hierarchical infomap run
+class InfomapHierarchy(object):
+    """
+    This class loads a module hierarchy written by a hierarchical infomap run once and returns the partition at any
+    depth, partitions are cached per depth
+
+    :param tree_file: (string) Streamable tree file written by find_communities(..., hierarchical=True)
+    """
+    def __init__(self, tree_file=None):
+        self.tree_file = tree_file
+        self.tree = infomap.HierarchicalNetwork(infomap.Config())
+        self.tree.readStreamableTree(tree_file)
+        self.__partitions = {}
+
+    def __repr__(self):
+        return '<InfomapHierarchy: {}, depth {}, code length {}>'.format(self.tree_file, self.max_depth,
+                                                                        self.codelength)
+
+    @property
+    def max_depth(self):
+        """
+        This function finds the depth of the leaf nodes, modules are at depth 1 .. max_depth - 1
+
+        :return: (int) depth
+        """
+        return self.tree.maxDepth()
+
+    @property
+    def codelength(self):
+        """
+        This function finds the code length of the hierarchy
+
+        :return: (float) code length
+        """
+        return self.tree.codelength()
+
+    def partition(self, depth=1):
+        """
+        This function finds the module of every node at a depth of the hierarchy
+
+        :param depth: (int) 1 for the top modules, max_depth - 1 or -1 for the finest modules, default [1]
+        :return: (dict) Python dictionary of nodes and communities
+        """
+        if depth == 0 or depth >= self.max_depth:
+            print('Invalid depth {}! Modules are at depth 1 .. {}'.format(depth, self.max_depth - 1),
+                  log_type='error', color='red')
+            sys.exit(1)
+        if depth not in self.__partitions:
+            self.__partitions[depth] = dict((node.originalLeafIndex, node.moduleIndex())
+                                            for node in self.tree.leafIter(depth))
+
+        # Return
+        return self.__partitions[depth]
+
+
+# Read a module hierarchy
+def read_infomap_hierarchy(tree_file=None):
+    """
+    This function reads a module hierarchy written by find_communities(..., algorithm='infomap', hierarchical=True)
+
+    :param tree_file: (string) Streamable tree file
+    :return: (InfomapHierarchy) Module hierarchy
+    """
+    if not _operations.check_input_file_permissions(tree_file):
+        sys.exit(1)
+    hierarchy = InfomapHierarchy(tree_file=tree_file)
+    print('Module hierarchy of depth {} with code length {} loaded'.format(hierarchy.max_depth,
+                                                                           hierarchy.codelength), log_type='info')
+
+    # Return
+    return hierarchy
+
+
+# Result of a community detection
+class CommunityDetection(object):
+    """
+    This class holds the result of detect_communities(), the same fields are set for every algorithm and option
+
+    :param communities: (dict) Python dictionary of nodes and communities
+    :param completed: (boolean) False if a time budget cut the detection short, always True without a time budget
+    :param trial_report: (pandas data frame) Seed and code length of every finished Infomap trial indexed by trial,
+                         None for other algorithms and for runs with components or prune_degree
+    """
+    def __init__(self, communities=None, completed=True, trial_report=None):
+        self.communities = communities
+        self.completed = completed
+        self.trial_report = trial_report
+
+    def __repr__(self):
+        return '<CommunityDetection: {} nodes, {} communities, completed: {}>'.format(
+            len(self.communities), len(set(self.communities.values())), self.completed)
 
 
 # Find communities
 def find_communities(input_file=None, delimiter=None, weighted=None, algorithm=None, **kwargs):
     """
-    This function finds community structure using defined algorithm
+    This function finds community structure using defined algorithm. It always returns the python dictionary of nodes
+    and communities, use detect_communities() to also know if a time budget cut the detection short and to get the
+    Infomap trial report.
 
-    :param input_file: (string) Input dataset for community detection, default [.txt]
+    :param input_file: (string / EdgeList / pandas data frame) Input dataset for community detection
     :param delimiter: (string) Column separator for input file, default [whitespace]
     :param weighted: (boolean) yes/no. Is the input file has a weight column?, default [no]
     :param algorithm: (string) Community detection algorithm, default [infomap]
+    :param kwargs: Options of detect_communities()
     :return: (dict) Python dictionary of nodes and communities
     """
-    if input_file:
+    # Return
+    return detect_communities(input_file=input_file, delimiter=delimiter, weighted=weighted, algorithm=algorithm,
+                              **kwargs).communities
+
+
+# Detect communities and report how the detection went
+def detect_communities(input_file=None, delimiter=None, weighted=None, algorithm=None, **kwargs):
+    """
+    This function finds community structure using defined algorithm and returns the communities together with the
+    completion of a time budget and the Infomap trial report
+
+    :param input_file: (string / EdgeList / pandas data frame) Input dataset for community detection, default [.txt],
+                       an already parsed edge list or a data frame with source, target (and weight) columns, e.g. a
+                       merged graph
+    :param delimiter: (string) Column separator for input file, default [whitespace]
+    :param weighted: (boolean) yes/no. Is the input file has a weight column?, default [no]
+    :param algorithm: (string) Community detection algorithm, default [infomap]
+    :param kwargs: infomap options:
+                   - options (string) Infomap options, --num-trials (-N) and --seed (-s) are taken out and set once
+                     per trial, they conflict with trials and seed
+                   - trials (int) number of independently seeded trials run in parallel, the partition with the lowest
+                     code length is kept
+                   - processes (int) number of worker processes for the trials
+                   - seed (int) seed of the first trial
+                   - hierarchical (boolean) keep the multi-level module hierarchy instead of two levels
+                   - tree_file (string) file the hierarchy is written to, default [<input file>.tree], required for
+                     an edge list or a data frame, read it later with read_infomap_hierarchy to get the partition at
+                     any depth without running infomap again
+                   - overwrite_tree (boolean) overwrite an existing tree file, default [False]
+                   louvain options:
+                   - engine (string) networkx/csr, default [networkx], the csr engine runs on arrays without a
+                     networkx graph
+                   - resolution (float) and seed (int) for the csr engine
+                   leiden options, always runs on the csr engine:
+                   - resolution (float) and seed (int)
+                   lpa options, vectorized label propagation on the csr engine for a fast first look:
+                   - seed (int)
+                   options of all algorithms:
+                   - aggregate (boolean / string) collapse duplicate and reciprocal edges into one edge with the sum
+                     of their weights before detection, 'count' also counts the collapsed edges, default [False].
+                     The csr engines (louvain with engine='csr', leiden and lpa) always sum them, without aggregate a
+                     later edge overwrites the weight of an earlier one in the networkx engine.
+                   - components (boolean) detect per connected component, components with at most
+                     small_component_size nodes become one community, mid-size components run in a pool of
+                     processes, only the giant component runs with all options
+                   - small_component_size (int) default [10]
+                   - prune_degree (int) strip nodes with at most prune_degree neighbors round by round before
+                     detection (1 for dust nodes) and attach them to the community of their neighbor afterwards,
+                     detection runs without pruning if nothing is left
+                   - prior_partition (dict) python dictionary of nodes and communities, e.g. found at time 't', to
+                     start from (warm start), nodes that are not in it start as singletons
+                   - time_budget (float) seconds of wall clock time, louvain/leiden keep the last level that finished
+                     in time, lpa stops propagating, infomap fits the core loop limit and the number of trials to the
+                     remaining budget and keeps the best trial so far
+    :return: (CommunityDetection) communities, completed (False if the time budget cut the detection short) and the
+             trial report of a plain Infomap run, e.g. trial_report.codelength.describe() for the code length spread
+    """
+    # Deadline of a time budget, reading the input counts as well
+    time_budget = kwargs.get('time_budget')
+    deadline = None
+    if time_budget is not None:
+        deadline = time.time() + time_budget
+
+    if input_file is not None:
         # Check for algorithm
         if algorithm is None:
             print('No algorithm specified! Using default [infomap].....', log_type='info')
@@ -149,62 +900,226 @@ def find_communities(input_file=None, delimiter=None, weighted=None, algorithm=N
         else:
             weighted = weighted
 
-        # Run sanity check once again
-        sanity_status = _operations.sanity_check(input_file=input_file, delimiter=delimiter, weighted=weighted)
+        # Read the input data once, validation runs on the parsed data
+        edge_list = nc_data_handler.__get_edge_list(input_data=input_file, delimiter=delimiter, weighted=weighted)
+
+        # Warm start from a prior partition
+        prior_partition = kwargs.get('prior_partition')
+        if prior_partition is not None:
+            print('Starting from a prior partition of {} nodes.....'.format(len(prior_partition)), log_type='info')
+
+        # Collapse duplicate and reciprocal edges before detection
+        if kwargs.get('aggregate'):
+            edge_list = edge_list.aggregate(count=kwargs['aggregate'] == 'count', directed=False)
+            print('Aggregated edge list size: {}'.format(len(edge_list)), log_type='info')
+
+        # Hierarchical infomap writes the module hierarchy to a tree file
+        if algorithm == 'infomap' and (kwargs.get('hierarchical') or kwargs.get('tree_file') is not None):
+            kwargs['tree_file'] = __get_tree_file(input_file=input_file, tree_file=kwargs.get('tree_file'),
+                                                  overwrite=kwargs.get('overwrite_tree', False))
+
+        # Trial reports are only available for a plain infomap run
+        trial_report = None
 
         # Run algorithm
-        if sanity_status == 1:
-            print('Initializing [{}] algorithm.....'.format(algorithm), log_type='info')
-            if algorithm == 'infomap':
-                # get options from kwargs
-                if 'options' in kwargs:
-                    infomap_options = kwargs['options']
-                else:
-                    infomap_options = ''
-                # Run infomap algorithm
-                all_communities = __run_infomap(input_file=input_file, options=infomap_options)
-
-            elif algorithm == 'louvain':
-                # Create networkx graph from input data
-                input_graph = __compose_ntx_graph(input_file=input_file, delimiter=delimiter, weighted=weighted)
-                all_communities = __run_louvain(ntx_graph=input_graph)
+        print('Initializing [{}] algorithm.....'.format(algorithm), log_type='info')
+        if kwargs.get('prune_degree'):
+            all_communities, completed = __find_pruned_communities(edge_list=edge_list, algorithm=algorithm,
+                                                                   weighted=weighted, kwargs=kwargs,
+                                                                   deadline=deadline)
 
+        elif kwargs.get('components'):
+            all_communities, completed = __find_component_communities(edge_list=edge_list, algorithm=algorithm,
+                                                                      weighted=weighted, kwargs=kwargs,
+                                                                      deadline=deadline)
+
+        elif algorithm == 'infomap':
+            # get options from kwargs
+            if 'options' in kwargs:
+                infomap_options = kwargs['options']
+            else:
+                infomap_options = ''
+            # Run infomap algorithm
+            all_communities, completed, trial_report = __run_infomap(
+                edge_list=edge_list, options=infomap_options, trials=kwargs.get('trials'),
+                processes=kwargs.get('processes'), seed=kwargs.get('seed'), prior_partition=prior_partition,
+                tree_file=kwargs.get('tree_file'), deadline=deadline)
+
+        elif algorithm == 'louvain':
+            engine = kwargs.get('engine', 'networkx')
+            if engine == 'networkx' and deadline is not None:
+                # python-louvain can not stop between levels
+                print('Time budget given, using [csr] louvain engine.....', log_type='info')
+                engine = 'csr'
+            if engine == 'csr':
+                all_communities, completed = __run_csr_engine(edge_list=edge_list, algorithm='louvain',
+                                                              resolution=kwargs.get('resolution'),
+                                                              seed=kwargs.get('seed'),
+                                                              prior_partition=prior_partition, deadline=deadline)
+            elif engine == 'networkx':
+                # Create networkx graph from input data
+                input_graph = __compose_ntx_graph(edge_list=edge_list)
+                partition = None
+                if prior_partition is not None:
+                    nodes = edge_list.nodes()
+                    partition = dict(zip(nodes.tolist(), _operations.complete_partition(
+                        prior_partition=prior_partition, nodes=nodes).tolist()))
+                all_communities = __run_louvain(ntx_graph=input_graph, partition=partition)
+                completed = True
             else:
-                print('Unknown algorithm name provided! Currently supports: infomap, louvain',
+                print('Unknown louvain engine provided! Currently supports: networkx, csr',
                       log_type='error', color='red')
                 sys.exit(1)
 
-            # Return all_communities that are detected
-            return all_communities
+        elif algorithm == 'leiden':
+            all_communities, completed = __run_csr_engine(edge_list=edge_list, algorithm='leiden',
+                                                          resolution=kwargs.get('resolution'),
+                                                          seed=kwargs.get('seed'), prior_partition=prior_partition,
+                                                          deadline=deadline)
+
+        elif algorithm == 'lpa':
+            all_communities, completed = __run_csr_engine(edge_list=edge_list, algorithm='lpa',
+                                                          seed=kwargs.get('seed'), prior_partition=prior_partition,
+                                                          deadline=deadline)
 
         else:
-            print('Sanity check failed!', log_type='error', color='red')
+            print('Unknown algorithm name provided! Currently supports: infomap, louvain, leiden, lpa',
+                  log_type='error', color='red')
             sys.exit(1)
 
+        # Return all_communities that are detected
+        if time_budget is not None and not completed:
+            print('Community detection was cut short by the time budget of {} seconds!'.format(time_budget),
+                  log_type='warn')
+        return CommunityDetection(communities=all_communities, completed=completed, trial_report=trial_report)
+
     else:
         print('Invalid parameters! Check input!!', log_type='error', color='red')
         sys.exit(1)
 
 
+# Run a louvain engine and measure time and memory
+def __measure_louvain_engine(edge_list=None, engine=None, seed=None, csr_graph=None):
+    """
+    This function runs one louvain engine twice, once for the elapsed time and once with tracemalloc (python 3 only) for
+    the peak memory, tracing slows python down and would distort the time
+
+    :param edge_list: (EdgeList) Edges of the CSR graph, every undirected edge once
+    :param engine: (string) networkx/csr
+    :param seed: (int) Seed for the node order
+    :param csr_graph: (CSRGraph) CSR graph of the edge list, the modularity is measured on it
+    :return: (dict) engine, seconds, peak memory in bytes, communities, modularity
+    """
+    try:
+        import tracemalloc
+    except ImportError:
+        tracemalloc = None
+
+    # Run engine
+    def run_engine():
+        if engine == 'csr':
+            return __run_csr_engine(edge_list=edge_list, algorithm='louvain', seed=seed)[0]
+        return __run_louvain(ntx_graph=__compose_ntx_graph(edge_list=edge_list))
+
+    start_time = datetime.datetime.now()
+    communities = run_engine()
+    elapsed_time = datetime.datetime.now() - start_time
+    peak_memory = None
+    if tracemalloc is not None:
+        tracemalloc.start()
+        run_engine()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    # Modularity of both partitions is measured on the same CSR graph
+    labels = np.array([communities[node] for node in csr_graph.nodes.tolist()])
+
+    # Return
+    return {'engine': engine, 'seconds': elapsed_time.total_seconds(), 'peak_memory': peak_memory,
+            'communities': len(np.unique(labels)), 'modularity': _csr_graph.modularity(csr_graph, labels)}
+
+
+# Compare louvain engines
+def compare_louvain_engines(input_file=None, delimiter=None, weighted=None, seed=None):
+    """
+    This function runs the networkx and the csr louvain engines on the same aggregated graph and reports elapsed time,
+    peak memory, number of communities and modularity side by side
+
+    :param input_file: (string / EdgeList / pandas data frame) Input dataset for community detection
+    :param delimiter: (string) Column separator for input file, default [whitespace]
+    :param weighted: (boolean) yes/no. Is the input file has a weight column?, default [no]
+    :param seed: (int) Seed for the node order of the csr engine, default [None]
+    :return: (pandas data frame) One row per engine
+    """
+    if input_file is None:
+        print('Invalid parameters! Check input!!', log_type='error', color='red')
+        sys.exit(1)
+
+    # Both engines run on the aggregated edges of one CSR graph, duplicate and reciprocal edges are summed once
+    edge_list = nc_data_handler.__get_edge_list(input_data=input_file, delimiter=delimiter, weighted=weighted)
+    csr_graph = _csr_graph.build_csr_graph(edge_list=edge_list)
+    source, target, weight = _csr_graph.csr_edges(graph=csr_graph)
+    edge_list = nc_data_handler.EdgeList(source=source, target=target, weight=weight, input_file=edge_list.input_file)
+    results = [__measure_louvain_engine(edge_list=edge_list, engine=engine, seed=seed, csr_graph=csr_graph)
+               for engine in ('networkx', 'csr')]
+    comparison_df = pd.DataFrame(results, columns=['engine', 'seconds', 'peak_memory', 'communities', 'modularity'])
+    comparison_df = comparison_df.set_index('engine')
+
+    # Report side by side
+    print('Louvain engines:\n{}'.format(comparison_df.to_string()), log_type='info')
+
+    # Return
+    return comparison_df
+
+
 # Find top 'n' communities
 def find_top_n_communities(all_communities=None, n=None):
     """
-    This function finds the top 'n' communities from a python dictionary of nodes and communities
+    This function finds the top 'n' communities from a python dictionary of nodes and communities. Community sizes are
+    counted with np.bincount on a label array and the 'n' largest are selected with np.argpartition, only the member
+    lists of the 'n' winners are created. Equal sizes keep the smaller community id first.
 
-    :param all_communities: (dict) A python dictionary of nodes and communities
+    :param all_communities: (dict / Partition) A python dictionary of nodes and communities or a partition
     :param n: (int) number of top community to be selected
-    :return: (dict) of top 'n' communities
+    :return: (dict) of top 'n' communities, a partition with the ranks as community ids for a partition
     """
-    # Create a Pandas data frame from dict to run group by
-    communities_df = pd.DataFrame(all_communities.items(), columns=['node', 'cluster'], dtype=int)
-
-    # Group nodes by community
-    node_groups = communities_df.groupby('cluster')['node'].apply(list)
+    # Node and community label arrays
+    if isinstance(all_communities, nc_data_handler.Partition):
+        nodes = all_communities.nodes
+        clusters = all_communities.labels
+    else:
+        nodes = np.fromiter(all_communities.keys(), dtype=np.int64, count=len(all_communities))
+        clusters = np.fromiter(all_communities.values(), dtype=np.int64, count=len(all_communities))
+    if len(clusters) and clusters.min() >= 0 and clusters.max() < 2 * len(clusters):
+        cluster_ids = None
+        labels = clusters
+    else:
+        cluster_ids, labels = np.unique(clusters, return_inverse=True)
+        labels = labels.ravel()
 
     # Find top (e.g. n=10) communities based on number of nodes in the community
-    # heapq.nlargest(n, iterable, [key]) is equivalent to
-    # sorted(flat_comm_list, key=len, reverse=True)[:10]
-    top_n_communities_ls = heapq.nlargest(n, node_groups, key=len)
+    sizes = np.bincount(labels)
+    n = min(n, np.count_nonzero(sizes))
+    winners = np.empty(0, dtype=np.int64)
+    if n > 0:
+        threshold = sizes[np.argpartition(-sizes, n - 1)[n - 1]]
+        larger = np.flatnonzero(sizes > threshold)
+        equal = np.flatnonzero(sizes == threshold)[:n - len(larger)]
+        winners = np.concatenate((larger, equal))
+    winners = winners[np.lexsort((winners, -sizes[winners]))]
+
+    # Materialize the members of the winners only, nodes keep their order
+    rank = np.full(len(sizes), -1, dtype=np.int64)
+    rank[winners] = np.arange(len(winners))
+    member_rank = rank[labels]
+    selected = np.flatnonzero(member_rank >= 0)
+    selected = selected[np.argsort(member_rank[selected], kind='mergesort')]
+    if isinstance(all_communities, nc_data_handler.Partition):
+        offsets = np.zeros(len(winners) + 1, dtype=np.int64)
+        np.cumsum(sizes[winners], out=offsets[1:])
+        return nc_data_handler.Partition(nodes=nodes[selected], offsets=offsets, ids=np.arange(1, len(winners) + 1))
+    members = np.split(nodes[selected], np.cumsum(sizes[winners])[:-1]) if len(winners) else []
+    top_n_communities_ls = [community_members.tolist() for community_members in members]
 
     # Convert list of lists into dictionary
     top_n_communities_dict = _operations.__get_dict(top_n_communities_ls)
@@ -244,11 +1159,17 @@ def find_relative_overlap(communities_t=None, communities_t1=None, similarity_me
     """
     This function calculates relative overlap of communities
 
-    :param communities_t: (python dict) Top 'n' communities at time 't'
-    :param communities_t1: (python dict) Top 'n' communities at time 't+1'
+    :param communities_t: (python dict / Partition) Top 'n' communities at time 't'
+    :param communities_t1: (python dict / Partition) Top 'n' communities at time 't+1'
     :param similarity_measure: Similarity measure to use.
     :return: (python list) list of similar pairs of community id with similarity
     """
+    # Partitions are compared member list by member list
+    if isinstance(communities_t, nc_data_handler.Partition):
+        communities_t = communities_t.to_community_dict()
+    if isinstance(communities_t1, nc_data_handler.Partition):
+        communities_t1 = communities_t1.to_community_dict()
+
     # Get a dictionary of communities at time 't'
     # communities_t_dict = _operations.__get_dict(data=communities_t)
 
@@ -0,0 +1,1389 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+# Import python libraries
+import os
+import sys
+import itertools
+import collections
+import multiprocessing
+from pyrainbowterm import *
+import numpy as np
+import pandas as pd
+
+# Import custom libraries
+import _operations
+
+
+# Source code meta data
+__author__ = 'Dalwar Hossain'
+__email__ = 'dalwar.hossain@protonmail.com'
+
+
+# Binary edge list format
+# ----------------------------------------------------------------
+# header (16 bytes) | source (int32 x n) | target (int32 x n) | weight (float32 x n, optional)
+# ----------------------------------------------------------------
+BINARY_MAGIC = b'NCEL'
+BINARY_VERSION = 1
+BINARY_EXTENSION = '.nce'
+BINARY_HEADER = np.dtype([('magic', 'S4'), ('version', '<u2'), ('weighted', '<u2'), ('n_edges', '<u8')])
+BINARY_NODE_DTYPE = np.dtype('<i4')
+BINARY_WEIGHT_DTYPE = np.dtype('<f4')
+
+# Columnar (parquet) snapshot store
+PARQUET_MAGIC = b'PAR1'
+PARQUET_EXTENSION = '.parquet'
+PARQUET_OUT_ROW_GROUPS_KEY = 'neochain.out_row_groups'
+DEFAULT_ROW_GROUP_SIZE = 1000000
+
+# Number of edges per chunk for streaming reads
+DEFAULT_CHUNK_SIZE = 1000000
+
+# Memory budget of the parsed snapshot cache in bytes
+DEFAULT_SNAPSHOT_CACHE_SIZE = 4 * 1024 * 1024 * 1024
+
+
+# Parsed edge list of a graph snapshot
+class EdgeList(object):
+    """
+    This class holds a parsed graph snapshot as column arrays, so that a file is read only once and shared by the
+    validation, community detection and sub-graph creation
+
+    :param source: (numpy array) Source node of every edge
+    :param target: (numpy array) Target node of every edge
+    :param weight: (numpy array) Weight of every edge, None for an unweighted snapshot
+    :param input_file: (string) File path that the edge list was read from
+    :param count: (numpy array) Number of collapsed duplicate edges (transactions) of every edge, None if not counted
+    """
+    def __init__(self, source=None, target=None, weight=None, input_file=None, count=None):
+        self.source = source
+        self.target = target
+        self.weight = weight
+        self.input_file = input_file
+        self.count = count
+
+    def __len__(self):
+        return len(self.source)
+
+    def __repr__(self):
+        return '<EdgeList: {} edges, weighted={}, input_file={}>'.format(len(self), self.weighted, self.input_file)
+
+    @property
+    def weighted(self):
+        """
+        This property tells if the edge list has a weight column or not
+
+        :return: (boolean) True if weighted
+        """
+        return self.weight is not None
+
+    def memory_usage(self):
+        """
+        This function calculates the memory used by the edge columns
+
+        :return: (int) Memory usage in bytes
+        """
+        columns = (self.source, self.target, self.weight, self.count)
+
+        # Return
+        return sum(column.nbytes for column in columns if column is not None)
+
+    def nodes(self):
+        """
+        This function finds the unique nodes of the edge list
+
+        :return: (numpy array) Sorted unique node ids
+        """
+        return np.unique(np.concatenate((self.source, self.target)))
+
+    def edges(self):
+        """
+        This function creates an edge iterator for graph builders (networkx, infomap)
+
+        :return: (iterator) (source, target) or (source, target, weight) tuples
+        """
+        if self.weighted:
+            return zip(self.source.tolist(), self.target.tolist(), self.weight.tolist())
+        return zip(self.source.tolist(), self.target.tolist())
+
+    def to_data_frame(self):
+        """
+        This function creates a pandas data frame from the edge list
+
+        :return: (pandas data frame) a data frame with source, target (and weight) columns
+        """
+        columns = {'source': self.source, 'target': self.target}
+        headers = ['source', 'target']
+        if self.weighted:
+            columns['weight'] = self.weight
+            headers.append('weight')
+        if self.count is not None:
+            columns['count'] = self.count
+            headers.append('count')
+
+        # Return
+        return pd.DataFrame(columns, columns=headers)
+
+    def select(self, mask=None):
+        """
+        This function creates a new edge list from the edges selected by a boolean mask or an index array
+
+        :param mask: (numpy array) Boolean mask or indexes of the edges to keep
+        :return: (EdgeList) A new edge list
+        """
+        weight = self.weight[mask] if self.weighted else None
+        count = self.count[mask] if self.count is not None else None
+        return EdgeList(source=self.source[mask], target=self.target[mask], weight=weight, input_file=self.input_file,
+                        count=count)
+
+    def aggregate(self, count=False, directed=True):
+        """
+        This function collapses duplicate (source, target) edges into one edge with the sum of their weights. The edges
+        are grouped with one sort by (source, target), see sort_edges().
+
+        :param count: (boolean) Also count the number of collapsed edges (transactions) of every edge
+        :param directed: (boolean) If False, (a, b) and (b, a) are the same edge
+        :return: (EdgeList) A new edge list without duplicate edges, sorted by (source, target)
+        """
+        source = self.source
+        target = self.target
+        if not directed:
+            source, target = np.minimum(self.source, self.target), np.maximum(self.source, self.target)
+
+        # Group duplicate edges
+        order, starts = sort_edges(source, target)
+        n_edges = len(starts)
+        inverse = np.empty(len(order), dtype=np.int64)
+        inverse[order] = np.repeat(np.arange(n_edges), np.diff(np.append(starts, len(order))))
+        source = source[order[starts]]
+        target = target[order[starts]]
+        weight = None
+        if self.weighted:
+            weight = np.bincount(inverse, weights=self.weight, minlength=n_edges).astype(self.weight.dtype)
+        edge_count = None
+        if count:
+            if self.count is not None:
+                edge_count = np.bincount(inverse, weights=self.count, minlength=n_edges).astype(np.int64)
+            else:
+                edge_count = np.bincount(inverse, minlength=n_edges)
+        print('Collapsed {} duplicate edges.....'.format(len(self) - n_edges), log_type='info')
+
+        # Return
+        return EdgeList(source=source, target=target, weight=weight, input_file=self.input_file, count=edge_count)
+
+
+# Pack (source, target) pairs into 64-bit keys
+def pack_edge_keys(source=None, target=None):
+    """
+    This function packs every (source, target) pair into one 64-bit integer key, sorting the keys sorts the edges by
+    source and then by target
+
+    :param source: (numpy array) Source node of every edge, must fit into int32
+    :param target: (numpy array) Target node of every edge, must fit into int32
+    :return: (numpy array) int64 edge keys
+    """
+    if not (__fits_edge_keys(source) and __fits_edge_keys(target)):
+        print('Node ids do not fit into 32 bits of packed edge keys! Use sort_edges()', log_type='error',
+              color='red')
+        sys.exit(1)
+
+    # Return
+    return (source.astype(np.int64) << 32) | (target.astype(np.int64) & 0xFFFFFFFF)
+
+
+# Check if node ids fit into packed edge keys
+def __fits_edge_keys(column=None):
+    """
+    This function checks if the node ids of a column fit into the 32 bits of a packed edge key
+
+    :param column: (numpy array) Node ids
+    :return: (boolean) True if all node ids fit into int32
+    """
+    info = np.iinfo(np.int32)
+
+    # Return
+    return not len(column) or (column.min() >= info.min and column.max() <= info.max)
+
+
+# Sort edges by (source, target)
+def sort_edges(source=None, target=None):
+    """
+    This function sorts edges by source and then by target and finds the first edge of every group of equal
+    (source, target) pairs. Node ids that fit into int32 are packed into one 64-bit key and sorted once, wider node ids
+    (int64 ids of a large id range) are sorted with np.lexsort. Both sorts are stable, equal edges keep their order.
+
+    :param source: (numpy array) Source node of every edge
+    :param target: (numpy array) Target node of every edge
+    :return: (numpy array) order of the edges, (numpy array) position of the first edge of every group in that order
+    """
+    if __fits_edge_keys(source) and __fits_edge_keys(target):
+        edge_keys = pack_edge_keys(source, target)
+        order = np.argsort(edge_keys, kind='mergesort')
+        edge_keys = edge_keys[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = edge_keys[1:] != edge_keys[:-1]
+    else:
+        order = np.lexsort((target, source))
+        sorted_source = source[order]
+        sorted_target = target[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = (sorted_source[1:] != sorted_source[:-1]) | (sorted_target[1:] != sorted_target[:-1])
+
+    # Return
+    return order, np.flatnonzero(first)
+
+
+# Unpack 64-bit keys into (source, target) pairs
+def unpack_edge_keys(edge_keys=None, dtype=None):
+    """
+    This function unpacks 64-bit edge keys that were created with pack_edge_keys()
+
+    :param edge_keys: (numpy array) int64 edge keys
+    :param dtype: (numpy dtype) data type of the node ids, default [int64]
+    :return: (numpy array, numpy array) source and target node of every edge
+    """
+    if dtype is None:
+        dtype = np.int64
+    source = (edge_keys >> 32).astype(dtype)
+    target = (edge_keys & 0xFFFFFFFF).astype(np.uint32).view(np.int32).astype(dtype)
+
+    # Return
+    return source, target
+
+
+# Persistent node dictionary for string node ids
+class NodeDictionary(object):
+    """
+    This class maps string node ids (e.g. hashed blockchain addresses) to dense int32 ids. The dictionary can be saved
+    and loaded again, so the same address gets the same id in every snapshot (t, t+1, ...)
+
+    :param addresses: (numpy array) Known addresses, the position of an address is its id
+    """
+    def __init__(self, addresses=None):
+        if addresses is None:
+            addresses = []
+        self._address_list = list(addresses)
+        self._ids = dict((address, node_id) for node_id, address in enumerate(self._address_list))
+        self._addresses = None
+
+    def __len__(self):
+        return len(self._address_list)
+
+    @property
+    def addresses(self):
+        """
+        This property returns the known addresses as an array, the position of an address is its id. The array is
+        only created again after new addresses were added.
+
+        :return: (numpy array) Addresses
+        """
+        if self._addresses is None or len(self._addresses) != len(self._address_list):
+            self._addresses = np.array(self._address_list, dtype=object)
+        return self._addresses
+
+    def __repr__(self):
+        return '<NodeDictionary: {} nodes>'.format(len(self))
+
+    def encode(self, addresses=None):
+        """
+        This function converts addresses into integer ids, unknown addresses get new ids in order of appearance. Only
+        the unique addresses of the call are looked up in the dictionary, which grows in place, so the cost of a call
+        does not depend on the size of the dictionary.
+
+        :param addresses: (numpy array) Addresses to convert
+        :return: (numpy array) int32 node ids
+        """
+        inverse, unique_addresses = pd.factorize(np.asarray(addresses, dtype=object))
+        unique_ids = np.fromiter((self._ids.get(address, -1) for address in unique_addresses), dtype=np.int64,
+                                 count=len(unique_addresses))
+
+        # Add unknown addresses to the dictionary
+        unknown = np.flatnonzero(unique_ids < 0)
+        if len(unknown):
+            if len(self) + len(unknown) > np.iinfo(np.int32).max:
+                print('Node dictionary does not fit into int32 ids!', log_type='error', color='red')
+                sys.exit(1)
+            unique_ids[unknown] = np.arange(len(self), len(self) + len(unknown))
+            new_addresses = unique_addresses[unknown].tolist()
+            self._ids.update(zip(new_addresses, unique_ids[unknown].tolist()))
+            self._address_list.extend(new_addresses)
+
+        # Return
+        return unique_ids[inverse].astype(np.int32)
+
+    def decode(self, ids=None):
+        """
+        This function converts integer ids back into addresses
+
+        :param ids: (numpy array) Node ids
+        :return: (numpy array) Addresses
+        """
+        return self.addresses[np.asarray(ids)]
+
+    def save(self, output_file=None):
+        """
+        This function writes the dictionary into a file with one address per line, the line number is the node id
+
+        :param output_file: (string) A path to the output file
+        :return: (string) output file path
+        """
+        print('Creating node dictionary file.....', log_type='info')
+        try:
+            pd.Series(self.addresses).to_csv(output_file, header=False, index=False)
+        except Exception as e:
+            print('Can not create node dictionary file! ERROR: {}'.format(e), log_type='error', color='red')
+            sys.exit(1)
+
+        # Return
+        return output_file
+
+
+# Read a node dictionary file
+def read_node_dictionary(input_file=None):
+    """
+    This function reads a node dictionary that was saved with NodeDictionary.save()
+
+    :param input_file: (string) A path to the node dictionary file
+    :return: (NodeDictionary) Node dictionary
+    """
+    input_file_status = _operations.check_input_file_permissions(input_file)
+    if input_file_status == 0:
+        print('Can not read node dictionary!', log_type='error', color='red')
+        sys.exit(1)
+
+    # Read addresses
+    print('Reading node dictionary.....', log_type='info')
+    try:
+        addresses = pd.read_csv(input_file, header=None, dtype=str, keep_default_na=False)[0].values
+    except pd.errors.EmptyDataError:
+        addresses = None
+    except Exception as e:
+        print('Can not read node dictionary! ERROR: {}'.format(e), log_type='error', color='red')
+        sys.exit(1)
+    node_dictionary = NodeDictionary(addresses=addresses)
+    print('Node dictionary size: {}'.format(len(node_dictionary)), log_type='info')
+
+    # Return
+    return node_dictionary
+
+
+# Community membership of nodes in compressed sparse row format
+class Partition(object):
+    """
+    This class stores a partition with arrays instead of python dicts. Node ids are grouped by community, the members of
+    the k-th community are nodes[offsets[k]:offsets[k + 1]] and labels holds the position k of the community of every
+    node. Community ids are sorted ascending, e.g. community ids of a detection run or ranks of top 'n' communities.
+
+    :param nodes: (numpy array) Node ids grouped by community
+    :param offsets: (numpy array) Start of every community in nodes, length number of communities + 1
+    :param ids: (numpy array) Sorted community ids, default [0 .. number of communities - 1]
+    """
+    def __init__(self, nodes=None, offsets=None, ids=None):
+        self.nodes = nodes
+        self.offsets = offsets
+        self.ids = np.arange(len(offsets) - 1) if ids is None else ids
+        self.labels = np.repeat(np.arange(len(self.ids)), np.diff(offsets))
+        self._node_order = None
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __repr__(self):
+        return '<Partition: {} nodes, {} communities>'.format(len(self), self.n_communities)
+
+    @property
+    def n_communities(self):
+        """
+        This function finds the number of communities
+
+        :return: (int) Number of communities
+        """
+        return len(self.ids)
+
+    def sizes(self):
+        """
+        This function finds the number of members of every community
+
+        :return: (numpy array) Size of every community, in the order of ids
+        """
+        return np.diff(self.offsets)
+
+    def memory_usage(self):
+        """
+        This function calculates the memory used by the partition arrays
+
+        :return: (int) Memory usage in bytes
+        """
+        return self.nodes.nbytes + self.offsets.nbytes + self.ids.nbytes + self.labels.nbytes
+
+    def members(self, community=None):
+        """
+        This function finds the members of a community without copying them
+
+        :param community: (int) Community id
+        :return: (numpy array) Member nodes, a view into nodes
+        """
+        position = np.searchsorted(self.ids, community)
+        if position == len(self.ids) or self.ids[position] != community:
+            raise KeyError(community)
+
+        # Return
+        return self.nodes[self.offsets[position]:self.offsets[position + 1]]
+
+    def community_of(self, nodes=None):
+        """
+        This function finds the community of one node or of an array of nodes
+
+        :param nodes: (int / numpy array) Node id(s)
+        :return: (int / numpy array) Community id(s), -1 for unknown nodes
+        """
+        if self._node_order is None:
+            self._node_order = np.argsort(self.nodes, kind='mergesort')
+        node_array = np.atleast_1d(nodes)
+        communities = np.full(len(node_array), -1, dtype=np.int64)
+        if len(self.nodes):
+            sorted_nodes = self.nodes[self._node_order]
+            positions = np.minimum(np.searchsorted(sorted_nodes, node_array), len(sorted_nodes) - 1)
+            found = sorted_nodes[positions] == node_array
+            communities[found] = self.ids[self.labels[self._node_order[positions[found]]]]
+
+        # Return
+        return communities if np.ndim(nodes) else int(communities[0])
+
+    def items(self):
+        """
+        This function iterates over communities and their member nodes like dict.items()
+
+        :return: (generator) community id, member nodes
+        """
+        for position, community in enumerate(self.ids.tolist()):
+            yield community, self.nodes[self.offsets[position]:self.offsets[position + 1]]
+
+    def to_dict(self):
+        """
+        This function converts the partition into a python dictionary of nodes and communities
+
+        :return: (dict) Python dictionary of nodes and communities
+        """
+        return dict(zip(self.nodes.tolist(), self.ids[self.labels].tolist()))
+
+    def to_community_dict(self):
+        """
+        This function converts the partition into a python dictionary of communities and lists of member nodes, like the
+        top 'n' communities
+
+        :return: (dict) Python dictionary of communities and member lists
+        """
+        return dict((community, members.tolist()) for community, members in self.items())
+
+
+# Create a partition from node and community arrays
+def partition_from_arrays(nodes=None, communities=None):
+    """
+    This function groups nodes by community into a partition, nodes keep their order inside a community
+
+    :param nodes: (numpy array) Node ids
+    :param communities: (numpy array) Community id of every node
+    :return: (Partition) Partition
+    """
+    ids, labels = np.unique(communities, return_inverse=True)
+    labels = labels.ravel()
+    order = np.argsort(labels, kind='mergesort')
+    offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(labels, minlength=len(ids)), out=offsets[1:])
+
+    # Return
+    return Partition(nodes=np.asarray(nodes)[order], offsets=offsets, ids=ids)
+
+
+# Create a partition from a python dictionary
+def create_partition(communities=None):
+    """
+    This function converts a python dictionary of nodes and communities (find_communities) or of communities and member
+    lists (find_top_n_communities) into a partition, a partition is returned as it is
+
+    :param communities: (dict / Partition) Communities
+    :return: (Partition) Partition
+    """
+    if isinstance(communities, Partition):
+        return communities
+
+    # Communities and member lists
+    values = list(itertools.islice(communities.values(), 1))
+    if values and isinstance(values[0], (list, tuple, np.ndarray)):
+        sizes = [len(members) for members in communities.values()]
+        nodes = np.fromiter(itertools.chain.from_iterable(communities.values()), dtype=np.int64, count=sum(sizes))
+        ids = np.repeat(np.fromiter(communities.keys(), dtype=np.int64, count=len(communities)), sizes)
+        return partition_from_arrays(nodes=nodes, communities=ids)
+
+    # Nodes and communities
+    nodes = np.fromiter(communities.keys(), dtype=np.int64, count=len(communities))
+    ids = np.fromiter(communities.values(), dtype=np.int64, count=len(communities))
+
+    # Return
+    return partition_from_arrays(nodes=nodes, communities=ids)
+
+
+# Get pandas read_csv options for reading node ids
+def __get_node_read_options(node_dictionary=None):
+    """
+    This function returns the read_csv options of the node columns. String ids are read as strings and never as
+    missing values, addresses like "NA", "nan" or "null" are valid node ids.
+
+    :param node_dictionary: (NodeDictionary) Dictionary for string node ids
+    :return: (dict) keyword arguments for pandas read_csv
+    """
+    if node_dictionary is None:
+        return {}
+
+    # Return
+    return {'dtype': {0: str, 1: str}, 'keep_default_na': False, 'na_filter': False}
+
+
+# Get options for reading a text edge list
+def __get_read_options(delimiter=None, weighted=None):
+    """
+    This function checks the delimiter and weighted arguments for reading a text edge list
+
+    :param delimiter: (string) Columns separator in the input file, default [whitespace]
+    :param weighted: (boolean) yes/no, if the input file has weight column or not, default [no]
+    :return: weighted argument, is the file weighted, separator for pandas read_csv
+    """
+    # Although checking weighted values is required
+    if weighted is None:
+        print('No weighted parameter provided! Using default [no].....', log_type='info')
+        weighted = 'No'
+    file_is_weighted = _operations.is_weighted(weighted)
+
+    # Also the delimiter is required to be checked
+    if delimiter is None:
+        print('No delimiter provided! Using default [whitespace].....', log_type='info')
+        separator = r'\s+'
+    else:
+        separator = delimiter
+
+    # Return
+    return weighted, file_is_weighted, separator
+
+
+# Create an edge list from a parsed data frame
+def __data_frame_to_edge_list(graph_df=None, file_is_weighted=None, input_file=None, node_dictionary=None):
+    """
+    This function creates an edge list from a data frame parsed without column names
+
+    :param graph_df: (pandas data frame) Parsed data frame
+    :param file_is_weighted: (boolean) True if the third column is the weight
+    :param input_file: (string) A path to the input file
+    :param node_dictionary: (NodeDictionary) Dictionary to convert string node ids into integer ids
+    :return: (EdgeList) Edge list
+    """
+    weight = graph_df[2].values.astype(np.float32) if file_is_weighted else None
+
+    # Intern string node ids, both columns share the same ids
+    if node_dictionary is not None:
+        node_ids = node_dictionary.encode(np.concatenate((graph_df[0].values, graph_df[1].values)))
+        source = node_ids[:len(graph_df.index)]
+        target = node_ids[len(graph_df.index):]
+    else:
+        # Use int32 ids unless the id range needs int64
+        node_dtype = np.promote_types(_operations.get_id_dtype(graph_df[0].values),
+                                      _operations.get_id_dtype(graph_df[1].values))
+        source = graph_df[0].values.astype(node_dtype)
+        target = graph_df[1].values.astype(node_dtype)
+
+    # Return
+    return EdgeList(source=source, target=target, weight=weight, input_file=input_file)
+
+
+# Read an edge list file
+def read_edge_list(input_file=None, delimiter=None, weighted=None, node_dictionary=None, aggregate=False):
+    """
+    This function reads an edge list file once, validates every row of the parsed data and returns the edge list
+
+    :param input_file: (string) A path to input file that is being read
+    :param delimiter: (string) Columns separator in the input file, default [whitespace]
+    :param weighted: (boolean) yes/no, if the input file has weight column or not
+    :param node_dictionary: (NodeDictionary) Dictionary to convert string node ids (addresses) into integer ids, new
+                            addresses are added to the dictionary
+    :param aggregate: (boolean / string) Collapse duplicate edges and sum their weights, 'count' also counts the
+                      collapsed edges (transactions), default [False]
+    :return: (EdgeList) Parsed edge list
+    """
+    # Binary edge lists are memory mapped and parquet edge lists are read column wise instead of parsed
+    if is_binary_edge_list(input_file) or is_parquet_edge_list(input_file):
+        if is_binary_edge_list(input_file):
+            edge_list = read_binary_edge_list(input_file=input_file)
+        else:
+            edge_list = read_parquet_edge_list(input_file=input_file)
+        if aggregate:
+            edge_list = edge_list.aggregate(count=aggregate == 'count')
+        return edge_list
+
+    # Check weighted and delimiter
+    weighted, file_is_weighted, separator = __get_read_options(delimiter=delimiter, weighted=weighted)
+
+    # Input file?
+    if _operations.check_input_file_permissions(input_file) == 0:
+        print('Can not read input data!', log_type='error', color='red')
+        sys.exit(1)
+
+    # Read data
+    print('Reading input data.....', log_type='info')
+    try:
+        with _operations.open_input_file(input_file) as f:
+            graph_df = pd.read_csv(f, sep=separator, header=None, comment='#', skipinitialspace=True,
+                                   **__get_node_read_options(node_dictionary))
+    except Exception as e:
+        print('Can not read input data! ERROR: {}'.format(e), log_type='error', color='red')
+        sys.exit(1)
+
+    # Validate every row of the parsed data
+    validation_status, validation_report = _operations.validate_edge_data(graph_df=graph_df, weighted=weighted,
+                                                                          numeric_nodes=node_dictionary is None,
+                                                                          input_file=input_file)
+    _operations.print_validation_report(validation_report)
+    if validation_status != 1:
+        print('Validation failed!', log_type='error', color='red')
+        sys.exit(1)
+
+    # Create edge list from the parsed columns
+    edge_list = __data_frame_to_edge_list(graph_df=graph_df, file_is_weighted=file_is_weighted, input_file=input_file,
+                                          node_dictionary=node_dictionary)
+    print('Edge list size: {}'.format(len(edge_list)), log_type='info')
+    _operations.report_memory_usage(name='Edge list', n_bytes=edge_list.memory_usage(),
+                                    n_bytes_before=int(graph_df.memory_usage(index=False, deep=True).sum()))
+    del graph_df
+
+    # Collapse duplicate edges
+    if aggregate:
+        edge_list = edge_list.aggregate(count=aggregate == 'count')
+        print('Aggregated edge list size: {}'.format(len(edge_list)), log_type='info')
+
+    # Return
+    return edge_list
+
+
+# Create an edge list from a data frame with column names
+def edge_list_from_data_frame(graph_df=None):
+    """
+    This function creates an edge list from a data frame with source, target (and weight, count) columns, e.g. a
+    sub-graph or a merged graph. The columns are not copied if they already have the right data type.
+
+    :param graph_df: (pandas data frame) Data frame of edges
+    :return: (EdgeList) Edge list
+    """
+    # Return
+    return EdgeList(source=graph_df['source'].values, target=graph_df['target'].values,
+                    weight=graph_df['weight'].values if 'weight' in graph_df else None,
+                    count=graph_df['count'].values if 'count' in graph_df else None)
+
+
+# Least recently used cache of parsed snapshots
+class SnapshotCache(object):
+    """
+    This class keeps parsed edge lists in memory, so that a snapshot used by find_communities() is not parsed again
+    by find_sub_graph() or generate_merged_graph(). Entries are keyed by the file path, size and modification time,
+    a changed file is therefore parsed again. The least recently used edge lists are dropped when the memory budget
+    is exceeded.
+
+    :param max_bytes: (int) Memory budget of the cached edge lists in bytes, 0 disables the cache
+    """
+    def __init__(self, max_bytes=DEFAULT_SNAPSHOT_CACHE_SIZE):
+        self.max_bytes = max_bytes
+        self.n_bytes = 0
+        self.entries = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return '<SnapshotCache: {} snapshots, {:.2f} of {:.2f} MB>'.format(len(self), self.n_bytes / 1048576.0,
+                                                                           self.max_bytes / 1048576.0)
+
+    @staticmethod
+    def key(input_file=None, delimiter=None, weighted=None):
+        """
+        This function creates the cache key of a snapshot file, the read options are part of the key as they change
+        the parsed edge list
+
+        :param input_file: (string) A path to the snapshot file
+        :param delimiter: (string) Columns separator in the input file
+        :param weighted: (boolean) yes/no, if the input file has weight column or not
+        :return: (tuple) Cache key or None if the file can not be found
+        """
+        try:
+            stat = os.stat(input_file)
+        except (OSError, TypeError):
+            return None
+
+        file_is_weighted = _operations.is_weighted('No' if weighted is None else weighted)
+
+        # Return
+        return os.path.realpath(input_file), stat.st_size, stat.st_mtime, delimiter, file_is_weighted
+
+    def get(self, key=None):
+        """
+        This function looks up a parsed edge list and marks it as the most recently used
+
+        :param key: (tuple) Cache key, see key()
+        :return: (EdgeList) Cached edge list or None
+        """
+        edge_list = self.entries.pop(key, None)
+        if edge_list is not None:
+            self.entries[key] = edge_list
+
+        # Return
+        return edge_list
+
+    def put(self, key=None, edge_list=None):
+        """
+        This function adds a parsed edge list and drops the least recently used ones until the budget is kept, an
+        edge list larger than the whole budget is not cached. Older versions of the same file (another size or
+        modification time) are dropped first, edge lists of the same file read with other options are kept.
+
+        :param key: (tuple) Cache key, see key()
+        :param edge_list: (EdgeList) Parsed edge list
+        :return: <>
+        """
+        for stale_key in [cached_key for cached_key in self.entries
+                          if cached_key[0] == key[0] and cached_key[1:3] != key[1:3]]:
+            self.n_bytes -= self.entries.pop(stale_key).memory_usage()
+        n_bytes = edge_list.memory_usage()
+        if n_bytes > self.max_bytes:
+            return
+        self.entries[key] = edge_list
+        self.n_bytes += n_bytes
+        self.shrink()
+
+    def shrink(self):
+        """
+        This function drops the least recently used edge lists until the cached edge lists fit in the budget
+
+        :return: <>
+        """
+        while self.entries and self.n_bytes > self.max_bytes:
+            _, edge_list = self.entries.popitem(last=False)
+            self.n_bytes -= edge_list.memory_usage()
+
+    def clear(self):
+        """
+        This function drops all cached edge lists
+
+        :return: <>
+        """
+        self.entries.clear()
+        self.n_bytes = 0
+
+
+# Parsed snapshots shared by find_communities(), find_sub_graph() and generate_merged_graph()
+_snapshot_cache = SnapshotCache()
+
+
+# Set the memory budget of the snapshot cache
+def set_snapshot_cache_size(max_bytes=DEFAULT_SNAPSHOT_CACHE_SIZE):
+    """
+    This function sets the memory budget of the parsed snapshot cache, cached edge lists are dropped if they do not
+    fit in the new budget
+
+    :param max_bytes: (int) Memory budget in bytes, 0 disables the cache, default [4 GB]
+    :return: (SnapshotCache) The snapshot cache
+    """
+    if max_bytes is None or max_bytes < 0:
+        print('Snapshot cache size must be a non negative number of bytes!', log_type='error', color='red')
+        sys.exit(1)
+    _snapshot_cache.max_bytes = max_bytes
+    _snapshot_cache.shrink()
+
+    # Return
+    return _snapshot_cache
+
+
+# Drop all parsed snapshots from the cache
+def clear_snapshot_cache():
+    """
+    This function drops all parsed snapshots from the cache, e.g. to free memory between evolution steps
+
+    :return: <>
+    """
+    _snapshot_cache.clear()
+
+
+# Get an edge list from a file path or an already parsed edge list
+def __get_edge_list(input_data=None, delimiter=None, weighted=None, cache=True):
+    """
+    This function returns the parsed edge list of the input data, reading the file only if it is a path that is not
+    in the snapshot cache
+
+    :param input_data: (string / EdgeList / pandas data frame) A file path, an already parsed edge list or a data
+                       frame with source, target (and weight) columns
+    :param delimiter: (string) Columns separator in the input file, default [whitespace]
+    :param weighted: (boolean) yes/no, if the input file has weight column or not
+    :param cache: (boolean) Look up and keep the parsed edge list in the snapshot cache, default [True]
+    :return: (EdgeList) Parsed edge list
+    """
+    if isinstance(input_data, EdgeList):
+        print('Using already parsed edge list.....', log_type='info')
+        return input_data
+    if isinstance(input_data, pd.DataFrame):
+        print('Using edge list from data frame.....', log_type='info')
+        return edge_list_from_data_frame(graph_df=input_data)
+
+    # Parsed snapshots are reused as long as the file is not changed
+    cache_key = None
+    if cache:
+        cache_key = SnapshotCache.key(input_file=input_data, delimiter=delimiter, weighted=weighted)
+    edge_list = _snapshot_cache.get(key=cache_key) if cache_key is not None else None
+    if edge_list is not None:
+        print('Using cached edge list of {}.....'.format(input_data), log_type='info')
+        return edge_list
+    edge_list = read_edge_list(input_file=input_data, delimiter=delimiter, weighted=weighted)
+    if cache_key is not None:
+        _snapshot_cache.put(key=cache_key, edge_list=edge_list)
+
+    # Return
+    return edge_list
+
+
+# Read an edge list file in a worker process
+def __read_edge_list_worker(arguments=None):
+    """
+    This function reads an edge list file in a worker process of read_edge_lists()
+
+    :param arguments: (tuple) input file, delimiter, weighted, aggregate
+    :return: (EdgeList) Parsed edge list or None if the file can not be read
+    """
+    input_file, delimiter, weighted, aggregate = arguments
+    try:
+        return read_edge_list(input_file=input_file, delimiter=delimiter, weighted=weighted, aggregate=aggregate)
+    except SystemExit:
+        # A failing worker must not take the pool down
+        return None
+
+
+# Read many edge list files in parallel
+def read_edge_lists(input_files=None, delimiter=None, weighted=None, processes=None, aggregate=False):
+    """
+    This function reads many edge list files (snapshots) concurrently with a pool of processes. Every snapshot is
+    parsed and validated in a worker and only its edge arrays are sent back. Binary edge lists are memory mapped
+    in the calling process, there is nothing to parse.
+
+    :param input_files: (list) File paths of the snapshots
+    :param delimiter: (string) Columns separator in the input files, default [whitespace]
+    :param weighted: (boolean) yes/no, if the input files have weight column or not
+    :param processes: (int) Number of worker processes, default [number of cpu cores]
+    :param aggregate: (boolean / string) Collapse duplicate edges in the workers, see read_edge_list()
+    :return: (list) Parsed edge lists in the same order as the input files
+    """
+    input_files = list(input_files)
+    edge_lists = [None] * len(input_files)
+
+    # Text files are parsed by the pool, binary files are mapped right away
+    text_files = []
+    for position, input_file in enumerate(input_files):
+        if is_binary_edge_list(input_file):
+            edge_lists[position] = read_edge_list(input_file=input_file, aggregate=aggregate)
+        else:
+            text_files.append(position)
+
+    if text_files:
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        processes = max(1, min(processes, len(text_files)))
+        print('Reading {} snapshots with {} processes.....'.format(len(text_files), processes), log_type='info')
+        arguments = [(input_files[position], delimiter, weighted, aggregate) for position in text_files]
+        pool = multiprocessing.Pool(processes=processes)
+        try:
+            parsed_edge_lists = pool.map(__read_edge_list_worker, arguments, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+        for position, edge_list in zip(text_files, parsed_edge_lists):
+            if edge_list is None:
+                print('Can not read snapshot: {}'.format(input_files[position]), log_type='error', color='red')
+                sys.exit(1)
+            edge_lists[position] = edge_list
+
+    # Return
+    return edge_lists
+
+
+# Read an edge list file in chunks
+def iter_edge_list_chunks(input_data=None, delimiter=None, weighted=None, chunk_size=None, node_dictionary=None,
+                          nodes=None):
+    """
+    This function reads an edge list in bounded chunks, so only one chunk is held in memory at a time
+
+    :param input_data: (string / EdgeList) A file path or an already parsed edge list
+    :param delimiter: (string) Columns separator in the input file, default [whitespace]
+    :param weighted: (boolean) yes/no, if the input file has weight column or not
+    :param chunk_size: (int) Number of edges per chunk, default [1000000]
+    :param node_dictionary: (NodeDictionary) Dictionary to convert string node ids into integer ids
+    :param nodes: (numpy array) Parquet edge lists only, skip row groups without any of these nodes
+    :return: (generator) EdgeList chunks, at least one (empty) chunk
+    """
+    if chunk_size is None:
+        chunk_size = DEFAULT_CHUNK_SIZE
+
+    # Parquet edge lists are read row group by row group
+    if not isinstance(input_data, EdgeList) and is_parquet_edge_list(input_data):
+        for edge_list in iter_parquet_row_groups(input_file=input_data, nodes=nodes):
+            yield edge_list
+        return
+
+    # Parsed and binary edge lists are sliced, binary columns stay memory mapped
+    if isinstance(input_data, EdgeList) or is_binary_edge_list(input_data):
+        edge_list = input_data if isinstance(input_data, EdgeList) else read_binary_edge_list(input_file=input_data)
+        for start in range(0, max(len(edge_list), 1), chunk_size):
+            yield edge_list.select(slice(start, start + chunk_size))
+        return
+
+    # Check weighted and delimiter
+    weighted, file_is_weighted, separator = __get_read_options(delimiter=delimiter, weighted=weighted)
+
+    # Input file?
+    if _operations.check_input_file_permissions(input_data) == 0:
+        print('Can not read input data!', log_type='error', color='red')
+        sys.exit(1)
+
+    # Read data chunk by chunk
+    print('Reading input data in chunks of {} edges.....'.format(chunk_size), log_type='info')
+    input_file = _operations.open_input_file(input_data)
+    try:
+        reader = pd.read_csv(input_file, sep=separator, header=None, comment='#', skipinitialspace=True,
+                             chunksize=chunk_size, **__get_node_read_options(node_dictionary))
+    except Exception as e:
+        print('Can not read input data! ERROR: {}'.format(e), log_type='error', color='red')
+        sys.exit(1)
+
+    try:
+        validation_report = None
+        for graph_df in reader:
+            # Validate every row of the chunk
+            row_offset = validation_report['rows'] if validation_report is not None else 0
+            validation_status, chunk_report = _operations.validate_edge_data(graph_df=graph_df, weighted=weighted,
+                                                                             numeric_nodes=node_dictionary is None,
+                                                                             row_offset=row_offset,
+                                                                             input_file=input_data)
+            validation_report = _operations.merge_validation_reports(validation_report, chunk_report)
+            if validation_status != 1:
+                _operations.print_validation_report(validation_report)
+                print('Validation failed!', log_type='error', color='red')
+                sys.exit(1)
+
+            yield __data_frame_to_edge_list(graph_df=graph_df, file_is_weighted=file_is_weighted,
+                                            input_file=input_data, node_dictionary=node_dictionary)
+
+        # Duplicate edges are counted within chunks
+        if validation_report is not None:
+            _operations.print_validation_report(validation_report)
+    finally:
+        input_file.close()
+
+
+# Check if a file is a binary edge list
+def is_binary_edge_list(input_file=None):
+    """
+    This function checks if a file starts with the binary edge list header
+
+    :param input_file: (string) A path to input file
+    :return: (boolean) True if the file is a binary edge list
+    """
+    try:
+        with open(input_file, 'rb') as f:
+            magic = f.read(len(BINARY_MAGIC))
+    except (IOError, OSError, TypeError):
+        return False
+
+    # Return
+    return magic == BINARY_MAGIC
+
+
+# Read a binary edge list file
+def read_binary_edge_list(input_file=None):
+    """
+    This function memory maps a binary edge list file, the columns are not copied into memory
+
+    :param input_file: (string) A path to the binary edge list file [.nce]
+    :return: (EdgeList) Memory mapped edge list
+    """
+    # Input file?
+    input_file_status = _operations.check_input_file_permissions(input_file)
+    if input_file_status == 0:
+        print('Can not read binary edge list!', log_type='error', color='red')
+        sys.exit(1)
+
+    # Read and check header
+    print('Memory mapping binary edge list.....', log_type='info')
+    header = np.fromfile(input_file, dtype=BINARY_HEADER, count=1)[0]
+    if header['version'] != BINARY_VERSION:
+        print('Unsupported binary edge list version: {}'.format(header['version']), log_type='error', color='red')
+        sys.exit(1)
+    n_edges = int(header['n_edges'])
+    weighted = bool(header['weighted'])
+
+    # Check file size against the header
+    expected_size = BINARY_HEADER.itemsize + n_edges * 2 * BINARY_NODE_DTYPE.itemsize
+    if weighted:
+        expected_size += n_edges * BINARY_WEIGHT_DTYPE.itemsize
+    if os.path.getsize(input_file) != expected_size:
+        print('Binary edge list is truncated or corrupted!', log_type='error', color='red')
+        sys.exit(1)
+
+    # Map columns
+    offset = BINARY_HEADER.itemsize
+    column_size = n_edges * BINARY_NODE_DTYPE.itemsize
+    if n_edges == 0:
+        source = np.empty(0, dtype=BINARY_NODE_DTYPE)
+        target = np.empty(0, dtype=BINARY_NODE_DTYPE)
+        weight = np.empty(0, dtype=BINARY_WEIGHT_DTYPE) if weighted else None
+    else:
+        source = np.memmap(input_file, dtype=BINARY_NODE_DTYPE, mode='r', offset=offset, shape=(n_edges,))
+        target = np.memmap(input_file, dtype=BINARY_NODE_DTYPE, mode='r', offset=offset + column_size,
+                           shape=(n_edges,))
+        weight = None
+        if weighted:
+            weight = np.memmap(input_file, dtype=BINARY_WEIGHT_DTYPE, mode='r', offset=offset + 2 * column_size,
+                               shape=(n_edges,))
+    edge_list = EdgeList(source=source, target=target, weight=weight, input_file=input_file)
+    print('Edge list size: {}'.format(len(edge_list)), log_type='info')
+
+    # Return
+    return edge_list
+
+
+# Write an edge list in binary format
+def write_binary_edge_list(edge_list=None, output_file=None):
+    """
+    This function writes an edge list in the binary edge list format
+
+    :param edge_list: (EdgeList) Edge list to write
+    :param output_file: (string) A path to the output file [.nce]
+    :return: (string) output file path
+    """
+    # Node ids have to fit into the fixed width columns
+    info = np.iinfo(BINARY_NODE_DTYPE)
+    for column in (edge_list.source, edge_list.target):
+        if len(column) and (column.min() < info.min or column.max() > info.max):
+            print('Node ids do not fit into int32 columns of the binary format!', log_type='error', color='red')
+            sys.exit(1)
+
+    # Create header
+    header = np.zeros(1, dtype=BINARY_HEADER)
+    header['magic'] = BINARY_MAGIC
+    header['version'] = BINARY_VERSION
+    header['weighted'] = int(edge_list.weighted)
+    header['n_edges'] = len(edge_list)
+
+    # Write header and columns
+    print('Creating binary edge list ({}) file.....'.format(BINARY_EXTENSION), log_type='info')
+    try:
+        with open(output_file, 'wb') as f:
+            header.tofile(f)
+            np.asarray(edge_list.source, dtype=BINARY_NODE_DTYPE).tofile(f)
+            np.asarray(edge_list.target, dtype=BINARY_NODE_DTYPE).tofile(f)
+            if edge_list.weighted:
+                np.asarray(edge_list.weight, dtype=BINARY_WEIGHT_DTYPE).tofile(f)
+    except Exception as e:
+        print('Can not create binary edge list! ERROR: {}'.format(e), log_type='error', color='red')
+        sys.exit(1)
+
+    # Return
+    return output_file
+
+
+# Convert a text edge list into binary format
+def convert_edge_list(input_file=None, output_file=None, delimiter=None, weighted=None, node_dictionary=None,
+                      output_format=None):
+    """
+    This function converts a text edge list (as read by networkx or pandas) into the binary edge list format or into
+    the parquet snapshot store
+
+    :param input_file: (string) A path to the text edge list
+    :param output_file: (string) A path to the output file, default [input file name with .nce/.parquet extension]
+    :param delimiter: (string) Columns separator in the input file, default [whitespace]
+    :param weighted: (boolean) yes/no, if the input file has weight column or not
+    :param node_dictionary: (NodeDictionary) Dictionary to convert string node ids into integer ids
+    :param output_format: (string) binary/parquet, default [binary, parquet for a .parquet output file]
+    :return: (string) output file path
+    """
+    # Check output format
+    if output_format is None:
+        if output_file is not None and output_file.endswith(PARQUET_EXTENSION):
+            output_format = 'parquet'
+        else:
+            output_format = 'binary'
+    if output_format not in ('binary', 'parquet'):
+        print('Unknown output format provided! Currently supports: binary, parquet', log_type='error', color='red')
+        sys.exit(1)
+
+    # Create output file name
+    if output_file is None:
+        base_file = input_file
+        if _operations.get_compression(input_file):
+            base_file = base_file.rsplit('.', 1)[0]
+        extension = BINARY_EXTENSION if output_format == 'binary' else PARQUET_EXTENSION
+        output_file = base_file.rsplit('.', 1)[0] + extension
+
+    # Read text edge list and write binary or parquet edge list
+    edge_list = read_edge_list(input_file=input_file, delimiter=delimiter, weighted=weighted,
+                               node_dictionary=node_dictionary)
+    if output_format == 'binary':
+        write_binary_edge_list(edge_list=edge_list, output_file=output_file)
+    else:
+        write_parquet_edge_list(edge_list=edge_list, output_file=output_file)
+    print('Converted edge list: {}'.format(output_file), log_type='info')
+
+    # Return
+    return output_file
+
+
+# Import pyarrow
+def __import_pyarrow():
+    """
+    This function imports the optional pyarrow library for the parquet snapshot store
+
+    :return: pyarrow, pyarrow.parquet
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        print('Can not import python pyarrow library! ERROR: {}'.format(e), log_type='error')
+        print('Try: pip install pyarrow', log_type='hint')
+        sys.exit(1)
+
+    # Return
+    return pyarrow, pyarrow.parquet
+
+
+# Check if a file is a parquet edge list
+def is_parquet_edge_list(input_file=None):
+    """
+    This function checks if a file starts with the parquet header
+
+    :param input_file: (string) A path to input file
+    :return: (boolean) True if the file is a parquet file
+    """
+    try:
+        with open(input_file, 'rb') as f:
+            magic = f.read(len(PARQUET_MAGIC))
+    except (IOError, OSError, TypeError):
+        return False
+
+    # Return
+    return magic == PARQUET_MAGIC
+
+
+# Write an edge list in parquet format
+def write_parquet_edge_list(edge_list=None, output_file=None, row_group_size=None):
+    """
+    This function writes an edge list into the columnar parquet snapshot store. The edges are stored twice, the first
+    (out) part is sorted by source and the second (in) part by target, so the min/max statistics of every row group
+    cover a small source or target range and readers can skip row groups that can not contain a node. Node id columns
+    are dictionary encoded, the number of row groups of the out part is kept in the schema metadata.
+
+    :param edge_list: (EdgeList) Edge list to write
+    :param output_file: (string) A path to the output file [.parquet]
+    :param row_group_size: (int) Number of edges per row group, default [1000000]
+    :return: (string) output file path
+    """
+    pyarrow, parquet = __import_pyarrow()
+    if row_group_size is None:
+        row_group_size = DEFAULT_ROW_GROUP_SIZE
+    n_out_row_groups = -(-len(edge_list) // row_group_size)
+
+    # Sort by source for the out part and by target for the in part
+    tables = []
+    for order in (np.lexsort((edge_list.target, edge_list.source)), np.lexsort((edge_list.source, edge_list.target))):
+        columns = [pyarrow.array(np.asarray(edge_list.source)[order]),
+                   pyarrow.array(np.asarray(edge_list.target)[order])]
+        names = ['source', 'target']
+        if edge_list.weighted:
+            columns.append(pyarrow.array(np.asarray(edge_list.weight, dtype=np.float32)[order]))
+            names.append('weight')
+        if edge_list.count is not None:
+            columns.append(pyarrow.array(np.asarray(edge_list.count)[order]))
+            names.append('count')
+        table = pyarrow.Table.from_arrays(columns, names=names)
+        tables.append(table.replace_schema_metadata({PARQUET_OUT_ROW_GROUPS_KEY: str(n_out_row_groups)}))
+
+    # Write both parts, every part starts a new row group
+    print('Creating parquet edge list ({}) file.....'.format(PARQUET_EXTENSION), log_type='info')
+    try:
+        writer = parquet.ParquetWriter(output_file, tables[0].schema, use_dictionary=['source', 'target'],
+                                       write_statistics=True)
+        try:
+            for table in tables:
+                writer.write_table(table, row_group_size=row_group_size)
+        finally:
+            writer.close()
+    except Exception as e:
+        print('Can not create parquet edge list! ERROR: {}'.format(e), log_type='error', color='red')
+        sys.exit(1)
+
+    # Return
+    return output_file
+
+
+# Get the number of row groups of the out part of a parquet edge list
+def __get_out_row_groups(parquet_file=None):
+    """
+    This function reads the number of row groups of the out (sorted by source) part from the schema metadata
+
+    :param parquet_file: (pyarrow ParquetFile) Opened parquet file
+    :return: (int) Number of row groups of the out part, None for a file with only one part
+    """
+    metadata = parquet_file.schema_arrow.metadata or {}
+    n_out_row_groups = metadata.get(PARQUET_OUT_ROW_GROUPS_KEY.encode('utf-8'))
+
+    # Return
+    return int(n_out_row_groups) if n_out_row_groups is not None else None
+
+
+# Find row groups that can contain nodes
+def __find_row_groups(parquet_file=None, nodes=None):
+    """
+    This function uses the min/max statistics of every row group to find the row groups that can contain an edge
+    with one of the nodes. The out part is searched by source and the in part by target, edges of a file with only one
+    part are searched by source or target.
+
+    :param parquet_file: (pyarrow ParquetFile) Opened parquet file
+    :param nodes: (numpy array) Node ids, None selects all edges
+    :return: (list) (row group index, column) tuples, the column the nodes are matched with (source, target or None
+             for both)
+    """
+    n_row_groups = parquet_file.metadata.num_row_groups
+    n_out_row_groups = __get_out_row_groups(parquet_file=parquet_file)
+    if nodes is None:
+        return [(i, None) for i in range(n_row_groups if n_out_row_groups is None else n_out_row_groups)]
+
+    # A row group is needed if a node lies in the range of its column
+    nodes = np.unique(np.asarray(nodes))
+    column_index = dict((parquet_file.schema_arrow.names[i], i) for i in range(len(parquet_file.schema_arrow.names)))
+    row_groups = []
+    for i in range(n_row_groups):
+        row_group = parquet_file.metadata.row_group(i)
+        if n_out_row_groups is None:
+            names = ('source', 'target')
+        else:
+            names = ('source',) if i < n_out_row_groups else ('target',)
+        for name in names:
+            statistics = row_group.column(column_index[name]).statistics
+            if statistics is None or not statistics.has_min_max or \
+                    np.searchsorted(nodes, statistics.min, 'left') < np.searchsorted(nodes, statistics.max, 'right'):
+                row_groups.append((i, names[0] if len(names) == 1 else None))
+                break
+
+    # Return
+    return row_groups
+
+
+# Create an edge list from a pyarrow table
+def __table_to_edge_list(table=None, input_file=None, nodes=None, column=None):
+    """
+    This function creates an edge list from a pyarrow table, optionally keeping only the edges of the nodes. Edges of
+    the in part with a source node are skipped, they are already found in the out part.
+
+    :param table: (pyarrow Table) Table with source, target (weight, count) columns
+    :param input_file: (string) A path to the parquet file
+    :param nodes: (numpy array) Node ids, None keeps all edges
+    :param column: (string) source for the out part, target for the in part, None for both
+    :return: (EdgeList) Edge list
+    """
+    edge_list = edge_list_from_data_frame(graph_df=table.to_pandas())
+    edge_list.input_file = input_file
+    if nodes is not None:
+        in_source = np.isin(edge_list.source, nodes)
+        if column == 'source':
+            edge_list = edge_list.select(in_source)
+        elif column == 'target':
+            edge_list = edge_list.select(~in_source & np.isin(edge_list.target, nodes))
+        else:
+            edge_list = edge_list.select(in_source | np.isin(edge_list.target, nodes))
+
+    # Return
+    return edge_list
+
+
+# Read a parquet edge list file
+def read_parquet_edge_list(input_file=None, nodes=None):
+    """
+    This function reads an edge list from the parquet snapshot store. If nodes are provided, only the row groups that
+    can contain their edges are read and only their edges are kept.
+
+    :param input_file: (string) A path to the parquet edge list file [.parquet]
+    :param nodes: (numpy array) Node ids to filter the edges with, default [None, all edges]
+    :return: (EdgeList) Edge list
+    """
+    pyarrow, parquet = __import_pyarrow()
+
+    # Input file?
+    if _operations.check_input_file_permissions(input_file) == 0:
+        print('Can not read parquet edge list!', log_type='error', color='red')
+        sys.exit(1)
+
+    # Read the needed row groups, one table per matched column
+    print('Reading parquet edge list.....', log_type='info')
+    parquet_file = parquet.ParquetFile(input_file)
+    row_groups = __find_row_groups(parquet_file=parquet_file, nodes=nodes)
+    print('Reading {} of {} row groups.....'.format(len(row_groups), parquet_file.metadata.num_row_groups),
+          log_type='info')
+    edge_lists = []
+    for column in (None, 'source', 'target'):
+        column_row_groups = [i for i, row_group_column in row_groups if row_group_column == column]
+        if column_row_groups:
+            edge_lists.append(__table_to_edge_list(table=parquet_file.read_row_groups(column_row_groups),
+                                                   input_file=input_file, nodes=nodes, column=column))
+    if not edge_lists:
+        edge_lists.append(__table_to_edge_list(table=parquet_file.schema_arrow.empty_table(), input_file=input_file))
+    edge_list = __concatenate_edge_lists(edge_lists=edge_lists)
+    print('Edge list size: {}'.format(len(edge_list)), log_type='info')
+
+    # Return
+    return edge_list
+
+
+# Concatenate edge lists with the same columns
+def __concatenate_edge_lists(edge_lists=None):
+    """
+    This function concatenates the columns of edge lists read from the same file
+
+    :param edge_lists: (list) EdgeList objects with the same columns
+    :return: (EdgeList) Edge list
+    """
+    if len(edge_lists) == 1:
+        return edge_lists[0]
+    weight = np.concatenate([edge_list.weight for edge_list in edge_lists]) if edge_lists[0].weighted else None
+    count = np.concatenate([edge_list.count for edge_list in edge_lists]) if edge_lists[0].count is not None else None
+
+    # Return
+    return EdgeList(source=np.concatenate([edge_list.source for edge_list in edge_lists]),
+                    target=np.concatenate([edge_list.target for edge_list in edge_lists]), weight=weight,
+                    input_file=edge_lists[0].input_file, count=count)
+
+
+# Read a parquet edge list row group by row group
+def iter_parquet_row_groups(input_file=None, nodes=None):
+    """
+    This function reads a parquet edge list one row group at a time, row groups that can not contain any of the
+    nodes are skipped
+
+    :param input_file: (string) A path to the parquet edge list file [.parquet]
+    :param nodes: (numpy array) Node ids to filter the edges with, default [None, all edges]
+    :return: (generator) EdgeList chunks
+    """
+    pyarrow, parquet = __import_pyarrow()
+    parquet_file = parquet.ParquetFile(input_file)
+    row_groups = __find_row_groups(parquet_file=parquet_file, nodes=nodes)
+    print('Reading {} of {} row groups.....'.format(len(row_groups), parquet_file.metadata.num_row_groups),
+          log_type='info')
+    for i, column in row_groups:
+        yield __table_to_edge_list(table=parquet_file.read_row_group(i), input_file=input_file, nodes=nodes,
+                                   column=column)
+
+    # Without any matching row group, yield one empty chunk with the columns of the file
+    if not row_groups:
+        yield __table_to_edge_list(table=parquet_file.schema_arrow.empty_table(), input_file=input_file)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+# Import python libraries
+import sys
+from pyrainbowterm import *
+
+# Import custom libraries
+import nc_data_handler
+import nc_graph_handler
+import nc_community_handler
+
+
+# Source code meta data
+__author__ = 'Dalwar Hossain'
+__email__ = 'dalwar.hossain@protonmail.com'
+
+# Number of top communities followed through the snapshots
+DEFAULT_TOP_N = 25
+
+
+# Detect the communities of one window step
+def __detect_communities(input_data=None, delimiter=None, weighted=None, algorithm=None, prior_partition=None,
+                         kwargs=None):
+    """
+    This function detects the communities of a snapshot or a merged graph and keeps them as a partition
+
+    :param input_data: (EdgeList / pandas data frame) Parsed snapshot or merged graph
+    :param delimiter: (string) Column separator of the input files
+    :param weighted: (boolean) yes/no, if the input files have a weight column or not
+    :param algorithm: (string) Community detection algorithm
+    :param prior_partition: (dict) Python dictionary of nodes and communities to start from, default [None]
+    :param kwargs: (dict) Keyword arguments of detect_communities()
+    :return: (Partition, boolean) Communities and False if a time budget cut the detection short
+    """
+    kwargs = dict(kwargs)
+    if prior_partition is not None:
+        kwargs['prior_partition'] = prior_partition
+    detection = nc_community_handler.detect_communities(input_file=input_data, delimiter=delimiter, weighted=weighted,
+                                                        algorithm=algorithm, **kwargs)
+
+    # Return
+    return nc_data_handler.create_partition(detection.communities), detection.completed
+
+
+# Follow the top 'n' communities through a sliding window of snapshots
+def evolve_communities(input_files=None, delimiter=None, weighted=None, algorithm=None, n=None, merge=None,
+                       decay=0.5, similarity_measure=None, warm_start=False, **kwargs):
+    """
+    This function walks through the snapshots t0 ... tk and yields the result of every (t, t+1) step. Communities are
+    detected at t0, then at every step the sub-graph of the top 'n' communities at time 't' is merged with the graph at
+    time 't+1', the communities of the merged graph are detected and the top 'n' communities of both time-stamps are
+    compared. Every snapshot is parsed exactly once and only the snapshots at time 't' and 't+1' are kept in memory,
+    the memory usage does not grow with the number of snapshots.
+
+    :param input_files: (iterable) File paths or already parsed edge lists of the snapshots in time order, can be a
+                        generator
+    :param delimiter: (string) Column separator of the input files, default [whitespace]
+    :param weighted: (boolean) yes/no, if the input files have a weight column or not, default [no]
+    :param algorithm: (string) Community detection algorithm, default [infomap]
+    :param n: (int) Number of top communities followed through the snapshots, default [25]
+    :param merge: (string) Merge rule of generate_merged_graph(), sum / max / latest / decay, default [None]
+    :param decay: (float) Factor of the weights at time 't' for the decay rule, default [0.5]
+    :param similarity_measure: (string) Similarity measure of find_relative_overlap(), default [jaccard]
+    :param warm_start: (boolean) Start the detection of the merged graph from the communities at time 't'
+    :param kwargs: Keyword arguments of detect_communities(), e.g. options, seed, time_budget (per detection)
+    :return: (generator) One python dictionary per step with step, input_file_t, input_file_t1, top_n_communities_t,
+             top_n_communities_t1 (Partition), merged_graph_size, similarity (list of similar pairs of community id
+             with similarity) and completed (False if a time budget cut a detection short)
+    """
+    if input_files is None:
+        print('Invalid parameters! Check input!!', log_type='error', color='red')
+        sys.exit(1)
+    if n is None:
+        print('No number of top communities provided! Using default [{}].....'.format(DEFAULT_TOP_N),
+              log_type='info')
+        n = DEFAULT_TOP_N
+    if 'prior_partition' in kwargs:
+        print('Use warm_start instead of a prior partition for the evolution!', log_type='error', color='red')
+        sys.exit(1)
+    input_files = iter(input_files)
+
+    # Communities at time 't0'
+    try:
+        input_file_t = next(input_files)
+    except StopIteration:
+        print('No snapshot provided! Check input!!', log_type='error', color='red')
+        sys.exit(1)
+    print('Reading snapshot [t0].....', log_type='info')
+    edge_list_t = nc_data_handler.__get_edge_list(input_data=input_file_t, delimiter=delimiter, weighted=weighted,
+                                                  cache=False)
+    communities_t, completed_t = __detect_communities(input_data=edge_list_t, delimiter=delimiter, weighted=weighted,
+                                                      algorithm=algorithm, kwargs=kwargs)
+    top_n_communities_t = nc_community_handler.find_top_n_communities(all_communities=communities_t, n=n)
+    if not warm_start:
+        communities_t = None
+
+    # Slide the window one snapshot at a time
+    for step, input_file_t1 in enumerate(input_files, 1):
+        print('Evolution step [t{} -> t{}].....'.format(step - 1, step), log_type='info')
+        edge_list_t1 = nc_data_handler.__get_edge_list(input_data=input_file_t1, delimiter=delimiter,
+                                                       weighted=weighted, cache=False)
+        merged_graph = nc_graph_handler.generate_merged_graph(input_dataset_t=edge_list_t,
+                                                              input_dataset_t1=edge_list_t1, delimiter=delimiter,
+                                                              weighted=weighted, top_n_communities=top_n_communities_t,
+                                                              merge=merge, decay=decay)
+        merged_graph_size = len(merged_graph.index)
+
+        # The snapshot at time 't' is not needed any more
+        input_name_t = edge_list_t.input_file
+        del edge_list_t
+
+        # Communities of the merged graph
+        prior_partition = communities_t.to_dict() if communities_t is not None else None
+        communities_t1, completed = __detect_communities(input_data=merged_graph, delimiter=delimiter,
+                                                         weighted=weighted, algorithm=algorithm,
+                                                         prior_partition=prior_partition, kwargs=kwargs)
+        del merged_graph, prior_partition
+        top_n_communities_t1 = nc_community_handler.find_top_n_communities(all_communities=communities_t1, n=n)
+        similarity = nc_community_handler.find_relative_overlap(communities_t=top_n_communities_t,
+                                                                communities_t1=top_n_communities_t1,
+                                                                similarity_measure=similarity_measure)
+
+        yield {'step': step, 'input_file_t': input_name_t, 'input_file_t1': edge_list_t1.input_file,
+               'top_n_communities_t': top_n_communities_t, 'top_n_communities_t1': top_n_communities_t1,
+               'merged_graph_size': merged_graph_size, 'similarity': similarity,
+               'completed': completed and completed_t}
+
+        # Time 't+1' becomes time 't' of the next step
+        edge_list_t = edge_list_t1
+        top_n_communities_t = top_n_communities_t1
+        communities_t = communities_t1 if warm_start else None
+        completed_t = True
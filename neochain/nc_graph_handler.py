@@ -7,98 +7,207 @@ from __future__ import print_function
 import sys
 import itertools
 from pyrainbowterm import *
+import numpy as np
 import pandas as pd
 
 # Import custom libraries
 import _operations
+import nc_data_handler
 
 
 # Source code meta data
 __author__ = 'Dalwar Hossain'
 __email__ = 'dalwar.hossain@protonmail.com'
 
+# Snapshot marker bits of merged edges
+SNAPSHOT_T = 1
+SNAPSHOT_T1 = 2
+
+# Rules to combine the weights of edges found in both snapshots
+MERGE_RULES = ('sum', 'max', 'latest', 'decay')
 
-# Read data as pandas data frame
-def __read_data(input_file=None, weighted=None, delimiter=None):
-    """
-    This function uses pandas read_csv to read data and return pandas data frame
 
-    :param input_file: (string) A path to input file that is being read
-    :param weighted: (boolean) yes/no, if the input file has weight column or not
-    :param delimiter: (string) Columns separator in the input file
-    :return: (pandas data frame) a data frame read from input file
+# Find unique nodes of top 'n' communities
+def __get_community_nodes(top_n_communities=None):
     """
-    # Although checking weighted values is required
-    weighted = _operations.is_weighted(weighted)
-    if weighted:
-        headers = ['source', 'target', 'weight']
-    else:
-        headers = ['source', 'target']
+    This function collects the unique member nodes of the top 'n' communities
 
-    # Also the delimiter is required to be checked
-    if delimiter is None:
-        print('No delimiter provided! Using default [whitespace].....', log_type='info')
-        delimiter = ' '
-    else:
-        delimiter = delimiter
-
-    # Read data
-    print('Reading input data.....', log_type='info')
-    try:
-        graph_df = pd.read_csv(input_file, delimiter=delimiter, names=headers, comment='#', skipinitialspace=True)
-    except Exception as e:
-        print('Can not read input data! ERROR: {}'.format(e), log_type='error', color='red')
-        sys.exit(1)
+    :param top_n_communities: (list / Partition) List of communities containing the member nodes or a partition
+    :return: (numpy array) unique member nodes
+    """
+    if isinstance(top_n_communities, nc_data_handler.Partition):
+        return top_n_communities.nodes
+    comm_nodes = list(itertools.chain.from_iterable(top_n_communities))
 
     # Return
-    return graph_df
+    return pd.unique(pd.Series(comm_nodes))
+
+
+# Stream a sub-graph chunk by chunk
+def stream_sub_graph(input_file=None, weighted=None, delimiter=None, top_n_communities_t=None, chunk_size=None):
+    """
+    This function reads the input file in bounded chunks and yields only the edges that contain nodes from top 'n'
+    communities, so the memory usage depends on the size of the sub-graph and not on the size of the input file
+
+    :param input_file: (string / EdgeList) A file path to input data at time 't' or an already parsed edge list
+    :param weighted: (boolean) yes/no, if files have weight column or not
+    :param delimiter: (string) Column separator in the input file, default [whitespace]
+    :param top_n_communities_t: (list / Partition) List of communities containing the member nodes or a partition
+    :param chunk_size: (int) Number of edges read per chunk, default [1000000]
+    :return: (generator) pandas data frames of the matching edges of every chunk, at least one (empty) data frame
+    """
+    # Select unique nodes from top 'n' communities
+    comm_unique_nodes = __get_community_nodes(top_n_communities_t)
+
+    # Filter every chunk, parquet row groups without community nodes are skipped
+    print('Streaming sub graph.....', log_type='info')
+    for edge_list in nc_data_handler.iter_edge_list_chunks(input_data=input_file, delimiter=delimiter,
+                                                           weighted=weighted, chunk_size=chunk_size,
+                                                           nodes=comm_unique_nodes):
+        in_communities = np.isin(edge_list.source, comm_unique_nodes) | np.isin(edge_list.target, comm_unique_nodes)
+        yield edge_list.select(in_communities).to_data_frame()
 
 
 # Create a function for sub-graph
-def find_sub_graph(input_file=None, weighted=None, delimiter=None, top_n_communities_t=None):
+def find_sub_graph(input_file=None, weighted=None, delimiter=None, top_n_communities_t=None, chunk_size=None,
+                   output_file=None):
     """
     This function creates a subset of links/edges from the input file depending on the nodes from top 'n' communities
 
-    :param input_file: (string) A file path to input data at time 't'
+    :param input_file: (string / EdgeList) A file path to input data at time 't' or an already parsed edge list
     :param delimiter: (string) Column separator in both input files, default [whitespace]
     :param weighted: (boolean) yes/no, if files have weight column or not
-    :param top_n_communities_t: (list) List of communities containing the member nodes
-    :return: (pandas data frame) a data frame of edges that contains all the nodes from top 'n' communities
+    :param top_n_communities_t: (list / Partition) List of communities containing the member nodes or a partition
+    :param chunk_size: (int) Read the input file in chunks of this many edges (streaming mode), default [None]
+    :param output_file: (string) Write the sub-graph to this file instead of returning it (streaming mode)
+    :return: (pandas data frame) a data frame of edges that contains all the nodes from top 'n' communities or the
+             output file path if output_file is provided
     """
+    # Streaming mode
+    if chunk_size is not None or output_file is not None:
+        sub_graph_chunks = stream_sub_graph(input_file=input_file, weighted=weighted, delimiter=delimiter,
+                                            top_n_communities_t=top_n_communities_t, chunk_size=chunk_size)
+        if output_file is not None:
+            print('Creating sub graph file.....', log_type='info')
+            n_edges = 0
+            try:
+                with open(output_file, 'w') as f:
+                    for sub_graph_chunk in sub_graph_chunks:
+                        sub_graph_chunk.to_csv(f, sep=' ', header=False, index=False)
+                        n_edges += len(sub_graph_chunk.index)
+            except Exception as e:
+                print('Can not create sub graph file! ERROR: {}'.format(e), log_type='error', color='red')
+                sys.exit(1)
+            print('Sub graph size: {}'.format(n_edges), log_type='info')
+            return output_file
+        sub_graph_t = pd.concat(list(sub_graph_chunks), ignore_index=True)
+        print('Sub graph creation complete!', log_type='info')
+        return sub_graph_t
 
-    # Read data set from time 't'
-    graph_df_t = __read_data(input_file=input_file, weighted=weighted, delimiter=delimiter)
-    print('Time (t) graph size: {}'.format(len(graph_df_t.index)), log_type='info')
+    # Select unique nodes from top 'n' communities
+    comm_unique_nodes = __get_community_nodes(top_n_communities_t)
 
-    # Assign short name
-    df_t = graph_df_t
+    # Parquet snapshots are filtered while reading, only row groups with community nodes are read
+    if not isinstance(input_file, nc_data_handler.EdgeList) and nc_data_handler.is_parquet_edge_list(input_file):
+        sub_graph_t = nc_data_handler.read_parquet_edge_list(input_file=input_file,
+                                                             nodes=comm_unique_nodes).to_data_frame()
+        print('Sub graph creation complete!', log_type='info')
+        return sub_graph_t
 
-    # Select unique nodes from top 'n' communities
-    comm_nodes = list(itertools.chain.from_iterable(top_n_communities_t))
-    comm_unique_nodes = pd.unique(pd.Series(comm_nodes))
+    # Read data set from time 't'
+    edge_list_t = nc_data_handler.__get_edge_list(input_data=input_file, delimiter=delimiter, weighted=weighted)
+    print('Time (t) graph size: {}'.format(len(edge_list_t)), log_type='info')
 
     # Generate sub data frame from data frame at time 't' with nodes from top 'n' communities
     print('Creating sub graph.....', log_type='info')
-    sub_graph_t = df_t[(df_t.source.isin(comm_unique_nodes)) | (df_t.target.isin(comm_unique_nodes))]
+    in_communities = np.isin(edge_list_t.source, comm_unique_nodes) | np.isin(edge_list_t.target, comm_unique_nodes)
+    sub_graph_t = edge_list_t.select(in_communities).to_data_frame()
     print('Sub graph creation complete!', log_type='info')
 
     # Return
     return sub_graph_t
 
 
+# Merge the sub-graph at time 't' and the graph at time 't+1' without duplicate edges
+def __merge_edge_lists(edge_list_t=None, edge_list_t1=None, merge=None, decay=None):
+    """
+    This function merges two edge lists into one edge per (source, target) pair. Both edge lists are sorted by
+    (source, target) and merged, the edges of one pair are then adjacent and combined with the merge rule. Duplicate
+    edges inside one snapshot are summed first.
+
+    :param edge_list_t: (EdgeList) Sub-graph at time 't'
+    :param edge_list_t1: (EdgeList) Graph at time 't+1'
+    :param merge: (string) Weight rule, sum / max / latest (weight at time 't+1' if present) / decay
+    :param decay: (float) Factor of the weights at time 't' for the decay rule, decay * w(t) + w(t+1)
+    :return: (pandas data frame) A data frame with source, target, (weight, count) and snapshot columns, the snapshot
+             column marks an edge from time 't' with 1, from time 't+1' with 2 and from both with 3
+    """
+    weighted = edge_list_t.weighted or edge_list_t1.weighted
+    counted = edge_list_t.count is not None and edge_list_t1.count is not None
+    edge_lists = [edge_list.aggregate(count=counted) for edge_list in (edge_list_t, edge_list_t1)]
+
+    # Merge the two sorted edge lists, a stable sort of two sorted runs is a linear merge
+    id_dtype = np.result_type(edge_list_t.source, edge_list_t1.source)
+    source = np.concatenate([edge_list.source for edge_list in edge_lists]).astype(id_dtype)
+    target = np.concatenate([edge_list.target for edge_list in edge_lists]).astype(id_dtype)
+    order, starts = nc_data_handler.sort_edges(source, target)
+    print('Merged {} duplicate edges.....'.format(len(order) - len(starts)), log_type='info')
+
+    # Mark the snapshots of every edge
+    snapshot = np.repeat(np.array([SNAPSHOT_T, SNAPSHOT_T1], dtype=np.uint8),
+                         [len(edge_list) for edge_list in edge_lists])[order]
+    columns = {'source': source[order[starts]], 'target': target[order[starts]]}
+    headers = ['source', 'target']
+
+    # Combine the weights of edges found in both snapshots, missing weights are 1
+    if weighted:
+        weight = np.concatenate([edge_list.weight if edge_list.weighted else np.ones(len(edge_list))
+                                 for edge_list in edge_lists]).astype(np.float64)[order]
+        if merge == 'max':
+            weight = np.maximum.reduceat(weight, starts)
+        elif merge == 'latest':
+            weight = weight[np.append(starts[1:], len(weight)) - 1]
+        else:
+            if merge == 'decay':
+                weight[snapshot == SNAPSHOT_T] *= decay
+            weight = np.add.reduceat(weight, starts)
+        weight_dtype = np.result_type(*[edge_list.weight for edge_list in edge_lists if edge_list.weighted])
+        columns['weight'] = weight.astype(weight_dtype)
+        headers.append('weight')
+    if counted:
+        columns['count'] = np.add.reduceat(np.concatenate([edge_list.count for edge_list in edge_lists])[order], starts)
+        headers.append('count')
+    columns['snapshot'] = np.bitwise_or.reduceat(snapshot, starts)
+    headers.append('snapshot')
+
+    # Return
+    return pd.DataFrame(columns, columns=headers)
+
+
 # Generate a concatenated graph from sub_graph from time 't' and a graph snapshot from time 't1'
 def generate_merged_graph(input_dataset_t=None, input_dataset_t1=None, delimiter=None, weighted=None,
-                          top_n_communities=None):
+                          top_n_communities=None, merge=None, decay=0.5):
     """
     This function creates a merged graph data from sub-graph at time 't' and a graph snapshot from time 't+1"
 
-    :param input_dataset_t: (string) A file path to input data at time 't'
-    :param input_dataset_t1: (string) A file path to input data at time 't+1'
+    :param input_dataset_t: (string / EdgeList) A file path to input data at time 't' or an already parsed edge list
+    :param input_dataset_t1: (string / EdgeList) A file path to input data at time 't+1' or an already parsed edge list
     :param delimiter: (string) Column separator in both input files, default [whitespace]
     :param weighted: (boolean) yes/no, if files have weight column or not
-    :param top_n_communities: (list) List of communities containing the member nodes
+    :param top_n_communities: (list / Partition) List of communities containing the member nodes or a partition
+    :param merge: (string) Merge edges found in both graphs into one edge and combine their weights with sum / max /
+                  latest / decay, a snapshot column marks the origin of every edge, default [None, concatenate]
+    :param decay: (float) Factor of the weights at time 't' for the decay rule, default [0.5]
     :return: (pandas data frame) A data frame with links form sub graph at time 't' and links from graph at time 't+1'
     """
+    if merge is not None and merge not in MERGE_RULES:
+        print('Unknown merge rule [{}]! Use one of: {}'.format(merge, ', '.join(MERGE_RULES)), log_type='error',
+              color='red')
+        sys.exit(1)
+    if merge == 'decay' and not 0 <= decay <= 1:
+        print('Decay factor must be between 0 and 1!', log_type='error', color='red')
+        sys.exit(1)
+
     # Step 2(a)
     # Get the sub graph from data set at time 't'
     sub_graph_t = find_sub_graph(input_file=input_dataset_t, weighted=weighted, delimiter=delimiter,
@@ -107,14 +216,22 @@ def generate_merged_graph(input_dataset_t=None, input_dataset_t1=None, delimiter
 
     # Step 2(b)
     # Read data set from time 't+1
-    graph_df_t1 = __read_data(input_file=input_dataset_t1, weighted=weighted, delimiter=delimiter)
-    print('Time (t1) graph size: {}'.format(len(graph_df_t1.index)), log_type='info')
+    edge_list_t1 = nc_data_handler.__get_edge_list(input_data=input_dataset_t1, delimiter=delimiter,
+                                                   weighted=weighted)
+    print('Time (t1) graph size: {}'.format(len(edge_list_t1)), log_type='info')
 
     # Creating a merged graph [G(t,t1)]
     print('Creating merged graph.....', log_type='info')
-    frames = [sub_graph_t, graph_df_t1]
-    merged_graph_tt1 = pd.concat(frames)
+    if merge is not None:
+        merged_graph_tt1 = __merge_edge_lists(edge_list_t=nc_data_handler.edge_list_from_data_frame(sub_graph_t),
+                                              edge_list_t1=edge_list_t1, merge=merge, decay=decay)
+        print('Merged graph size: {}'.format(len(merged_graph_tt1.index)), log_type='info')
+    else:
+        frames = [sub_graph_t, edge_list_t1.to_data_frame()]
+        merged_graph_tt1 = pd.concat(frames)
     print('Merged graph creation complete!', log_type='info')
+    _operations.report_memory_usage(name='Merged graph',
+                                    n_bytes=int(merged_graph_tt1.memory_usage(index=False).sum()))
 
     # Return
     return merged_graph_tt1
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests of the neochain package, run with: python setup.py test
+"""
+
+# Import python libraries
+import os
+import sys
+import shutil
+import tempfile
+
+
+# Source code meta data
+__author__ = 'Dalwar Hossain'
+__email__ = 'dalwar.hossain@protonmail.com'
+
+
+# The package modules import each other by module name
+PACKAGE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'neochain')
+if PACKAGE_DIR not in sys.path:
+    sys.path.insert(0, PACKAGE_DIR)
+
+
+# Temporary directory with edge list files
+class EdgeListFiles(object):
+    """
+    This class writes edge list files into a temporary directory that is removed by close()
+    """
+    def __init__(self):
+        self.directory = tempfile.mkdtemp(prefix='neochain_test_')
+
+    def write(self, name=None, edges=None):
+        """
+        This function writes whitespace separated edges into a file
+
+        :param name: (string) File name
+        :param edges: (list) (source, target) or (source, target, weight) tuples
+        :return: (string) File path
+        """
+        file_path = os.path.join(self.directory, name)
+        with open(file_path, 'w') as f:
+            for edge in edges:
+                f.write(' '.join(str(value) for value in edge) + '\n')
+
+        # Return
+        return file_path
+
+    def close(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,382 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Import python libraries
+import os
+import time
+import heapq
+import random
+import unittest
+import numpy as np
+import pandas as pd
+import networkx as nx
+
+# Import custom libraries
+import tests
+import _operations
+import nc_data_handler
+import nc_community_handler
+
+
+# Source code meta data
+__author__ = 'Dalwar Hossain'
+__email__ = 'dalwar.hossain@protonmail.com'
+
+
+# Group the nodes of a python dictionary of nodes and communities
+def community_sets(all_communities=None):
+    """
+    This function groups the nodes of every community into a set, community ids do not matter for the comparison
+
+    :param all_communities: (dict) Python dictionary of nodes and communities
+    :return: (set) frozen sets of the members of every community
+    """
+    members = {}
+    for node, cluster in all_communities.items():
+        members.setdefault(cluster, set()).add(node)
+
+    # Return
+    return set(frozenset(community_members) for community_members in members.values())
+
+
+# Find top 'n' communities with the group by implementation of neochain 1.x
+def groupby_top_n_communities(all_communities=None, n=None):
+    """
+    This function finds the top 'n' communities like find_top_n_communities() did before the label array version
+
+    :param all_communities: (dict) A python dictionary of nodes and communities
+    :param n: (int) number of top community to be selected
+    :return: (dict) of top 'n' communities
+    """
+    communities_df = pd.DataFrame(list(all_communities.items()), columns=['node', 'cluster'], dtype=int)
+    node_groups = communities_df.groupby('cluster')['node'].apply(list)
+    top_n_communities_ls = heapq.nlargest(n, node_groups, key=len)
+
+    # Return
+    return _operations.__get_dict(top_n_communities_ls)
+
+
+class TestParsedEdgeList(unittest.TestCase):
+    def setUp(self):
+        self.edge_list_files = tests.EdgeListFiles()
+        self.input_file = self.edge_list_files.write('caveman.txt', nx.connected_caveman_graph(4, 6).edges())
+
+    def tearDown(self):
+        self.edge_list_files.close()
+
+    def test_parsed_edge_list_matches_file(self):
+        edge_list = nc_data_handler.read_edge_list(input_file=self.input_file)
+        for algorithm in ('louvain', 'lpa'):
+            from_edge_list = nc_community_handler.find_communities(input_file=edge_list, algorithm=algorithm, seed=1)
+            from_file = nc_community_handler.find_communities(input_file=self.input_file, algorithm=algorithm, seed=1)
+            self.assertEqual(community_sets(from_edge_list), community_sets(from_file))
+            self.assertEqual(len(community_sets(from_edge_list)), 4)
+
+
+class TestWarmStart(unittest.TestCase):
+    def setUp(self):
+        self.edge_list_files = tests.EdgeListFiles()
+        # Four caves of six nodes, the prior partition does not know the last cave
+        ntx_graph = nx.connected_caveman_graph(4, 6)
+        self.input_file = self.edge_list_files.write('caveman.txt', ntx_graph.edges())
+        self.caves = set(frozenset(range(cave * 6, cave * 6 + 6)) for cave in range(4))
+        self.prior_partition = dict((node, 10 + node // 6) for node in range(18))
+
+    def tearDown(self):
+        self.edge_list_files.close()
+
+    def test_prior_partition_is_kept(self):
+        for algorithm, engine in (('louvain', 'networkx'), ('louvain', 'csr'), ('leiden', 'csr'), ('lpa', 'csr')):
+            all_communities = nc_community_handler.find_communities(input_file=self.input_file, algorithm=algorithm,
+                                                                    engine=engine, seed=1,
+                                                                    prior_partition=self.prior_partition)
+            self.assertEqual(community_sets(all_communities), self.caves, msg=algorithm + engine)
+
+
+class TestComponents(unittest.TestCase):
+    def setUp(self):
+        self.edge_list_files = tests.EdgeListFiles()
+        # Giant component of four caves, two mid-size components of two cliques and three small components
+        giant = nx.connected_caveman_graph(4, 6)
+        mid_size = nx.disjoint_union(nx.barbell_graph(5, 0), nx.barbell_graph(5, 0))
+        small = nx.Graph([(0, 1), (2, 3), (3, 4)])
+        self.ntx_graph = nx.disjoint_union_all([giant, mid_size, small])
+        self.input_file = self.edge_list_files.write('components.txt', self.ntx_graph.edges())
+        self.giant_nodes = set(range(24))
+
+    def tearDown(self):
+        self.edge_list_files.close()
+
+    def test_communities_stay_in_components(self):
+        for algorithm in ('louvain', 'leiden', 'lpa'):
+            all_communities = nc_community_handler.find_communities(input_file=self.input_file, algorithm=algorithm,
+                                                                    engine='csr', seed=1, components=True,
+                                                                    small_component_size=3, processes=2)
+            self.assertEqual(set(all_communities), set(self.ntx_graph.nodes()))
+            communities = community_sets(all_communities)
+            component_of = {}
+            for component, members in enumerate(nx.connected_components(self.ntx_graph)):
+                component_of.update((node, component) for node in members)
+            for members in communities:
+                self.assertEqual(len(set(component_of[node] for node in members)), 1)
+
+            # Small components are one community each, the giant component keeps its caves
+            self.assertIn(frozenset([44, 45]), communities)
+            self.assertIn(frozenset([46, 47, 48]), communities)
+            self.assertEqual(set(members for members in communities if members <= self.giant_nodes),
+                             set(frozenset(range(cave * 6, cave * 6 + 6)) for cave in range(4)))
+
+
+class TestPrunedCommunities(unittest.TestCase):
+    def setUp(self):
+        self.edge_list_files = tests.EdgeListFiles()
+
+    def tearDown(self):
+        self.edge_list_files.close()
+
+    def test_nothing_to_prune(self):
+        input_file = self.edge_list_files.write('cycle.txt', nx.cycle_graph(40).edges())
+        pruned = nc_community_handler.find_communities(input_file=input_file, algorithm='louvain', engine='csr',
+                                                       seed=1, prune_degree=1)
+        unpruned = nc_community_handler.find_communities(input_file=input_file, algorithm='louvain', engine='csr',
+                                                         seed=1)
+        self.assertEqual(pruned, unpruned)
+
+    def test_empty_core_falls_back(self):
+        edges = list(nx.powerlaw_cluster_graph(500, 2, 0.1, seed=3).edges())
+        input_file = self.edge_list_files.write('powerlaw.txt', edges)
+        all_communities = nc_community_handler.find_communities(input_file=input_file, algorithm='louvain',
+                                                                engine='csr', seed=1, prune_degree=2)
+        self.assertEqual(len(all_communities), 500)
+        self.assertGreater(len(set(all_communities.values())), 1)
+
+    def test_leaves_join_their_anchor(self):
+        ntx_graph = nx.connected_caveman_graph(4, 6)
+        ntx_graph.add_edges_from([(0, 100), (100, 101), (13, 102)])
+        input_file = self.edge_list_files.write('leaves.txt', ntx_graph.edges())
+        all_communities = nc_community_handler.find_communities(input_file=input_file, algorithm='leiden', seed=1,
+                                                                prune_degree=1)
+        self.assertEqual(all_communities[100], all_communities[0])
+        self.assertEqual(all_communities[101], all_communities[0])
+        self.assertEqual(all_communities[102], all_communities[13])
+        self.assertEqual(len(set(all_communities.values())), 4)
+
+
+class TestTopNCommunities(unittest.TestCase):
+    def setUp(self):
+        generator = random.Random(7)
+        nodes = generator.sample(range(10 ** 6), 2000)
+        # Few distinct sizes, so many communities tie
+        self.dense_communities = dict((node, generator.randint(0, 60)) for node in nodes)
+        self.sparse_communities = dict((node, generator.choice([-5, 3, 10 ** 9, 42, 7 * 10 ** 6]))
+                                       for node in nodes)
+
+    def test_matches_groupby(self):
+        for all_communities in (self.dense_communities, self.sparse_communities):
+            for n in (1, 3, 10, 25, 100):
+                self.assertEqual(nc_community_handler.find_top_n_communities(all_communities=all_communities, n=n),
+                                 groupby_top_n_communities(all_communities=all_communities, n=n))
+
+    def test_partition_matches_dict(self):
+        partition = nc_data_handler.create_partition(self.dense_communities)
+        top_n_partition = nc_community_handler.find_top_n_communities(all_communities=partition, n=10)
+        top_n_dict = nc_community_handler.find_top_n_communities(all_communities=self.dense_communities, n=10)
+        self.assertEqual(top_n_partition.n_communities, len(top_n_dict))
+        for rank, members in top_n_dict.items():
+            self.assertEqual(sorted(top_n_partition.members(rank).tolist()), sorted(members))
+
+    def test_empty(self):
+        self.assertEqual(nc_community_handler.find_top_n_communities(all_communities={}, n=5), {})
+
+
+class TestAggregate(unittest.TestCase):
+    def setUp(self):
+        self.edge_list_files = tests.EdgeListFiles()
+        # Two triangles, the bridge (3, 4) is repeated 20 times
+        edges = [(1, 2, 1), (2, 3, 1), (1, 3, 1), (4, 5, 1), (5, 6, 1), (4, 6, 1)] + [(3, 4, 1), (4, 3, 1)] * 10
+        self.input_file = self.edge_list_files.write('bridge.txt', edges)
+
+    def tearDown(self):
+        self.edge_list_files.close()
+
+    def test_networkx_default_keeps_last_weight(self):
+        all_communities = nc_community_handler.find_communities(input_file=self.input_file, weighted='yes',
+                                                                algorithm='louvain')
+        self.assertEqual(community_sets(all_communities), set([frozenset([1, 2, 3]), frozenset([4, 5, 6])]))
+
+    def test_aggregate_sums_duplicate_edges(self):
+        for engine in ('networkx', 'csr'):
+            all_communities = nc_community_handler.find_communities(input_file=self.input_file, weighted='yes',
+                                                                    algorithm='louvain', engine=engine, seed=1,
+                                                                    aggregate=True)
+            self.assertEqual(community_sets(all_communities),
+                             set([frozenset([1, 2]), frozenset([3, 4]), frozenset([5, 6])]))
+
+
+class TestTimeBudget(unittest.TestCase):
+    def setUp(self):
+        self.edge_list_files = tests.EdgeListFiles()
+        self.ntx_graph = nx.powerlaw_cluster_graph(2000, 3, 0.1, seed=5)
+        self.input_file = self.edge_list_files.write('powerlaw.txt', self.ntx_graph.edges())
+
+    def tearDown(self):
+        self.edge_list_files.close()
+
+    def test_exhausted_budget(self):
+        for algorithm in ('louvain', 'leiden', 'lpa', 'infomap'):
+            detection = nc_community_handler.detect_communities(input_file=self.input_file, algorithm=algorithm,
+                                                                seed=1, time_budget=0)
+            self.assertFalse(detection.completed)
+            self.assertEqual(set(detection.communities), set(self.ntx_graph.nodes()))
+
+    def test_generous_budget(self):
+        detection = nc_community_handler.detect_communities(input_file=self.input_file, algorithm='leiden', seed=1,
+                                                            time_budget=600)
+        self.assertTrue(detection.completed)
+        self.assertEqual(detection.communities,
+                         nc_community_handler.find_communities(input_file=self.input_file, algorithm='leiden',
+                                                               seed=1))
+
+    def test_find_communities_returns_dict(self):
+        for kwargs in ({}, {'time_budget': 0}, {'time_budget': 600, 'components': True}):
+            all_communities = nc_community_handler.find_communities(input_file=self.input_file, algorithm='louvain',
+                                                                    engine='csr', seed=1, **kwargs)
+            self.assertIsInstance(all_communities, dict)
+            self.assertEqual(len(all_communities), self.ntx_graph.number_of_nodes())
+
+    def test_detect_communities_without_budget(self):
+        detection = nc_community_handler.detect_communities(input_file=self.input_file, algorithm='lpa', seed=1)
+        self.assertTrue(detection.completed)
+        self.assertIsNone(detection.trial_report)
+
+
+# Infomap network that records its links
+class InfomapLinks(object):
+    """
+    This class records the links added with addLink()
+    """
+    def __init__(self):
+        self.links = []
+
+    def addLink(self, n1, n2, weight=1.0):
+        self.links.append((n1, n2, weight))
+
+
+class TestInfomapLinks(unittest.TestCase):
+    def setUp(self):
+        self.add_infomap_links = getattr(nc_community_handler, '__add_infomap_links')
+
+    def test_weighted_links(self):
+        infomap_links = InfomapLinks()
+        edge_list = nc_data_handler.EdgeList(source=np.array([1, 2, 3], dtype=np.int32),
+                                             target=np.array([2, 3, 1], dtype=np.int32),
+                                             weight=np.array([0.5, 2.0, 4.0], dtype=np.float32))
+        self.add_infomap_links(infomap_wrapper=infomap_links, edge_list=edge_list)
+        self.assertEqual(infomap_links.links, [(1, 2, 0.5), (2, 3, 2.0), (3, 1, 4.0)])
+
+    def test_blocks_of_unweighted_links(self):
+        infomap_links = InfomapLinks()
+        n_links = nc_community_handler.INFOMAP_LINK_BLOCK_SIZE + 10
+        edge_list = nc_data_handler.EdgeList(source=np.arange(n_links), target=np.arange(n_links) + 1)
+        self.add_infomap_links(infomap_wrapper=infomap_links, edge_list=edge_list)
+        self.assertEqual(len(infomap_links.links), n_links)
+        self.assertEqual(infomap_links.links[-1], (n_links - 1, n_links, 1.0))
+        self.assertTrue(all(type(node) is int for node in infomap_links.links[-1][:2]))
+
+    def test_negative_node_ids_exit(self):
+        edge_list = nc_data_handler.EdgeList(source=np.array([-1]), target=np.array([2]))
+        with self.assertRaises(SystemExit):
+            self.add_infomap_links(infomap_wrapper=InfomapLinks(), edge_list=edge_list)
+
+
+class TestInfomapTrials(unittest.TestCase):
+    def setUp(self):
+        self.edge_list_files = tests.EdgeListFiles()
+        self.input_file = self.edge_list_files.write('caveman.txt', nx.connected_caveman_graph(4, 6).edges())
+
+    def tearDown(self):
+        self.edge_list_files.close()
+
+    def test_split_options(self):
+        split_infomap_options = getattr(nc_community_handler, '__split_infomap_options')
+        self.assertEqual(split_infomap_options('--silent -N 5 --seed=7 --markov-time 2'),
+                         ('--silent --markov-time 2', 5, 7))
+        self.assertEqual(split_infomap_options('--num-trials 3 -s 11'), ('', 3, 11))
+        self.assertEqual(split_infomap_options('--silent'), ('--silent', None, None))
+
+    def test_budget(self):
+        get_infomap_budget = getattr(nc_community_handler, '__get_infomap_budget')
+        core_loop_limit, max_trials = get_infomap_budget(n_links=1000, deadline=0, processes=4)
+        self.assertEqual((core_loop_limit, max_trials), (1, 4))
+        core_loop_limit, max_trials = get_infomap_budget(n_links=1000, deadline=time.time() + 3600, processes=2)
+        self.assertEqual(core_loop_limit, nc_community_handler.INFOMAP_MAX_CORE_LOOP_LIMIT)
+        self.assertGreater(max_trials, 2)
+
+    def test_trial_report(self):
+        detection = nc_community_handler.detect_communities(input_file=self.input_file, algorithm='infomap',
+                                                            trials=3, processes=2, seed=5)
+        self.assertEqual(detection.trial_report['seed'].tolist(), [5, 6, 7])
+        self.assertEqual(detection.trial_report.index.name, 'trial')
+        self.assertEqual(len(detection.communities), 24)
+
+    def test_single_trial_report(self):
+        detection = nc_community_handler.detect_communities(input_file=self.input_file, algorithm='infomap',
+                                                            options='--silent --seed 9')
+        self.assertEqual(detection.trial_report['seed'].tolist(), [9])
+
+    def test_conflicting_seeds_exit(self):
+        for kwargs in ({'options': '--seed 3', 'seed': 4}, {'options': '-N 3', 'trials': 2}):
+            with self.assertRaises(SystemExit):
+                nc_community_handler.detect_communities(input_file=self.input_file, algorithm='infomap', **kwargs)
+
+
+class TestInfomapHierarchy(unittest.TestCase):
+    def setUp(self):
+        self.edge_list_files = tests.EdgeListFiles()
+        self.input_file = self.edge_list_files.write('caveman.txt', nx.connected_caveman_graph(6, 5).edges())
+        self.tree_file = os.path.join(self.edge_list_files.directory, 'caveman.tree')
+
+    def tearDown(self):
+        self.edge_list_files.close()
+
+    def test_tree_file_and_depths(self):
+        all_communities = nc_community_handler.find_communities(input_file=self.input_file, algorithm='infomap',
+                                                                hierarchical=True)
+        self.assertTrue(os.path.exists(self.tree_file))
+        hierarchy = nc_community_handler.read_infomap_hierarchy(tree_file=self.tree_file)
+        self.assertEqual(hierarchy.partition(depth=1), all_communities)
+        self.assertIs(hierarchy.partition(depth=1), hierarchy.partition(depth=1))
+
+        # Every finest module lies inside one top module
+        top_modules = hierarchy.partition(depth=1)
+        finest_modules = hierarchy.partition(depth=-1)
+        self.assertEqual(set(finest_modules), set(top_modules))
+        parents = {}
+        for node, module in finest_modules.items():
+            self.assertEqual(parents.setdefault(module, top_modules[node]), top_modules[node])
+
+    def test_invalid_depth_exits(self):
+        nc_community_handler.find_communities(input_file=self.input_file, algorithm='infomap', hierarchical=True)
+        hierarchy = nc_community_handler.read_infomap_hierarchy(tree_file=self.tree_file)
+        for depth in (0, hierarchy.max_depth):
+            with self.assertRaises(SystemExit):
+                hierarchy.partition(depth=depth)
+
+    def test_existing_tree_file(self):
+        nc_community_handler.find_communities(input_file=self.input_file, algorithm='infomap', hierarchical=True)
+        with self.assertRaises(SystemExit):
+            nc_community_handler.find_communities(input_file=self.input_file, algorithm='infomap', hierarchical=True)
+        nc_community_handler.find_communities(input_file=self.input_file, algorithm='infomap', hierarchical=True,
+                                              overwrite_tree=True)
+
+    def test_parsed_edge_list_needs_tree_file(self):
+        edge_list = nc_data_handler.read_edge_list(input_file=self.input_file)
+        with self.assertRaises(SystemExit):
+            nc_community_handler.find_communities(input_file=edge_list, algorithm='infomap', hierarchical=True)
+        tree_file = os.path.join(self.edge_list_files.directory, 'edge_list.tree')
+        nc_community_handler.find_communities(input_file=edge_list, algorithm='infomap', tree_file=tree_file)
+        self.assertTrue(os.path.exists(tree_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Import python libraries
+import unittest
+import numpy as np
+import networkx as nx
+import community
+
+# Import custom libraries
+import tests
+import _csr_graph
+import nc_data_handler
+
+
+# Source code meta data
+__author__ = 'Dalwar Hossain'
+__email__ = 'dalwar.hossain@protonmail.com'
+
+
+# Create an edge list from a networkx graph
+def edge_list_from_graph(graph=None):
+    """
+    This function creates a weighted edge list from the edges of a networkx graph
+
+    :param graph: (networkx graph) Graph with optional weight attributes
+    :return: (EdgeList) Edge list
+    """
+    edges = list(graph.edges(data='weight', default=1.0))
+
+    # Return
+    return nc_data_handler.EdgeList(source=np.array([edge[0] for edge in edges], dtype=np.int64),
+                                    target=np.array([edge[1] for edge in edges], dtype=np.int64),
+                                    weight=np.array([edge[2] for edge in edges], dtype=np.float64))
+
+
+class TestModularity(unittest.TestCase):
+    def setUp(self):
+        # Duplicate, reciprocal and self-loop edges
+        self.edge_list = nc_data_handler.EdgeList(source=np.array([1, 1, 2, 2, 3, 4, 4, 5, 6, 6, 3]),
+                                                  target=np.array([2, 2, 1, 3, 1, 5, 6, 6, 4, 6, 4]),
+                                                  weight=np.array([1.0, 2.0, 0.5, 1.0, 3.0, 1.0, 2.0, 1.5, 1.0,
+                                                                   4.0, 0.5]))
+        self.ntx_graph = nx.Graph()
+        for source, target, weight in zip(self.edge_list.source, self.edge_list.target, self.edge_list.weight):
+            if self.ntx_graph.has_edge(source, target):
+                self.ntx_graph[source][target]['weight'] += weight
+            else:
+                self.ntx_graph.add_edge(source, target, weight=weight)
+
+    def test_modularity_matches_networkx(self):
+        csr_graph = _csr_graph.build_csr_graph(edge_list=self.edge_list)
+        for partition in ({1: 0, 2: 0, 3: 0, 4: 1, 5: 1, 6: 1}, {1: 0, 2: 1, 3: 0, 4: 1, 5: 2, 6: 2}):
+            labels = np.array([partition[node] for node in csr_graph.nodes.tolist()])
+            self.assertAlmostEqual(_csr_graph.modularity(csr_graph, labels),
+                                   community.modularity(partition, self.ntx_graph, weight='weight'))
+
+    def test_csr_edges_round_trip(self):
+        csr_graph = _csr_graph.build_csr_graph(edge_list=self.edge_list)
+        source, target, weight = _csr_graph.csr_edges(graph=csr_graph)
+        self.assertEqual(len(source), self.ntx_graph.number_of_edges())
+        for u, v, w in zip(source.tolist(), target.tolist(), weight.tolist()):
+            self.assertAlmostEqual(w, self.ntx_graph[u][v]['weight'])
+
+    def test_louvain_modularity_matches_networkx_engine(self):
+        ntx_graph = nx.connected_caveman_graph(6, 8)
+        csr_graph = _csr_graph.build_csr_graph(edge_list=edge_list_from_graph(ntx_graph))
+        levels, completed = _csr_graph.louvain(graph=csr_graph, random_state=1)
+        self.assertTrue(completed)
+        labels = _csr_graph.partition_at_level(levels=levels, n_nodes=len(csr_graph))
+        csr_modularity = _csr_graph.modularity(csr_graph, labels)
+        partition = _csr_graph.labels_to_dict(graph=csr_graph, labels=labels)
+        self.assertAlmostEqual(csr_modularity, community.modularity(partition, ntx_graph))
+        ntx_modularity = community.modularity(community.best_partition(ntx_graph, random_state=1), ntx_graph)
+        self.assertGreaterEqual(csr_modularity, ntx_modularity - 0.01)
+
+
+class TestLeiden(unittest.TestCase):
+    def test_communities_are_connected(self):
+        for seed in range(3):
+            ntx_graph = nx.powerlaw_cluster_graph(300, 3, 0.1, seed=seed)
+            csr_graph = _csr_graph.build_csr_graph(edge_list=edge_list_from_graph(ntx_graph))
+            labels, completed = _csr_graph.leiden(graph=csr_graph, random_state=seed)
+            self.assertTrue(completed)
+            self.assertGreater(labels.max(), 0)
+            for label in np.unique(labels):
+                members = csr_graph.nodes[labels == label].tolist()
+                self.assertTrue(nx.is_connected(ntx_graph.subgraph(members)))
+
+    def test_modularity_matches_louvain(self):
+        ntx_graph = nx.connected_caveman_graph(6, 8)
+        csr_graph = _csr_graph.build_csr_graph(edge_list=edge_list_from_graph(ntx_graph))
+        labels, completed = _csr_graph.leiden(graph=csr_graph, random_state=1)
+        self.assertEqual(len(np.unique(labels)), 6)
+        levels, completed = _csr_graph.louvain(graph=csr_graph, random_state=1)
+        louvain_labels = _csr_graph.partition_at_level(levels=levels, n_nodes=len(csr_graph))
+        self.assertGreaterEqual(_csr_graph.modularity(csr_graph, labels),
+                                _csr_graph.modularity(csr_graph, louvain_labels) - 1e-9)
+
+
+class TestConnectedComponents(unittest.TestCase):
+    def test_components_match_networkx(self):
+        ntx_graph = nx.gnm_random_graph(400, 300, seed=7)
+        edges = np.array(list(ntx_graph.edges()))
+        components = _csr_graph.connected_components(source=edges[:, 0], target=edges[:, 1], n_nodes=400)
+        self.assertEqual(set(frozenset(np.flatnonzero(components == label).tolist())
+                             for label in np.unique(components)),
+                         set(frozenset(members) for members in nx.connected_components(ntx_graph)))
+        self.assertEqual(components.max() + 1, nx.number_connected_components(ntx_graph))
+
+
+class TestLabelPropagation(unittest.TestCase):
+    def test_planted_communities(self):
+        ntx_graph = nx.connected_caveman_graph(6, 8)
+        csr_graph = _csr_graph.build_csr_graph(edge_list=edge_list_from_graph(ntx_graph))
+        labels, completed = _csr_graph.label_propagation(graph=csr_graph, random_state=1)
+        self.assertTrue(completed)
+        self.assertEqual(len(np.unique(labels)), 6)
+        for label in np.unique(labels):
+            members = csr_graph.nodes[labels == label].tolist()
+            self.assertTrue(nx.is_connected(ntx_graph.subgraph(members)))
+
+    def test_seed_is_reproducible(self):
+        ntx_graph = nx.powerlaw_cluster_graph(500, 3, 0.1, seed=2)
+        csr_graph = _csr_graph.build_csr_graph(edge_list=edge_list_from_graph(ntx_graph))
+        labels, completed = _csr_graph.label_propagation(graph=csr_graph, random_state=4)
+        self.assertTrue((_csr_graph.label_propagation(graph=csr_graph, random_state=4)[0] == labels).all())
+
+    def test_warm_start_and_isolated_edges(self):
+        ntx_graph = nx.Graph([(0, 1), (2, 2)])
+        csr_graph = _csr_graph.build_csr_graph(edge_list=edge_list_from_graph(ntx_graph))
+        labels, completed = _csr_graph.label_propagation(graph=csr_graph, random_state=1)
+        self.assertEqual(labels[0], labels[1])
+        self.assertNotEqual(labels[0], labels[2])
+        prior_labels = np.zeros(len(csr_graph), dtype=np.int64)
+        labels, completed = _csr_graph.label_propagation(graph=csr_graph, labels=prior_labels, max_iterations=0)
+        self.assertTrue((labels == prior_labels).all())
+        self.assertIsNot(labels, prior_labels)
+
+
+class TestPruning(unittest.TestCase):
+    def test_nothing_to_prune(self):
+        ntx_graph = nx.cycle_graph(50)
+        csr_graph = _csr_graph.build_csr_graph(edge_list=edge_list_from_graph(ntx_graph))
+        remaining, anchor, n_rounds = _csr_graph.prune_leaves(graph=csr_graph, max_degree=1)
+        self.assertTrue(remaining.all())
+        self.assertTrue((anchor == np.arange(len(csr_graph))).all())
+        self.assertEqual(n_rounds, 0)
+        labels = np.arange(len(csr_graph)) // 10
+        attached = _csr_graph.attach_pruned_nodes(remaining=remaining, anchor=anchor, labels=labels)
+        self.assertTrue((attached == labels).all())
+
+    def test_everything_pruned(self):
+        ntx_graph = nx.path_graph(10)
+        csr_graph = _csr_graph.build_csr_graph(edge_list=edge_list_from_graph(ntx_graph))
+        remaining, anchor, n_rounds = _csr_graph.prune_leaves(graph=csr_graph, max_degree=1)
+        self.assertFalse(remaining.any())
+        labels = _csr_graph.attach_pruned_nodes(remaining=remaining, anchor=anchor,
+                                                labels=np.zeros(len(csr_graph), dtype=np.int64))
+        self.assertEqual(len(np.unique(labels)), 1)
+
+    def test_leaves_attach_to_anchor(self):
+        # A path of three leaves hangs at node 0 of a triangle
+        ntx_graph = nx.Graph([(0, 1), (1, 2), (0, 2), (0, 10), (10, 11), (11, 12)])
+        csr_graph = _csr_graph.build_csr_graph(edge_list=edge_list_from_graph(ntx_graph))
+        remaining, anchor, n_rounds = _csr_graph.prune_leaves(graph=csr_graph, max_degree=1)
+        self.assertEqual(csr_graph.nodes[remaining].tolist(), [0, 1, 2])
+        self.assertEqual(n_rounds, 3)
+        labels = _csr_graph.attach_pruned_nodes(remaining=remaining, anchor=anchor,
+                                                labels=np.array([5, 6, 7, 0, 0, 0]))
+        self.assertEqual(labels.tolist(), [5, 6, 7, 5, 5, 5])
+
+
+if __name__ == '__main__':
+    unittest.main()
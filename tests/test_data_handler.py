@@ -0,0 +1,465 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Import python libraries
+import os
+import bz2
+import gzip
+import unittest
+import numpy as np
+import pandas as pd
+
+# Import custom libraries
+import tests
+import _operations
+import nc_data_handler
+
+
+# Source code meta data
+__author__ = 'Dalwar Hossain'
+__email__ = 'dalwar.hossain@protonmail.com'
+
+
+class TestReadEdgeList(unittest.TestCase):
+    def setUp(self):
+        self.edge_list_files = tests.EdgeListFiles()
+        self.edges = [(1, 2, 0.5), (2, 3, 2), (3, 1, 4)]
+        self.input_file = self.edge_list_files.write('graph.txt', self.edges)
+        nc_data_handler.clear_snapshot_cache()
+
+    def tearDown(self):
+        self.edge_list_files.close()
+        nc_data_handler.clear_snapshot_cache()
+
+    def test_weighted(self):
+        edge_list = nc_data_handler.read_edge_list(input_file=self.input_file, weighted='yes')
+        self.assertTrue(edge_list.weighted)
+        self.assertEqual(len(edge_list), 3)
+        self.assertEqual(edge_list.input_file, self.input_file)
+        self.assertEqual(list(edge_list.edges()), [(1, 2, 0.5), (2, 3, 2.0), (3, 1, 4.0)])
+        self.assertEqual(edge_list.nodes().tolist(), [1, 2, 3])
+
+    def test_unweighted_file(self):
+        input_file = self.edge_list_files.write('unweighted.txt', [edge[:2] for edge in self.edges])
+        edge_list = nc_data_handler.read_edge_list(input_file=input_file)
+        self.assertFalse(edge_list.weighted)
+        self.assertEqual(list(edge_list.edges()), [(1, 2), (2, 3), (3, 1)])
+        self.assertEqual(list(edge_list.to_data_frame().columns), ['source', 'target'])
+
+    def test_tight_dtypes(self):
+        edge_list = nc_data_handler.read_edge_list(input_file=self.input_file, weighted='yes')
+        self.assertEqual((edge_list.source.dtype, edge_list.target.dtype, edge_list.weight.dtype),
+                         (np.int32, np.int32, np.float32))
+        self.assertEqual(edge_list.memory_usage(), 3 * 3 * 4)
+        input_file = self.edge_list_files.write('wide.txt', [(1, 2 ** 40, 1)])
+        edge_list = nc_data_handler.read_edge_list(input_file=input_file, weighted='yes')
+        self.assertEqual((edge_list.source.dtype, edge_list.target.dtype), (np.int64, np.int64))
+        self.assertEqual(edge_list.target.tolist(), [2 ** 40])
+
+    def test_parsed_edge_list_is_not_read_again(self):
+        edge_list = nc_data_handler.read_edge_list(input_file=self.input_file, weighted='yes')
+        os.remove(self.input_file)
+        self.assertIs(getattr(nc_data_handler, '__get_edge_list')(input_data=edge_list), edge_list)
+
+    def test_data_frame_input(self):
+        graph_df = pd.DataFrame({'source': [1, 2], 'target': [2, 3], 'weight': [1.0, 2.0]})
+        edge_list = getattr(nc_data_handler, '__get_edge_list')(input_data=graph_df)
+        self.assertEqual(list(edge_list.edges()), [(1, 2, 1.0), (2, 3, 2.0)])
+
+
+class TestReadEdgeLists(unittest.TestCase):
+    def setUp(self):
+        self.edge_list_files = tests.EdgeListFiles()
+        self.snapshots = [[(1, 2, 1), (2, 3, 2)], [(3, 4, 3)], [(1, 2, 1), (1, 2, 5), (5, 6, 1)]]
+        self.input_files = [self.edge_list_files.write('t{}.txt'.format(position), edges)
+                            for position, edges in enumerate(self.snapshots)]
+
+    def tearDown(self):
+        self.edge_list_files.close()
+
+    def test_order_is_kept(self):
+        for processes in (1, 2):
+            edge_lists = nc_data_handler.read_edge_lists(input_files=self.input_files, weighted='yes',
+                                                         processes=processes)
+            self.assertEqual([[tuple(map(int, edge)) for edge in edge_list.edges()] for edge_list in edge_lists],
+                             self.snapshots)
+
+    def test_binary_and_aggregated_snapshots(self):
+        input_files = list(self.input_files)
+        input_files[1] = nc_data_handler.convert_edge_list(input_file=input_files[1], weighted='yes')
+        edge_lists = nc_data_handler.read_edge_lists(input_files=iter(input_files), weighted='yes', processes=2,
+                                                     aggregate='count')
+        self.assertEqual([len(edge_list) for edge_list in edge_lists], [2, 1, 2])
+        self.assertEqual(edge_lists[2].count.tolist(), [2, 1])
+
+    def test_failing_snapshot_exits(self):
+        input_files = self.input_files + [os.path.join(self.edge_list_files.directory, 'missing.txt')]
+        with self.assertRaises(SystemExit):
+            nc_data_handler.read_edge_lists(input_files=input_files, weighted='yes', processes=2)
+
+
+class TestAggregate(unittest.TestCase):
+    def setUp(self):
+        self.edge_list = nc_data_handler.EdgeList(source=np.array([1, 1, 2, 3, 1], dtype=np.int32),
+                                                  target=np.array([2, 2, 1, 4, 2], dtype=np.int32),
+                                                  weight=np.array([1.0, 2.0, 4.0, 8.0, 16.0], dtype=np.float32))
+
+    def test_directed(self):
+        edge_list = self.edge_list.aggregate(count=True)
+        self.assertEqual(list(zip(edge_list.source.tolist(), edge_list.target.tolist(), edge_list.weight.tolist(),
+                                  edge_list.count.tolist())), [(1, 2, 19.0, 3), (2, 1, 4.0, 1), (3, 4, 8.0, 1)])
+
+    def test_undirected(self):
+        edge_list = self.edge_list.aggregate(directed=False)
+        self.assertEqual(list(edge_list.edges()), [(1, 2, 23.0), (3, 4, 8.0)])
+        self.assertIsNone(edge_list.count)
+
+    def test_node_ids_wider_than_32_bits(self):
+        offset = 2 ** 40
+        edge_list = nc_data_handler.EdgeList(source=self.edge_list.source.astype(np.int64) + offset,
+                                             target=self.edge_list.target.astype(np.int64) + offset,
+                                             weight=self.edge_list.weight).aggregate(count=True)
+        self.assertEqual(list(zip((edge_list.source - offset).tolist(), (edge_list.target - offset).tolist(),
+                                  edge_list.weight.tolist(), edge_list.count.tolist())),
+                         [(1, 2, 19.0, 3), (2, 1, 4.0, 1), (3, 4, 8.0, 1)])
+
+    def test_read_edge_list(self):
+        edge_list_files = tests.EdgeListFiles()
+        try:
+            input_file = edge_list_files.write('duplicates.txt', [(1, 2, 1), (1, 2, 2), (2, 3, 5)])
+            edge_list = nc_data_handler.read_edge_list(input_file=input_file, weighted='yes', aggregate='count')
+        finally:
+            edge_list_files.close()
+        self.assertEqual(list(edge_list.edges()), [(1, 2, 3.0), (2, 3, 5.0)])
+        self.assertEqual(edge_list.count.tolist(), [2, 1])
+
+
+class TestCompressedInput(unittest.TestCase):
+    def setUp(self):
+        self.edge_list_files = tests.EdgeListFiles()
+        self.edges = [(source, (source * 7) % 500, source % 9 + 1) for source in range(20000)]
+        self.input_file = self.edge_list_files.write('graph.txt', self.edges)
+        with open(self.input_file, 'rb') as f:
+            self.data = f.read()
+
+    def tearDown(self):
+        self.edge_list_files.close()
+
+    def compressed_files(self):
+        compressed_files = []
+        for extension, open_file in (('.gz', gzip.open), ('.bz2', bz2.BZ2File)):
+            compressed_file = os.path.join(self.edge_list_files.directory, 'graph.txt' + extension)
+            with open_file(compressed_file, 'wb') as f:
+                f.write(self.data)
+            compressed_files.append(compressed_file)
+        try:
+            import lzma
+            compressed_file = os.path.join(self.edge_list_files.directory, 'graph.txt.xz')
+            with lzma.open(compressed_file, 'wb') as f:
+                f.write(self.data)
+            compressed_files.append(compressed_file)
+        except ImportError:
+            pass
+
+        # Return
+        return compressed_files
+
+    def test_read_edge_list(self):
+        for compressed_file in self.compressed_files():
+            edge_list = nc_data_handler.read_edge_list(input_file=compressed_file, weighted='yes')
+            self.assertEqual(list(edge_list.edges()), [tuple(map(float, edge)) for edge in self.edges])
+
+    def test_read_chunks(self):
+        for compressed_file in self.compressed_files():
+            edge_lists = list(nc_data_handler.iter_edge_list_chunks(input_data=compressed_file, weighted='yes',
+                                                                    chunk_size=3000))
+            self.assertEqual(len(edge_lists), 7)
+            self.assertEqual(sum(len(edge_list) for edge_list in edge_lists), len(self.edges))
+
+    def test_corrupt_file_exits(self):
+        with open(self.compressed_files()[0], 'rb') as f:
+            data = f.read()
+        corrupt_file = os.path.join(self.edge_list_files.directory, 'corrupt.txt.gz')
+        with open(corrupt_file, 'wb') as f:
+            f.write(data[:5000])
+        with self.assertRaises(SystemExit):
+            nc_data_handler.read_edge_list(input_file=corrupt_file, weighted='yes')
+
+
+class TestBinaryEdgeList(unittest.TestCase):
+    def setUp(self):
+        self.edge_list_files = tests.EdgeListFiles()
+        self.edges = [(1, 2, 0.5), (2, 3, 2), (3, 1, 4), (7, 8, 1)]
+        self.input_file = self.edge_list_files.write('graph.txt', self.edges)
+        self.output_file = os.path.join(self.edge_list_files.directory, 'graph.nce')
+
+    def tearDown(self):
+        self.edge_list_files.close()
+
+    def test_round_trip(self):
+        text_edge_list = nc_data_handler.read_edge_list(input_file=self.input_file, weighted='yes')
+        self.assertEqual(nc_data_handler.convert_edge_list(input_file=self.input_file, weighted='yes'),
+                         self.output_file)
+        self.assertTrue(nc_data_handler.is_binary_edge_list(self.output_file))
+        self.assertFalse(nc_data_handler.is_binary_edge_list(self.input_file))
+        edge_list = nc_data_handler.read_edge_list(input_file=self.output_file)
+        self.assertIsInstance(edge_list.source, np.memmap)
+        self.assertEqual(list(edge_list.edges()), list(text_edge_list.edges()))
+
+    def test_unweighted_and_empty(self):
+        for edges in ([(1, 2), (2, 3)], []):
+            edge_list = nc_data_handler.EdgeList(source=np.array([edge[0] for edge in edges], dtype=np.int32),
+                                                 target=np.array([edge[1] for edge in edges], dtype=np.int32))
+            nc_data_handler.write_binary_edge_list(edge_list=edge_list, output_file=self.output_file)
+            edge_list = nc_data_handler.read_binary_edge_list(input_file=self.output_file)
+            self.assertFalse(edge_list.weighted)
+            self.assertEqual(list(edge_list.edges()), edges)
+
+    def test_truncated_file_exits(self):
+        nc_data_handler.convert_edge_list(input_file=self.input_file, weighted='yes')
+        with open(self.output_file, 'rb+') as f:
+            f.truncate(os.path.getsize(self.output_file) - 4)
+        with self.assertRaises(SystemExit):
+            nc_data_handler.read_binary_edge_list(input_file=self.output_file)
+
+    def test_wide_node_ids_exit(self):
+        edge_list = nc_data_handler.EdgeList(source=np.array([2 ** 40]), target=np.array([1]))
+        with self.assertRaises(SystemExit):
+            nc_data_handler.write_binary_edge_list(edge_list=edge_list, output_file=self.output_file)
+
+
+class TestParquetEdgeList(unittest.TestCase):
+    def setUp(self):
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            raise unittest.SkipTest('pyarrow is not installed')
+        self.parquet = pyarrow.parquet
+        self.edge_list_files = tests.EdgeListFiles()
+        sources = np.arange(1000) % 200
+        self.edges = [(source, (source * 7 + 3) % 200, source % 5 + 1) for source in sources.tolist()]
+        self.input_file = self.edge_list_files.write('graph.txt', self.edges)
+        self.output_file = os.path.join(self.edge_list_files.directory, 'graph.parquet')
+        self.nodes = np.array([5, 6, 150])
+
+    def tearDown(self):
+        self.edge_list_files.close()
+
+    def sorted_edges(self, edge_list=None):
+        # Return
+        return sorted(tuple(map(int, edge)) for edge in edge_list.edges())
+
+    def expected_edges(self, nodes=None):
+        # Return
+        return sorted(edge for edge in self.edges if nodes is None or edge[0] in nodes or edge[1] in nodes)
+
+    def test_round_trip(self):
+        self.assertEqual(nc_data_handler.convert_edge_list(input_file=self.input_file, output_file=self.output_file,
+                                                           weighted='yes'), self.output_file)
+        self.assertTrue(nc_data_handler.is_parquet_edge_list(self.output_file))
+        edge_list = nc_data_handler.read_edge_list(input_file=self.output_file)
+        self.assertEqual(edge_list.weight.dtype, np.float32)
+        self.assertEqual(self.sorted_edges(edge_list), self.expected_edges())
+
+    def test_row_groups_are_skipped(self):
+        edge_list = nc_data_handler.read_edge_list(input_file=self.input_file, weighted='yes')
+        nc_data_handler.write_parquet_edge_list(edge_list=edge_list, output_file=self.output_file, row_group_size=50)
+        parquet_file = self.parquet.ParquetFile(self.output_file)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 40)
+        row_groups = getattr(nc_data_handler, '__find_row_groups')(parquet_file=parquet_file, nodes=self.nodes)
+        self.assertLess(len(row_groups), 10)
+        self.assertEqual(self.sorted_edges(nc_data_handler.read_parquet_edge_list(input_file=self.output_file,
+                                                                                  nodes=self.nodes)),
+                         self.expected_edges(self.nodes.tolist()))
+        chunks = list(nc_data_handler.iter_edge_list_chunks(input_data=self.output_file, nodes=self.nodes))
+        self.assertEqual(sorted(edge for chunk in chunks for edge in self.sorted_edges(chunk)),
+                         self.expected_edges(self.nodes.tolist()))
+
+    def test_file_with_one_part(self):
+        import pyarrow
+        table = pyarrow.Table.from_pydict({'source': [edge[0] for edge in self.edges],
+                                           'target': [edge[1] for edge in self.edges],
+                                           'weight': [float(edge[2]) for edge in self.edges]})
+        self.parquet.write_table(table, self.output_file, row_group_size=100)
+        self.assertEqual(self.sorted_edges(nc_data_handler.read_parquet_edge_list(input_file=self.output_file)),
+                         self.expected_edges())
+        self.assertEqual(self.sorted_edges(nc_data_handler.read_parquet_edge_list(input_file=self.output_file,
+                                                                                  nodes=self.nodes)),
+                         self.expected_edges(self.nodes.tolist()))
+
+
+class TestNodeDictionary(unittest.TestCase):
+    def setUp(self):
+        self.edge_list_files = tests.EdgeListFiles()
+        self.dictionary_file = os.path.join(self.edge_list_files.directory, 'nodes.txt')
+
+    def tearDown(self):
+        self.edge_list_files.close()
+
+    def test_encode_and_decode(self):
+        node_dictionary = nc_data_handler.NodeDictionary()
+        ids = node_dictionary.encode(['0xa', '0xb', '0xa', '0xc'])
+        self.assertEqual(ids.dtype, np.int32)
+        self.assertEqual(ids.tolist(), [0, 1, 0, 2])
+        self.assertEqual(node_dictionary.encode(['0xc', '0xd']).tolist(), [2, 3])
+        self.assertEqual(node_dictionary.decode([3, 0]).tolist(), ['0xd', '0xa'])
+        self.assertEqual(len(node_dictionary), 4)
+
+    def test_save_and_read(self):
+        node_dictionary = nc_data_handler.NodeDictionary()
+        node_dictionary.encode(['0xa', '0xb', '0x0', 'NA'])
+        node_dictionary.save(output_file=self.dictionary_file)
+        loaded = nc_data_handler.read_node_dictionary(input_file=self.dictionary_file)
+        self.assertEqual(loaded.addresses.tolist(), ['0xa', '0xb', '0x0', 'NA'])
+        self.assertEqual(loaded.encode(['NA', '0xe']).tolist(), [3, 4])
+
+    def test_empty_dictionary(self):
+        nc_data_handler.NodeDictionary().save(output_file=self.dictionary_file)
+        self.assertEqual(len(nc_data_handler.read_node_dictionary(input_file=self.dictionary_file)), 0)
+
+    def test_same_ids_across_snapshots(self):
+        input_file_t = self.edge_list_files.write('t.txt', [('0xa', '0xb', 1), ('0xb', '0xc', 2)])
+        input_file_t1 = self.edge_list_files.write('t1.txt', [('0xc', '0xd', 1), ('0xb', '0xa', 3)])
+        node_dictionary = nc_data_handler.NodeDictionary()
+        nc_data_handler.read_edge_list(input_file=input_file_t, weighted='yes', node_dictionary=node_dictionary)
+        node_dictionary.save(output_file=self.dictionary_file)
+
+        # A later run continues with the saved dictionary
+        node_dictionary = nc_data_handler.read_node_dictionary(input_file=self.dictionary_file)
+        edge_list = nc_data_handler.read_edge_list(input_file=input_file_t1, weighted='yes',
+                                                   node_dictionary=node_dictionary)
+        self.assertEqual(list(edge_list.edges()), [(2, 3, 1.0), (1, 0, 3.0)])
+        self.assertEqual(node_dictionary.decode(edge_list.target).tolist(), ['0xd', '0xa'])
+
+
+class TestPartition(unittest.TestCase):
+    def setUp(self):
+        self.communities = {10: 7, 11: 3, 12: 7, 13: -1, 2 ** 40: 3}
+
+    def test_round_trip(self):
+        partition = nc_data_handler.create_partition(self.communities)
+        self.assertEqual(partition.to_dict(), self.communities)
+        self.assertEqual(partition.ids.tolist(), [-1, 3, 7])
+        self.assertEqual(partition.sizes().tolist(), [1, 2, 2])
+        self.assertEqual(len(partition), 5)
+        self.assertIs(nc_data_handler.create_partition(partition), partition)
+
+    def test_community_dict_round_trip(self):
+        community_dict = {1: [5, 6, 4], 2: [9]}
+        partition = nc_data_handler.create_partition(community_dict)
+        self.assertEqual(partition.to_community_dict(), community_dict)
+        self.assertEqual(partition.members(1).tolist(), [5, 6, 4])
+        with self.assertRaises(KeyError):
+            partition.members(3)
+
+    def test_community_of(self):
+        partition = nc_data_handler.create_partition(self.communities)
+        self.assertEqual(partition.community_of(12), 7)
+        self.assertEqual(partition.community_of(99), -1)
+        self.assertEqual(partition.community_of(np.array([2 ** 40, 13, 99])).tolist(), [3, -1, -1])
+
+    def test_empty(self):
+        partition = nc_data_handler.create_partition({})
+        self.assertEqual((len(partition), partition.n_communities), (0, 0))
+        self.assertEqual(partition.to_dict(), {})
+        self.assertEqual(partition.community_of(1), -1)
+
+
+class TestSnapshotCache(unittest.TestCase):
+    def setUp(self):
+        self.edge_list_files = tests.EdgeListFiles()
+        # Every edge list uses 2 * 2 * 4 = 16 bytes
+        self.input_files = [self.edge_list_files.write('t{}.txt'.format(position), [(position, 1), (1, 2)])
+                            for position in range(3)]
+        self.get_edge_list = getattr(nc_data_handler, '__get_edge_list')
+        nc_data_handler.clear_snapshot_cache()
+
+    def tearDown(self):
+        self.edge_list_files.close()
+        nc_data_handler.set_snapshot_cache_size()
+        nc_data_handler.clear_snapshot_cache()
+
+    def test_snapshot_is_parsed_once(self):
+        edge_list = self.get_edge_list(input_data=self.input_files[0])
+        self.assertIs(self.get_edge_list(input_data=self.input_files[0]), edge_list)
+        self.assertIsNot(self.get_edge_list(input_data=self.input_files[0], cache=False), edge_list)
+
+    def test_changed_file_is_parsed_again(self):
+        edge_list = self.get_edge_list(input_data=self.input_files[0])
+        self.edge_list_files.write('t0.txt', [(0, 1), (1, 2), (2, 3)])
+        os.utime(self.input_files[0], (0, 0))
+        changed_edge_list = self.get_edge_list(input_data=self.input_files[0])
+        self.assertEqual(len(changed_edge_list), 3)
+        self.assertEqual(len(nc_data_handler.set_snapshot_cache_size()), 1)
+
+    def test_least_recently_used_is_evicted(self):
+        snapshot_cache = nc_data_handler.set_snapshot_cache_size(32)
+        edge_lists = [self.get_edge_list(input_data=input_file) for input_file in self.input_files[:2]]
+        self.get_edge_list(input_data=self.input_files[0])
+        self.get_edge_list(input_data=self.input_files[2])
+        self.assertEqual((len(snapshot_cache), snapshot_cache.n_bytes), (2, 32))
+        self.assertIs(self.get_edge_list(input_data=self.input_files[0]), edge_lists[0])
+        self.assertIsNot(self.get_edge_list(input_data=self.input_files[1]), edge_lists[1])
+
+    def test_budget(self):
+        snapshot_cache = nc_data_handler.set_snapshot_cache_size(0)
+        self.get_edge_list(input_data=self.input_files[0])
+        self.assertEqual(len(snapshot_cache), 0)
+        nc_data_handler.set_snapshot_cache_size(64)
+        for input_file in self.input_files:
+            self.get_edge_list(input_data=input_file)
+        nc_data_handler.set_snapshot_cache_size(20)
+        self.assertEqual((len(snapshot_cache), snapshot_cache.n_bytes), (1, 16))
+        with self.assertRaises(SystemExit):
+            nc_data_handler.set_snapshot_cache_size(-1)
+
+
+class TestValidation(unittest.TestCase):
+    def setUp(self):
+        self.edge_list_files = tests.EdgeListFiles()
+        # Comment and blank lines are not data rows, the invalid weight is on line 6 and in data row 3
+        self.input_file = self.edge_list_files.write('invalid.txt', [('#', 'source', 'target', 'weight'), (1, 2, 1),
+                                                                     (), (2, 3, 1), ('#', 'comment'), (3, 4, -1),
+                                                                     (4, 5, 'nan')])
+
+    def tearDown(self):
+        self.edge_list_files.close()
+
+    def read_data_frame(self):
+        # Return
+        return pd.read_csv(self.input_file, sep=r'\s+', header=None, comment='#')
+
+    def test_valid_data(self):
+        graph_df = pd.DataFrame({0: [1, 2, 2], 1: [2, 2, 2]})
+        validation_status, report = _operations.validate_edge_data(graph_df=graph_df, weighted='no')
+        self.assertEqual(validation_status, 1)
+        self.assertEqual((report['self_loops'], report['duplicates']), (2, 1))
+
+    def test_data_rows_are_one_based(self):
+        validation_status, report = _operations.validate_edge_data(graph_df=self.read_data_frame(), weighted='yes',
+                                                                   row_offset=10)
+        self.assertEqual(validation_status, 0)
+        self.assertEqual(report['errors'], ['NaN or infinite weights, first at data row 14',
+                                            'Negative weights, first at data row 13'])
+
+    def test_file_line_numbers(self):
+        validation_status, report = _operations.validate_edge_data(graph_df=self.read_data_frame(), weighted='yes',
+                                                                   input_file=self.input_file)
+        self.assertEqual(validation_status, 0)
+        self.assertEqual(report['errors'], ['NaN or infinite weights, first at line 7 (data row 4)',
+                                            'Negative weights, first at line 6 (data row 3)'])
+
+    def test_unexpected_columns(self):
+        validation_status, report = _operations.validate_edge_data(graph_df=self.read_data_frame(), weighted='no')
+        self.assertEqual(validation_status, 0)
+        self.assertEqual(report['errors'], ['Expected 2 columns, found 3 (check delimiter and weighted argument)'])
+
+    def test_invalid_file_exits(self):
+        with self.assertRaises(SystemExit):
+            nc_data_handler.read_edge_list(input_file=self.input_file, weighted='yes')
+        with self.assertRaises(SystemExit):
+            list(nc_data_handler.iter_edge_list_chunks(input_data=self.input_file, weighted='yes', chunk_size=2))
+
+
+if __name__ == '__main__':
+    unittest.main()
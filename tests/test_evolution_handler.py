@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Import python libraries
+import unittest
+import networkx as nx
+
+# Import custom libraries
+import tests
+import nc_data_handler
+import nc_evolution_handler
+
+
+# Source code meta data
+__author__ = 'Dalwar Hossain'
+__email__ = 'dalwar.hossain@protonmail.com'
+
+
+class TestEvolveCommunities(unittest.TestCase):
+    def setUp(self):
+        self.edge_list_files = tests.EdgeListFiles()
+        # Six cliques of eight nodes, every snapshot rewires a few edges
+        self.input_files = []
+        for snapshot in range(3):
+            ntx_graph = nx.relaxed_caveman_graph(6, 8, 0.05, seed=snapshot)
+            self.input_files.append(self.edge_list_files.write('t{}.txt'.format(snapshot), ntx_graph.edges()))
+        nc_data_handler.clear_snapshot_cache()
+
+    def tearDown(self):
+        self.edge_list_files.close()
+
+    def test_steps(self):
+        results = list(nc_evolution_handler.evolve_communities(input_files=self.input_files, algorithm='louvain',
+                                                               n=3, merge='sum', engine='csr', seed=1))
+        self.assertEqual([result['step'] for result in results], [1, 2])
+        self.assertEqual([result['input_file_t1'] for result in results], self.input_files[1:])
+        for result in results:
+            self.assertEqual(result['top_n_communities_t'].n_communities, 3)
+            self.assertEqual(result['top_n_communities_t1'].n_communities, 3)
+            self.assertGreater(result['merged_graph_size'], 0)
+            self.assertTrue(result['similarity'])
+            self.assertTrue(result['completed'])
+
+        # Time 't+1' of a step is time 't' of the next step
+        self.assertEqual(sorted(results[1]['top_n_communities_t'].nodes.tolist()),
+                         sorted(results[0]['top_n_communities_t1'].nodes.tolist()))
+
+    def test_generator_and_warm_start(self):
+        input_files = (nc_data_handler.read_edge_list(input_file=input_file) for input_file in self.input_files)
+        results = list(nc_evolution_handler.evolve_communities(input_files=input_files, algorithm='leiden', n=2,
+                                                               seed=1, warm_start=True))
+        self.assertEqual(len(results), 2)
+
+    def test_time_budget(self):
+        results = list(nc_evolution_handler.evolve_communities(input_files=self.input_files, algorithm='louvain',
+                                                               n=3, engine='csr', seed=1, time_budget=0))
+        self.assertEqual(len(results), 2)
+        self.assertFalse(any(result['completed'] for result in results))
+
+    def test_prior_partition_is_rejected(self):
+        with self.assertRaises(SystemExit):
+            list(nc_evolution_handler.evolve_communities(input_files=self.input_files, prior_partition={}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Import python libraries
+import os
+import random
+import unittest
+import numpy as np
+import pandas as pd
+
+# Import custom libraries
+import tests
+import nc_data_handler
+import nc_graph_handler
+
+
+# Source code meta data
+__author__ = 'Dalwar Hossain'
+__email__ = 'dalwar.hossain@protonmail.com'
+
+
+# Sort the rows of an edge data frame
+def sorted_edges(graph_df=None):
+    """
+    This function sorts the rows of an edge data frame so frames read in a different order can be compared
+
+    :param graph_df: (pandas data frame) Edge data frame
+    :return: (pandas data frame) Sorted edge data frame with a fresh index
+    """
+    # Return
+    return graph_df.sort_values(list(graph_df.columns)).reset_index(drop=True)
+
+
+class TestSubGraph(unittest.TestCase):
+    def setUp(self):
+        self.edge_list_files = tests.EdgeListFiles()
+        generator = random.Random(11)
+        edges = [(generator.randint(1, 400), generator.randint(1, 400), generator.randint(1, 9)) for _ in range(5000)]
+        self.input_file = self.edge_list_files.write('graph.txt', edges)
+        self.top_n_communities = [list(range(1, 30)), list(range(200, 215)), [399]]
+        nc_data_handler.clear_snapshot_cache()
+
+    def tearDown(self):
+        self.edge_list_files.close()
+        nc_data_handler.clear_snapshot_cache()
+
+    def test_streaming_matches_in_memory(self):
+        in_memory = nc_graph_handler.find_sub_graph(input_file=self.input_file, weighted='yes',
+                                                    top_n_communities_t=self.top_n_communities)
+        self.assertGreater(len(in_memory.index), 0)
+        for chunk_size in (1, 333, 10 ** 6):
+            streamed = nc_graph_handler.find_sub_graph(input_file=self.input_file, weighted='yes',
+                                                       top_n_communities_t=self.top_n_communities,
+                                                       chunk_size=chunk_size)
+            pd.testing.assert_frame_equal(streamed.reset_index(drop=True), in_memory.reset_index(drop=True),
+                                          check_dtype=False)
+
+    def test_output_file_matches_in_memory(self):
+        in_memory = nc_graph_handler.find_sub_graph(input_file=self.input_file, weighted='yes',
+                                                    top_n_communities_t=self.top_n_communities)
+        output_file = os.path.join(self.edge_list_files.directory, 'sub_graph.txt')
+        nc_graph_handler.find_sub_graph(input_file=self.input_file, weighted='yes',
+                                        top_n_communities_t=self.top_n_communities, chunk_size=700,
+                                        output_file=output_file)
+        written = nc_data_handler.read_edge_list(input_file=output_file, weighted='yes').to_data_frame()
+        pd.testing.assert_frame_equal(written, in_memory.reset_index(drop=True), check_dtype=False)
+
+    def test_parquet_matches_in_memory(self):
+        try:
+            import pyarrow
+        except ImportError:
+            raise unittest.SkipTest('pyarrow is not installed')
+        in_memory = nc_graph_handler.find_sub_graph(input_file=self.input_file, weighted='yes',
+                                                    top_n_communities_t=self.top_n_communities)
+        parquet_file = os.path.join(self.edge_list_files.directory, 'graph.parquet')
+        edge_list = nc_data_handler.read_edge_list(input_file=self.input_file, weighted='yes')
+        nc_data_handler.write_parquet_edge_list(edge_list=edge_list, output_file=parquet_file, row_group_size=250)
+        for chunk_size in (None, 100):
+            from_parquet = nc_graph_handler.find_sub_graph(input_file=parquet_file,
+                                                           top_n_communities_t=self.top_n_communities,
+                                                           chunk_size=chunk_size)
+            pd.testing.assert_frame_equal(sorted_edges(from_parquet), sorted_edges(in_memory), check_dtype=False)
+
+    def test_empty_sub_graph_keeps_columns(self):
+        in_memory = nc_graph_handler.find_sub_graph(input_file=self.input_file, weighted='yes',
+                                                    top_n_communities_t=[[10 ** 6]])
+        self.assertEqual(list(in_memory.columns), ['source', 'target', 'weight'])
+        edge_list = nc_data_handler.read_edge_list(input_file=self.input_file, weighted='yes')
+        for input_file in (self.input_file, edge_list, edge_list.select(slice(0, 0))):
+            streamed = nc_graph_handler.find_sub_graph(input_file=input_file, weighted='yes',
+                                                       top_n_communities_t=[[10 ** 6]], chunk_size=333)
+            self.assertEqual(len(streamed.index), 0)
+            pd.testing.assert_series_equal(streamed.dtypes, in_memory.dtypes)
+
+    def test_empty_parquet_sub_graph_keeps_columns(self):
+        try:
+            import pyarrow
+        except ImportError:
+            raise unittest.SkipTest('pyarrow is not installed')
+        parquet_file = os.path.join(self.edge_list_files.directory, 'graph.parquet')
+        edge_list = nc_data_handler.read_edge_list(input_file=self.input_file, weighted='yes')
+        nc_data_handler.write_parquet_edge_list(edge_list=edge_list, output_file=parquet_file, row_group_size=250)
+        in_memory = nc_graph_handler.find_sub_graph(input_file=parquet_file, top_n_communities_t=[[10 ** 6]])
+        streamed = nc_graph_handler.find_sub_graph(input_file=parquet_file, top_n_communities_t=[[10 ** 6]],
+                                                   chunk_size=100)
+        self.assertEqual(list(streamed.columns), ['source', 'target', 'weight'])
+        self.assertEqual(len(streamed.index), 0)
+        pd.testing.assert_series_equal(streamed.dtypes, in_memory.dtypes)
+
+
+class TestMergedGraph(unittest.TestCase):
+    def setUp(self):
+        self.edge_list_files = tests.EdgeListFiles()
+        # (1, 2) in both snapshots, twice at time 't', (2, 3) only at time 't', (3, 4) only at time 't+1'
+        self.input_file_t = self.edge_list_files.write('t.txt', [(1, 2, 2), (1, 2, 1), (2, 3, 4), (7, 8, 5)])
+        self.input_file_t1 = self.edge_list_files.write('t1.txt', [(1, 2, 5), (3, 4, 6)])
+        self.top_n_communities = [[1, 2, 3]]
+        nc_data_handler.clear_snapshot_cache()
+
+    def tearDown(self):
+        self.edge_list_files.close()
+        nc_data_handler.clear_snapshot_cache()
+
+    def merged_weights(self, merge=None, decay=0.5):
+        merged_graph = nc_graph_handler.generate_merged_graph(input_dataset_t=self.input_file_t,
+                                                              input_dataset_t1=self.input_file_t1, weighted='yes',
+                                                              top_n_communities=self.top_n_communities, merge=merge,
+                                                              decay=decay)
+        self.assertEqual(list(merged_graph.columns), ['source', 'target', 'weight', 'snapshot'])
+
+        # Return
+        return dict(((source, target), (weight, snapshot)) for source, target, weight, snapshot in
+                    merged_graph.itertuples(index=False))
+
+    def test_merge_rules(self):
+        expected = {'sum': 8, 'max': 5, 'latest': 5, 'decay': 6.5}
+        for merge, weight_1_2 in expected.items():
+            merged_weights = self.merged_weights(merge=merge)
+            self.assertEqual(sorted(merged_weights), [(1, 2), (2, 3), (3, 4)])
+            self.assertAlmostEqual(merged_weights[(1, 2)][0], weight_1_2)
+            self.assertAlmostEqual(merged_weights[(2, 3)][0], 2 if merge == 'decay' else 4)
+            self.assertAlmostEqual(merged_weights[(3, 4)][0], 6)
+
+    def test_snapshot_column(self):
+        merged_weights = self.merged_weights(merge='sum')
+        self.assertEqual(merged_weights[(1, 2)][1], nc_graph_handler.SNAPSHOT_T | nc_graph_handler.SNAPSHOT_T1)
+        self.assertEqual(merged_weights[(2, 3)][1], nc_graph_handler.SNAPSHOT_T)
+        self.assertEqual(merged_weights[(3, 4)][1], nc_graph_handler.SNAPSHOT_T1)
+
+    def test_decay_factor(self):
+        merged_weights = self.merged_weights(merge='decay', decay=0.0)
+        self.assertAlmostEqual(merged_weights[(1, 2)][0], 5)
+        self.assertAlmostEqual(merged_weights[(2, 3)][0], 0)
+
+    def test_concatenate_without_rule(self):
+        merged_graph = nc_graph_handler.generate_merged_graph(input_dataset_t=self.input_file_t,
+                                                              input_dataset_t1=self.input_file_t1, weighted='yes',
+                                                              top_n_communities=self.top_n_communities)
+        self.assertEqual(len(merged_graph.index), 5)
+
+    def test_node_ids_wider_than_32_bits(self):
+        offset = 2 ** 40
+        edge_list_t = nc_data_handler.EdgeList(source=np.array([1, 1, 2], dtype=np.int64) + offset,
+                                               target=np.array([2, 2, 3], dtype=np.int64) + offset,
+                                               weight=np.array([2.0, 1.0, 4.0]))
+        edge_list_t1 = nc_data_handler.EdgeList(source=np.array([1, 3], dtype=np.int64) + offset,
+                                                target=np.array([2, 4], dtype=np.int64) + offset,
+                                                weight=np.array([5.0, 6.0]))
+        merged_graph = nc_graph_handler.generate_merged_graph(input_dataset_t=edge_list_t,
+                                                              input_dataset_t1=edge_list_t1,
+                                                              top_n_communities=[[1 + offset, 2 + offset]],
+                                                              merge='sum')
+        self.assertEqual([tuple(row) for row in merged_graph.itertuples(index=False)],
+                         [(1 + offset, 2 + offset, 8.0, 3), (2 + offset, 3 + offset, 4.0, 1),
+                          (3 + offset, 4 + offset, 6.0, 2)])
+
+
+if __name__ == '__main__':
+    unittest.main()
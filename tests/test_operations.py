@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Import python libraries
+import io
+import unittest
+import numpy as np
+
+# Import custom libraries
+import tests
+import _operations
+
+
+# Source code meta data
+__author__ = 'Dalwar Hossain'
+__email__ = 'dalwar.hossain@protonmail.com'
+
+
+# File object that fails after the first block
+class FailingFile(object):
+    """
+    This class returns one block of data and raises an error on the next read
+    """
+    def __init__(self):
+        self.n_reads = 0
+
+    def read(self, size=None):
+        self.n_reads += 1
+        if self.n_reads > 1:
+            raise IOError('corrupt input')
+        return b'1 2\n'
+
+    def close(self):
+        pass
+
+
+class TestBackgroundReader(unittest.TestCase):
+    def test_read_blocks(self):
+        reader = _operations.BackgroundReader(file_object=io.BytesIO(b'1 2\n' * 1000), block_size=7)
+        try:
+            self.assertEqual(reader.read(), b'1 2\n' * 1000)
+            self.assertEqual(reader.read(), b'')
+        finally:
+            reader.close()
+
+    def test_error_is_raised_again(self):
+        reader = _operations.BackgroundReader(file_object=FailingFile())
+        try:
+            self.assertEqual(reader.read(4), b'1 2\n')
+            for _ in range(3):
+                with self.assertRaises(IOError):
+                    reader.read(4)
+        finally:
+            reader.close()
+
+
+class TestIdDtypes(unittest.TestCase):
+    def test_get_id_dtype(self):
+        self.assertEqual(_operations.get_id_dtype(np.array([], dtype=np.int64)), np.int32)
+        self.assertEqual(_operations.get_id_dtype(np.array([-2 ** 31, 2 ** 31 - 1])), np.int32)
+        self.assertEqual(_operations.get_id_dtype(np.array([0, 2 ** 31])), np.int64)
+
+    def test_downcast_ids(self):
+        ids = _operations.downcast_ids([3, 1, 2])
+        self.assertEqual(ids.dtype, np.int32)
+        self.assertEqual(ids.tolist(), [3, 1, 2])
+
+    def test_communities_to_data_frame(self):
+        communities_df = _operations.communities_to_data_frame({1: 0, 2 ** 35: 1})
+        self.assertEqual(list(communities_df.columns), ['node', 'cluster'])
+        self.assertEqual((communities_df['node'].dtype, communities_df['cluster'].dtype), (np.int64, np.int32))
+        self.assertEqual(communities_df['node'].tolist(), [1, 2 ** 35])
+
+
+class TestCompletePartition(unittest.TestCase):
+    def test_new_nodes_are_singletons(self):
+        communities = _operations.complete_partition(prior_partition={1: 5, 2: 5, 3: 9, 8: 9},
+                                                     nodes=np.array([1, 2, 3, 4, 7]))
+        self.assertEqual(communities.tolist(), [0, 0, 1, 2, 3])
+
+    def test_empty_prior_partition(self):
+        communities = _operations.complete_partition(prior_partition={}, nodes=np.array([4, 7]))
+        self.assertEqual(communities.tolist(), [0, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()